@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+
+from . import __version__
+from .model.ApiConnector import ApiConnector
+from .model.ClientGenerator import ClientGenerator
+
+
+def generate(arguments):
+    """
+    Generate a client module from the OpenApi Specs
+    :param arguments: parsed arguments (configuration_file, output, class_name, no_openapi)
+    :return: exit code
+    """
+    connector = ApiConnector(arguments.configuration_file, is_openapi=not arguments.no_openapi)
+    try:
+        if connector.resources is None:
+            print("Invalid OpenApi Specs: {}".format(arguments.configuration_file), file=sys.stderr)
+            return 1
+        generator = ClientGenerator(connector, class_name=arguments.class_name)
+        generator.write(arguments.output, source=os.path.basename(arguments.configuration_file))
+    finally:
+        connector.close()
+    print("Client {} written to {}".format(arguments.class_name, arguments.output))
+    return 0
+
+
+def run(argv=None):
+    """
+    Entry point of api_ctl
+    :param argv: command line arguments (default: sys.argv[1:])
+    :return: exit code
+    """
+    parser = argparse.ArgumentParser(prog="api_ctl", description="Tools for the APIs defined by OpenApi Specs")
+    parser.add_argument("--version", action="version", version="%(prog)s {}".format(__version__))
+    commands = parser.add_subparsers(dest="command")
+    generate_parser = commands.add_parser("generate", help="generate a python client module from the OpenApi Specs")
+    generate_parser.add_argument("configuration_file", help="json file of the OpenApi Specs")
+    generate_parser.add_argument("-o", "--output", required=True, help="python file to write")
+    generate_parser.add_argument("--class-name", default="ApiClient", help="name of the client class")
+    generate_parser.add_argument("--no-openapi", action="store_true",
+                                 help="skip the validation of the specs against the OpenApi Specs schema")
+    generate_parser.set_defaults(function=generate)
+    arguments = parser.parse_args(argv)
+    if arguments.command is None:
+        parser.print_help()
+        return 2
+    return arguments.function(arguments)
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -8,3 +8,7 @@ class IgnoredParameterException(Exception):
 
 class RequestAbortedException(Exception):
     pass
+
+
+class PaginationException(Exception):
+    pass
@@ -3,6 +3,8 @@ import os
 import requests
 from requests.auth import HTTPBasicAuth
 
+from .OAuth2TokenCache import OAuth2ClientCredentialsAuth
+from .OAuth2TokenCache import OAuth2TokenCache
 from ..exceptions.AuthenticationException import AuthenticationException
 
 
@@ -10,10 +12,10 @@ class ApiAuthentication:
     """
     Class for the handling of the authentication
     """
-    # TODO: implement OAuth2.0
-    AUTHENTICATIONS = ["HTTPBasicAuth", None]
+    AUTHENTICATIONS = ["HTTPBasicAuth", "OAuth2ClientCredentials", None]
     AUTHENTICATIONS_PARAMETERS = {
-        "HTTPBasicAuth": ["username", "password"]
+        "HTTPBasicAuth": ["username", "password"],
+        "OAuth2ClientCredentials": ["token_url", "client_id", "client_secret"]
     }
 
     def __init__(self, authentication_method=None, parameters=None):
@@ -23,6 +25,7 @@ class ApiAuthentication:
         :param parameters: dictionary
             with key from the array ApiAuthentication.AUTHENTICATIONS_PARAMETERS[authentication_method]
             and value the key of the os.environ, where the data are put in
+            (OAuth2ClientCredentials accepts the optional key "scope")
         """
         if parameters is None:
             parameters = {}
@@ -35,6 +38,25 @@ class ApiAuthentication:
             print("Only {} are available.".format(ApiAuthentication.AUTHENTICATIONS))
             raise AuthenticationException("{} is not implemented.".format(authentication_method))
 
+    def get_identity(self):
+        """
+        Identity of the caller (calls of different identities must not share their responses)
+        :return: hashable identity, None without authentication
+        """
+        if isinstance(self.authentication_func, requests.auth.HTTPBasicAuth):
+            return self.authentication_method, self.authentication_func.username
+        if isinstance(self.authentication_func, OAuth2ClientCredentialsAuth):
+            token_cache = self.authentication_func.token_cache
+            return self.authentication_method, token_cache.token_url, token_cache.client_id, token_cache.scope
+        return None
+
+    def close(self):
+        """
+        Stop the background refresh of the OAuth2.0 token (refreshed on demand by the next use)
+        """
+        if isinstance(self.authentication_func, OAuth2ClientCredentialsAuth):
+            self.authentication_func.token_cache.close()
+
     def __check_parameters(self, parameters):
         """
         Check the needed parameters based on the mapping defined in parameters
@@ -67,6 +89,8 @@ class ApiAuthentication:
         self.authentication_func = None
         if self.authentication_method == "HTTPBasicAuth":
             self.__create_authentication_basic_auth(parameters)
+        elif self.authentication_method == "OAuth2ClientCredentials":
+            self.__create_authentication_oauth2_client_credentials(parameters)
 
     def __create_authentication_basic_auth(self, parameters):
         """
@@ -77,3 +101,18 @@ class ApiAuthentication:
             "{}".format(os.environ[parameters["username"]]),
             os.environ[parameters["password"]]
         )
+
+    def __create_authentication_oauth2_client_credentials(self, parameters):
+        """
+        Create the authentication for the requests (implementation of the OAuth2.0 client credentials flow)
+        The token cache is shared by all the connectors using the same client
+        :param parameters: parameters for authentication
+        """
+        scope = os.environ.get(parameters["scope"]) if "scope" in parameters else None
+        token_cache = OAuth2TokenCache.get_shared(
+            os.environ[parameters["token_url"]],
+            os.environ[parameters["client_id"]],
+            os.environ[parameters["client_secret"]],
+            scope=scope
+        )
+        self.authentication_func = OAuth2ClientCredentialsAuth(token_cache)
@@ -1,9 +1,26 @@
+import concurrent.futures
+import logging
 import os
 import sys
+import threading
 
 from .ApiAuthentication import ApiAuthentication
-from .ApiOperations import ApiOperations
+from .ApiRequest import ApiRequest
+from .ApiTransport import ApiTransport
+from .AsyncApiTransport import AsyncApiTransport
+from .CircuitBreaker import CircuitBreaker
 from .JsonHandler import JsonHandler
+from .LazyPaths import LazyPaths
+from .Paginator import Paginator
+from .ParameterPlan import ParameterPlan
+from .PathRouter import PathRouter
+from .SchemaBundler import SchemaBundler
+from .ServerPool import ServerPool
+from .SingleFlight import SingleFlight
+from .SpecCache import SpecCache
+from .TokenBucket import TokenBucket
+from .ValidationPolicy import ValidationPolicy
+from .ValidatorRegistry import ValidatorRegistry
 
 
 class ApiConnector:
@@ -11,14 +28,39 @@ class ApiConnector:
     Class for connection to the API
     """
     DEBUG = False
+    __path_validator = None
+    __path_validator_lock = threading.Lock()
 
-    def __init__(self, configuration_file, is_openapi=True, authentication=None, parameters=None):
+    def __init__(self, configuration_file, is_openapi=True, authentication=None, parameters=None,
+                 pool_connections=ApiTransport.DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=ApiTransport.DEFAULT_POOL_MAXSIZE,
+                 pool_block=False, keep_alive=True, cache_dir=None, response_cache=None,
+                 body_validation=True, validation_policy=None, metrics=None, retry_policy=None,
+                 circuit_breaker=None, server_pool=None, single_flight=False, timeout=ApiTransport.DEFAULT_TIMEOUT):
         """
         API defined by configuration file with given authentication
-        :param configuration_file: OpenApiSpecs file with definition of the API
+        :param configuration_file: OpenApiSpecs file with definition of the API (or the loaded specs as dict)
         :param is_openapi: set to False to deactivate the schema validation against OpenApi Specs standard
         :param authentication: authentication info
         :param parameters: parameters to initialize the authentication
+        :param pool_connections: number of hosts to keep a connection pool for
+        :param pool_maxsize: maximum number of connections kept per host
+        :param pool_block: if True, wait for a free connection instead of opening a new one above pool_maxsize
+        :param keep_alive: set to False to close the connection after each call
+        :param cache_dir: directory of the on-disk cache of the preprocessed specs (None to deactivate)
+        :param response_cache: ResponseCache object for the GET requests (None to deactivate)
+        :param body_validation: set to False to send the bodies of post/put requests without validation
+        :param validation_policy: ValidationPolicy object for the responses (default: validate all the responses)
+        :param metrics: ApiMetrics object recording timings and counters of the calls (None to deactivate)
+        :param retry_policy: RetryPolicy object for the failed calls (None: no retry)
+        :param circuit_breaker: arguments of the CircuitBreaker created for each server
+            (ex.: {"failure_threshold": 5, "recovery_timeout": 30}, None to deactivate)
+        :param server_pool: arguments of the ServerPool balancing the calls over all the servers of the specs,
+            with the optional key "health_path" for health checks with a GET on the path of each server
+            (ex.: {"mode": "ewma", "health_path": "/health"}, None to send all the calls to self.server)
+        :param single_flight: if True, concurrent identical GET requests share one call and its std response
+        :param timeout: timeout of the calls in seconds, (connect timeout, read timeout) or one value for both
+            (None: wait forever), a call timing out is a failed attempt (retried, recorded by the circuit breaker)
         """
         self.configuration_file = configuration_file
         self.is_openapi = is_openapi
@@ -26,11 +68,86 @@ class ApiConnector:
         self.server = {"url": None, "description": None}
         self.resources = None
         self.paths = {}
+        # Built on the first resolution of a concrete path (ApiConnector.get_router)
+        self.router = None
+        self.spec_cache = SpecCache(cache_dir) if cache_dir is not None else None
+        # Parameter serialization plans {(endpoint, request_type): ParameterPlan}
+        self.parameter_plans = {}
+        # Response validation policy, overridable per endpoint
+        self.validation_policy = validation_policy if validation_policy is not None else ValidationPolicy()
+        self.validation_policies = {}
+        # Compiled response validators, shared by all requests of this connector
+        self.validators = ValidatorRegistry()
+        # Minimal schemas of the operations, built from the components on the first use
+        self.schema_bundler = None
+        self.response_cache = response_cache
+        self.body_validation = body_validation
+        self.metrics = metrics
+        self.single_flight = SingleFlight() if single_flight else None
+        self.retry_policy = retry_policy
+        # Circuit breakers {server url: CircuitBreaker}, created on the first call to the server
+        self.circuit_breaker = circuit_breaker
+        self.circuit_breakers = {}
+        self.circuit_breakers_lock = threading.Lock()
+        # Rate limiters {("operation", endpoint, request_type) or ("server", url): TokenBucket or None},
+        # set by ApiConnector.set_rate_limit or by the vendor extension x-rate-limit of the specs
+        self.rate_limiters = {}
+        self.rate_limiters_lock = threading.Lock()
+        # Pooled HTTP transport, shared by all requests of this connector
+        self.transport = ApiTransport(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                      pool_block=pool_block, keep_alive=keep_alive, timeout=timeout)
+        # Asynchronous transport, opened by 'async with ApiConnector(...)'
+        self.async_transport = AsyncApiTransport(limit=pool_connections * pool_maxsize,
+                                                 limit_per_host=pool_maxsize, keep_alive=keep_alive,
+                                                 timeout=timeout)
         self.__get_resources()
+        self.server_pool = None if server_pool is None else self.__create_server_pool(dict(server_pool))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def __aenter__(self):
+        await self.async_transport.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.async_transport.close()
+        self.authentication.close()
+
+    def close(self):
+        """
+        Release the pooled connections of the transport, stop the health checks
+        and the background refresh of the OAuth2.0 token
+        """
+        if self.server_pool is not None:
+            self.server_pool.close()
+        self.authentication.close()
+        self.transport.close()
+
+    def __create_server_pool(self, settings):
+        """
+        Create the pool of the servers of the OpenApi Specs
+        :param settings: arguments of the ServerPool, "health_path" defines the health check
+        :return: ServerPool object
+        """
+        servers = self.resources.get("servers", []) if self.resources is not None else []
+        health_path = settings.pop("health_path", None)
+        if health_path is not None and "health_check" not in settings:
+            def health_check(server):
+                response = self.transport.request("get", "{}{}".format(server["url"], health_path), timeout=5)
+                response.close()
+                return response.status_code < 500
+
+            settings["health_check"] = health_check
+        return ServerPool(servers, **settings)
 
     def select_server_by_description(self, description):
         """
         Select the server by his description out of the lists of available servers
+        (ignored by the calls if a server pool is used, they are balanced over all the servers)
         :param description: description field of the server
         :return: Boolean (true if found)
         """
@@ -40,40 +157,321 @@ class ApiConnector:
                 if "description" in server and server["description"] == description:
                     self.server = server
         if self.server is None:
-            print("Description {} has not be found!".format(description))
+            logging.warning("Description {} has not be found!".format(description))
             return False
+        if self.server_pool is not None:
+            logging.warning("Server '{}' selected but not used: the calls are balanced over the server pool".format(
+                description))
         return True
 
     def __get_resources(self):
         """
         Import API resources from the configuration file and validate against schema
+        The path items are indexed and validated on their first use (LazyPaths)
         :return: None
         """
         self.resources = None
         self.paths = {}
-        resources = JsonHandler.read_json(self.configuration_file)
+        self.router = None
+        cache_key = None
+        if self.spec_cache is not None and not isinstance(self.configuration_file, dict):
+            cache_key = self.spec_cache.get_key(self.configuration_file, self.is_openapi)
+            state = self.spec_cache.load(cache_key)
+            if state is not None:
+                (self.resources, self.paths) = state
+                if self.is_openapi:
+                    # The validator is not pickled: the path items are still validated on their first use
+                    self.paths.validator = ApiConnector.get_path_validator()
+                return
+        if isinstance(self.configuration_file, dict):
+            resources = self.configuration_file
+        else:
+            resources = JsonHandler.read_json(self.configuration_file)
+        schema = ApiConnector.read_openapi_schema() if self.is_openapi else None
+        # The paths are validated one by one by LazyPaths
+        if not self.is_openapi or JsonHandler.validate(dict(resources, paths={}), schema, "api_definition"):
+            self.resources = resources
+            self.paths = LazyPaths(self.resources["paths"],
+                                   ApiConnector.get_path_validator(schema) if self.is_openapi else None)
+            if cache_key is not None:
+                self.spec_cache.store(cache_key, (self.resources, self.paths))
+
+    @staticmethod
+    def read_openapi_schema():
+        """
+        Read the OpenApi Specs schema
+        :return: schemas/OAS_schema.json as json object
+        """
         schema_dir = os.path.abspath(
             os.path.join(os.path.dirname(sys.modules[ApiConnector.__module__].__file__), ".."))
-        schema = JsonHandler.read_json("{}/schemas/OAS_schema.json".format(schema_dir))
-        if not self.is_openapi or JsonHandler.validate(resources, schema, "api_definition"):
-            self.resources = resources
-            for (path, resource) in self.resources["paths"].items():
-                self.paths[path] = ApiOperations(resource)
+        return JsonHandler.read_json("{}/schemas/OAS_schema.json".format(schema_dir))
+
+    @staticmethod
+    def get_path_validator(schema=None):
+        """
+        Compiled validator of a path item of the OpenApi Specs, compiled once per process
+        :param schema: OpenApi Specs schema (default: read from schemas/OAS_schema.json if not compiled yet)
+        :return: jsonschema validator object
+        """
+        with ApiConnector.__path_validator_lock:
+            if ApiConnector.__path_validator is None:
+                if schema is None:
+                    schema = ApiConnector.read_openapi_schema()
+                ApiConnector.__path_validator = JsonHandler.compile_validator(
+                    {"$schema": schema["$schema"], "definitions": schema["definitions"],
+                     "$ref": "#/definitions/PathItem"})
+            return ApiConnector.__path_validator
+
+    def get_schema_bundler(self):
+        """
+        Schema bundler of the components of the specs, created on the first call
+        :return: SchemaBundler object
+        """
+        if self.schema_bundler is None:
+            components = self.resources.get("components") if self.resources is not None else None
+            self.schema_bundler = SchemaBundler(components)
+        return self.schema_bundler
+
+    def get_router(self):
+        """
+        Router of the concrete paths, built on the first call
+        :return: PathRouter object
+        """
+        if self.router is None:
+            self.router = PathRouter(self.paths.keys())
+        return self.router
+
+    def resolve_endpoint(self, resource):
+        """
+        Find the endpoint key (path template) of a resource
+        :param resource: endpoint key or concrete path (ex.: /users/42 for /users/{id})
+        :return: (endpoint key, {path_parameter_name: path_parameter_value}), None if not defined
+        """
+        if resource in self.paths:
+            return resource, {}
+        return self.get_router().resolve(resource)
 
     def get_endpoint_definition(self, resource, request_type):
         """
         Extract the endpoint definition
-        :param resource: endpoint path
+        :param resource: endpoint path (endpoint key or concrete path)
         :param request_type: type of the request (get, post, ...)
         :return: Part of the OpenApi Specs for the endpoint
         """
+        if resource not in self.paths:
+            resolved = self.get_router().resolve(resource)
+            if resolved is not None:
+                resource = resolved[0]
         if resource in self.paths:
             # endpoint
-            if request_type in self.paths[resource].operations:
+            operation = self.paths[resource].get_operation(request_type)
+            if operation is not None:
                 # get, post, put, delete
-                return self.paths[resource].operations[request_type]
+                return operation
             else:
-                print("Request type '{}' not defined".format(request_type))
+                logging.warning("Request type '{}' not defined".format(request_type))
         else:
-            print("Resource '{}' not defined".format(resource))
+            logging.warning("Resource '{}' not defined".format(resource))
         return None
+
+    def set_validation_policy(self, policy, endpoint=None, request_type=None):
+        """
+        Set the response validation policy of the API or of one endpoint
+        :param policy: ValidationPolicy object
+        :param endpoint: endpoint key (None for the default policy of the API)
+        :param request_type: type of the request (None for all the request types of the endpoint)
+        """
+        if endpoint is None:
+            self.validation_policy = policy
+        else:
+            self.validation_policies[(endpoint, request_type)] = policy
+
+    def get_validation_policy(self, endpoint, request_type):
+        """
+        Get the response validation policy of an operation
+        :param endpoint: endpoint key (string) from paths (OpenApi Specs)
+        :param request_type: type of the request (get, post, ...)
+        :return: ValidationPolicy object
+        """
+        if len(self.validation_policies) > 0:
+            for key in ((endpoint, request_type), (endpoint, None)):
+                if key in self.validation_policies:
+                    return self.validation_policies[key]
+        return self.validation_policy
+
+    def get_parameter_plan(self, endpoint, request_type):
+        """
+        Get the parameter serialization plan of an operation, built on the first call
+        :param endpoint: endpoint key (string) from paths (OpenApi Specs)
+        :param request_type: type of the request (get, post, ...)
+        :return: ParameterPlan object
+        """
+        key = (endpoint, request_type)
+        plan = self.parameter_plans.get(key)
+        if plan is None:
+            endpoint_definition = self.get_endpoint_definition(endpoint, request_type)
+            plan = self.parameter_plans.setdefault(key, ParameterPlan(endpoint_definition["parameters"]))
+        return plan
+
+    def get_circuit_breaker(self, server_url):
+        """
+        Get the circuit breaker of a server
+        :param server_url: url of the server
+        :return: CircuitBreaker object, None if deactivated
+        """
+        if self.circuit_breaker is None:
+            return None
+        breaker = self.circuit_breakers.get(server_url)
+        if breaker is None:
+            with self.circuit_breakers_lock:
+                breaker = self.circuit_breakers.setdefault(server_url, CircuitBreaker(**self.circuit_breaker))
+        return breaker
+
+    def set_rate_limit(self, rate, burst=1, endpoint=None, request_type=None, server_url=None):
+        """
+        Limit the rate of the calls of an operation or of a server (overrides the x-rate-limit of the specs)
+        :param rate: number of calls per second (None to remove the limit)
+        :param burst: number of calls allowed at once after an idle period
+        :param endpoint: endpoint key, the limit is shared by all the request types if request_type is None
+        :param request_type: type of the request (get, post, ...)
+        :param server_url: url of the server (instead of endpoint)
+        """
+        if endpoint is not None:
+            key = ("operation", endpoint, request_type)
+        elif server_url is not None:
+            key = ("server", server_url)
+        else:
+            raise ValueError("An endpoint or a server_url is needed.")
+        with self.rate_limiters_lock:
+            self.rate_limiters[key] = None if rate is None else TokenBucket(rate, burst)
+
+    def get_rate_limiters(self, endpoint, request_type, server_url):
+        """
+        Get the rate limiters of a call
+        :param endpoint: endpoint key
+        :param request_type: type of the request (get, post, ...)
+        :param server_url: url of the server of the call
+        :return: list of TokenBucket objects
+        """
+        keys = (("operation", endpoint, request_type), ("operation", endpoint, None), ("server", server_url))
+        limiters = []
+        for key in keys:
+            if key not in self.rate_limiters:
+                with self.rate_limiters_lock:
+                    self.rate_limiters.setdefault(key, self.__create_rate_limiter(key))
+            limiter = self.rate_limiters[key]
+            if limiter is not None:
+                limiters.append(limiter)
+        return limiters
+
+    def reserve_rate_limit(self, endpoint, request_type, server_url):
+        """
+        Take a token in the rate limiters of a call
+        :param endpoint: endpoint key
+        :param request_type: type of the request (get, post, ...)
+        :param server_url: url of the server of the call
+        :return: seconds to wait before the call
+        """
+        wait = 0.0
+        for limiter in self.get_rate_limiters(endpoint, request_type, server_url):
+            wait = max(wait, limiter.reserve())
+        return wait
+
+    def __create_rate_limiter(self, key):
+        """
+        Create the rate limiter defined by the vendor extension x-rate-limit ({"rate": calls/s, "burst": n})
+        of an operation, of a path (request_type None) or of a server
+        :param key: key of ApiConnector.rate_limiters
+        :return: TokenBucket object, None if no limit is defined
+        """
+        definition = None
+        if self.resources is not None:
+            if key[0] == "server":
+                for server in self.resources.get("servers", []):
+                    if server.get("url") == key[1]:
+                        definition = server.get("x-rate-limit")
+            else:
+                path = self.resources.get("paths", {}).get(key[1], {})
+                definition = path.get("x-rate-limit") if key[2] is None \
+                    else path.get(key[2], {}).get("x-rate-limit")
+        if definition is None:
+            return None
+        return TokenBucket(definition["rate"], definition.get("burst", 1))
+
+    def run_call(self, endpoint, request_type, parameters=None, body=None, std_response=True):
+        """
+        Create the request, build the URL and process the API call
+        :param endpoint: endpoint key (string) from paths (OpenApi Specs)
+        :param request_type: type of request (get, post, put, delete)
+        :param parameters: dict of parameters (parameter_name, parameter_value)
+        :param body: body to send
+        :param std_response: set to False to get the ApiResponse object (payload, status, message) of the call
+        :return: std response (None if the endpoint is not defined)
+        """
+        request = ApiRequest.create_request(self, endpoint, request_type)
+        if request is None:
+            return None
+        request.std_response = std_response
+        return request.call(request.build_url(parameters), body)
+
+    def paginate(self, endpoint, request_type="get", parameters=None, pagination=None, prefetch=True):
+        """
+        Iterate over the items of a paginated endpoint (offset/limit, cursor or Link header),
+        the next page is fetched while the items of the current page are processed
+        :param endpoint: endpoint key (string) from paths (OpenApi Specs)
+        :param request_type: type of request
+        :param parameters: dict of parameters of the first page
+        :param pagination: pagination settings (see Paginator), None to read the vendor extension x-pagination
+            of the operation or to detect the style from its parameters
+        :param prefetch: set to False to fetch each page only when the previous one is consumed
+        :return: generator of items
+        """
+        return Paginator(self, endpoint, request_type, parameters, pagination, prefetch).items()
+
+    def run_batch(self, calls, max_workers=None, std_response=True):
+        """
+        Process many API calls on a thread pool, over the pooled transport
+        :param calls: iterable of (endpoint, request_type, parameters, body)
+        :param max_workers: number of threads (default: pool_maxsize of the transport)
+        :param std_response: set to False to get the (compact) ApiResponse objects instead of the std responses
+        :return: list of std responses, in the order of the calls
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.__get_max_workers(max_workers)) as executor:
+            return list(executor.map(lambda call: self.__run_batch_call(call, std_response), calls))
+
+    def as_completed(self, calls, max_workers=None, std_response=True):
+        """
+        Process many API calls on a thread pool and yield the results as soon as they are available
+        :param calls: iterable of (endpoint, request_type, parameters, body)
+        :param max_workers: number of threads (default: pool_maxsize of the transport)
+        :param std_response: set to False to get the (compact) ApiResponse objects instead of the std responses
+        :return: generator of (index of the call, std response)
+        """
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.__get_max_workers(max_workers))
+        try:
+            futures = {executor.submit(self.__run_batch_call, call, std_response): index
+                       for (index, call) in enumerate(calls)}
+            for future in concurrent.futures.as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __run_batch_call(self, call, std_response):
+        """
+        Process one call of a batch
+        :param call: (endpoint, request_type, parameters, body), parameters and body are optional
+        :param std_response: set to False to get the ApiResponse object
+        :return: std response
+        """
+        (endpoint, request_type, parameters, body) = (tuple(call) + (None, None))[:4]
+        return self.run_call(endpoint, request_type, parameters, body, std_response=std_response)
+
+    def __get_max_workers(self, max_workers):
+        """
+        Number of threads for the batch calls, more threads than pooled connections would open extra connections
+        :param max_workers: requested number of threads (None for default)
+        :return: number of threads
+        """
+        if max_workers is None:
+            return self.transport.pool_maxsize
+        return max_workers
@@ -0,0 +1,143 @@
+import bisect
+import threading
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class ApiMetrics:
+    """
+    Timings and counters of the API calls per operation, exportable in the Prometheus text format
+    Phases: url_build, connect (until the response headers), transfer (response body), decode,
+    schema_conversion, validation
+    """
+    PHASES = ["url_build", "connect", "transfer", "decode", "schema_conversion", "validation"]
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix="api_handler"):
+        """
+        ApiMetrics constructor
+        :param buckets: upper bounds (seconds) of the histogram buckets
+        :param prefix: prefix of the exported metric names
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        # {(endpoint, method, phase): [bucket counts..., +Inf count, sum]}
+        self.histograms = {}
+        # {(endpoint, method, status_code): count}
+        self.status_codes = {}
+        # {(endpoint, method): [bytes in, bytes out]}
+        self.bytes = {}
+        # {(endpoint, method, result): count}
+        self.validations = {}
+        self.lock = threading.Lock()
+
+    def observe(self, operation, phase, seconds):
+        """
+        Record the duration of a phase
+        :param operation: (endpoint, method)
+        :param phase: one of ApiMetrics.PHASES
+        :param seconds: duration
+        """
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self.lock:
+            key = operation + (phase,)
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            histogram[index] += 1
+            histogram[-1] += seconds
+
+    def count_status(self, operation, status_code):
+        """
+        Count a response status code
+        :param operation: (endpoint, method)
+        :param status_code: HTTP status code
+        """
+        key = operation + (str(status_code),)
+        with self.lock:
+            self.status_codes[key] = self.status_codes.get(key, 0) + 1
+
+    def count_validation(self, operation, is_valid):
+        """
+        Count the result of a response validation
+        :param operation: (endpoint, method)
+        :param is_valid: result of the validation
+        """
+        key = operation + ("valid" if is_valid else "invalid",)
+        with self.lock:
+            self.validations[key] = self.validations.get(key, 0) + 1
+
+    def add_bytes(self, operation, bytes_in, bytes_out):
+        """
+        Count the transferred bytes
+        :param operation: (endpoint, method)
+        :param bytes_in: size of the response body
+        :param bytes_out: size of the request body
+        """
+        with self.lock:
+            counters = self.bytes.get(operation)
+            if counters is None:
+                counters = self.bytes[operation] = [0, 0]
+            counters[0] += bytes_in
+            counters[1] += bytes_out
+
+    def snapshot(self):
+        """
+        Copy of the metrics
+        :return: {"phases": {(endpoint, method, phase): {"count", "sum", "buckets"}}, "status_codes", "bytes",
+            "validations"}
+        """
+        with self.lock:
+            return {
+                "phases": {key: {"count": sum(histogram[:-1]), "sum": histogram[-1],
+                                 "buckets": dict(zip(self.buckets + ("+Inf",), histogram[:-1]))}
+                           for (key, histogram) in self.histograms.items()},
+                "status_codes": dict(self.status_codes),
+                "bytes": {key: {"in": counters[0], "out": counters[1]} for (key, counters) in self.bytes.items()},
+                "validations": dict(self.validations),
+            }
+
+    def to_prometheus(self):
+        """
+        Export the metrics in the Prometheus text format
+        :return: string
+        """
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP {}_phase_seconds Duration of the phases of the API calls".format(self.prefix),
+            "# TYPE {}_phase_seconds histogram".format(self.prefix),
+        ]
+        for ((endpoint, method, phase), histogram) in sorted(snapshot["phases"].items()):
+            labels = ApiMetrics.__format_labels(endpoint=endpoint, method=method, phase=phase)
+            cumulated = 0
+            for (bound, count) in histogram["buckets"].items():
+                cumulated += count
+                lines.append("{}_phase_seconds_bucket{{{},le=\"{}\"}} {}".format(
+                    self.prefix, labels, bound, cumulated))
+            lines.append("{}_phase_seconds_sum{{{}}} {}".format(self.prefix, labels, histogram["sum"]))
+            lines.append("{}_phase_seconds_count{{{}}} {}".format(self.prefix, labels, histogram["count"]))
+        lines.append("# HELP {}_responses_total Responses per status code".format(self.prefix))
+        lines.append("# TYPE {}_responses_total counter".format(self.prefix))
+        for ((endpoint, method, status_code), count) in sorted(snapshot["status_codes"].items()):
+            lines.append("{}_responses_total{{{}}} {}".format(
+                self.prefix, ApiMetrics.__format_labels(endpoint=endpoint, method=method, status_code=status_code),
+                count))
+        lines.append("# HELP {}_validations_total Response validations per result".format(self.prefix))
+        lines.append("# TYPE {}_validations_total counter".format(self.prefix))
+        for ((endpoint, method, result), count) in sorted(snapshot["validations"].items()):
+            lines.append("{}_validations_total{{{}}} {}".format(
+                self.prefix, ApiMetrics.__format_labels(endpoint=endpoint, method=method, result=result), count))
+        for direction in ("in", "out"):
+            label = "received" if direction == "in" else "sent"
+            name = "{}_bytes_{}_total".format(self.prefix, label)
+            lines.append("# HELP {} Bytes {} in the bodies".format(name, label))
+            lines.append("# TYPE {} counter".format(name))
+            for ((endpoint, method), counters) in sorted(snapshot["bytes"].items()):
+                lines.append("{}{{{}}} {}".format(
+                    name, ApiMetrics.__format_labels(endpoint=endpoint, method=method), counters[direction]))
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def __format_labels(**labels):
+        return ",".join(
+            '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for (key, value) in labels.items())
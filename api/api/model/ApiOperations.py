@@ -1,7 +1,9 @@
 class ApiOperations:
     """
     Class to extract defined parts from the OpenApiSpecs definition json
+    The view of a method is built on its first access
     """
+    PARTS = ["parameters", "responses", "requestBody"]
 
     def __init__(self, resource, parts=None):
         """
@@ -9,14 +11,30 @@ class ApiOperations:
         :param resource: source to be extracted from
         :param parts: single bloc names to be extracted
         """
-        if parts is None:
-            parts = ["parameters", "responses", "requestBody"]
-        self.operations = {}
-        default_operation = {}
-        for part in parts:
-            default_operation[part] = None
-        for (method, details) in resource.items():
-            self.operations[method] = default_operation.copy()
-            for part in parts:
-                if part in details:
-                    self.operations[method][part] = details[part]
+        self.resource = resource
+        self.parts = parts if parts is not None else ApiOperations.PARTS
+        # {method: {part: value or None}}
+        self.views = {}
+
+    @property
+    def operations(self):
+        """
+        Views of all the methods of the resource
+        :return: {method: {part: value or None}}
+        """
+        for method in self.resource:
+            self.get_operation(method)
+        return self.views
+
+    def get_operation(self, method):
+        """
+        View of one method of the resource
+        :param method: method (get, post, ...)
+        :return: {part: value or None}, None if the method is not defined
+        """
+        view = self.views.get(method)
+        if view is None and method in self.resource:
+            details = self.resource[method]
+            view = self.views.setdefault(method, {part: details.get(part) if isinstance(details, dict) else None
+                                                  for part in self.parts})
+        return view
@@ -1,11 +1,23 @@
+import asyncio
+import logging
+import time
+
+import jsonschema
 import requests
 
 from .ApiResponse import ApiResponse
 from .ApiResponse import MockResponse
+from .ApiStreamResponse import ApiStreamResponse
+from .ApiTransport import ApiTransport
+from .JsonCodec import JsonCodec
 from .JsonHandler import JsonHandler
+from .ParameterPlan import ParameterPlan
+from .SchemaBundler import SchemaBundler
+from .PathRouter import PARAMETER_PATTERN
 from .OpenApi2JsonConverter import Openapi2JsonConverter
 from ..exceptions import OpenApiDefinitionException
 from ..exceptions import RequestException
+from ..exceptions.ValidationException import BodyValidationException
 
 
 class ApiRequest:
@@ -14,6 +26,8 @@ class ApiRequest:
     ApiPostRequest, ApiGetRequest, ApiDeleteRequest, ApiPutRequest
     """
     REQUEST_TYPES = ["get", "post", "put", "delete"]
+    # HTTP method, defined in the inherited classes
+    request_method = None
 
     def __init__(self, server, authentication, endpoint_definition, endpoint):
         """
@@ -29,24 +43,43 @@ class ApiRequest:
         self.authentication = authentication
         # Path
         self.endpoint = endpoint
+        # Values of the path parameters taken from a concrete path ({path_parameter_name: path_parameter_value})
+        self.path_parameters = {}
         # Endpoint definition
         self.endpoint_definition = endpoint_definition
         # Request type
         self.request_type = None
         # Components definition
         self.components = None
-        # TODO: schema validation of parameters and body
+        # Parameter serialization plan (built on first use)
+        self.parameter_plan = None
+        # Header parameters of the last built URL
+        self.headers = {}
+        # ApiConnector the request has been created from (None if built directly)
+        self.connector = None
+        # Validation of the body before sending (set to False for trusted callers)
+        self.body_validation = True
+        # Set to False to get the ApiResponse objects (payload, status, message) instead of the std responses
+        self.std_response = True
+        # Prebuilt schemas {validator key (ex.: (status_code, result_type)): json schema} (generated clients)
+        self.schemas = None
+        # TODO: schema validation of parameters
 
     @staticmethod
     def create_request(api, endpoint, request_type):
         """
         Static method for creating the request
         :param api: ApiConnector object
-        :param endpoint: endpoint key (string) from paths (OpenApi Specs)
+        :param endpoint: endpoint key (string) from paths (OpenApi Specs) or concrete path (ex.: /users/42)
         :param request_type: type of request (second key level from paths[<endpoint>] in OpenApi Specs)
         :return: ApiRequest object
         """
-        server = api.server
+        # With a server pool, the url is built with the first server and moved to the server selected per call
+        server = api.server if api.server_pool is None else api.server_pool.servers[0]
+        path_parameters = {}
+        resolved = api.resolve_endpoint(endpoint)
+        if resolved is not None:
+            (endpoint, path_parameters) = resolved
         endpoint_definition = api.get_endpoint_definition(endpoint, request_type)
         # Request type
         request = None
@@ -61,6 +94,9 @@ class ApiRequest:
                 request = ApiDeleteRequest(server, api.authentication, endpoint_definition, endpoint)
             if request is not None:
                 request.request_type = request_type
+                request.connector = api
+                request.path_parameters = path_parameters
+                request.body_validation = api.body_validation
                 if "components" in api.resources:
                     request.components = api.resources["components"]
         return request
@@ -71,35 +107,72 @@ class ApiRequest:
         :param parameters: dict of parameters (parameter_name, parameter_value)
         :return: URL to invoke
         """
+        metrics = self.get_metrics()
+        if metrics is None:
+            return self.__build_url(parameters)
+        start = time.perf_counter()
+        url = self.__build_url(parameters)
+        metrics.observe((self.endpoint, self.request_type), "url_build", time.perf_counter() - start)
+        return url
+
+    def __build_url(self, parameters):
         if self.server is not None and "url" in self.server and self.endpoint_definition is not None:
+            if parameters is None:
+                parameters = {}
+            path = self.get_request_path(parameters)
             args_in_query = self.get_request_params_query(parameters)
+            self.headers = self.get_parameter_plan().build_headers(parameters)
             if args_in_query is None:
-                return "{}{}".format(self.server["url"], self.endpoint)
+                return "{}{}".format(self.server["url"], path)
             else:
-                return "{}{}?{}".format(self.server["url"], self.endpoint, args_in_query)
+                return "{}{}?{}".format(self.server["url"], path, args_in_query)
         return None
 
+    def get_request_path(self, parameters=None):
+        """
+        Fill the path parameters of the endpoint (ex.: /users/{id} -> /users/42)
+        :param parameters: dict of parameters (parameter_name, parameter_value),
+            values of path parameters override the ones of the concrete path given to create_request
+        :return: path of the request
+        """
+        if parameters is None:
+            parameters = {}
+        plan = self.get_parameter_plan()
+
+        def replace(match):
+            name = match.group(1)
+            if name in parameters:
+                return plan.serialize_path_parameter(name, parameters[name])
+            elif name in self.path_parameters:
+                return plan.serialize_path_parameter(name, self.path_parameters[name])
+            raise RequestException.RequestAbortedException("Required parameter '{}' is missing!".format(name))
+
+        return PARAMETER_PATTERN.sub(replace, self.endpoint)
+
+    def get_parameter_plan(self):
+        """
+        Get the parameter serialization plan of the endpoint (shared through the ApiConnector)
+        :return: ParameterPlan object
+        """
+        if self.parameter_plan is None:
+            if self.connector is not None:
+                self.parameter_plan = self.connector.get_parameter_plan(self.endpoint, self.request_type)
+            else:
+                self.parameter_plan = ParameterPlan(self.endpoint_definition.get("parameters"))
+        return self.parameter_plan
+
     def get_request_params_query(self, parameters=None):
         """
         Generate the string of parameters for a get request
+        Optional parameters missing in parameters are left out, header parameters are sent as headers
         :param parameters: dict of parameters (parameter_name, parameter_value)
         :return: String containing the parameters for the get request
         """
-        # Build chain of param string
         if parameters is None:
             parameters = {}
-        args = []
-        if "parameters" in self.endpoint_definition and self.endpoint_definition["parameters"] is not None:
-            for parameter in self.endpoint_definition["parameters"]:
-                # TODO: Handle parameter["in"]="path"
-                if parameter["in"] == "query" or parameter["in"] == "header":
-                    arg = ApiRequest.get_formatted_param_in_query(parameters, parameter)
-                    if arg is not None:
-                        args.append(arg)
-        if len(args) == 0:
-            return None
-        else:
-            return "&".join(args)
+        plan = self.get_parameter_plan()
+        plan.check_required(parameters)
+        return plan.build_query(parameters)
 
     @staticmethod
     def get_formatted_param_in_query(parameters, parameter):
@@ -151,31 +224,215 @@ class ApiRequest:
         :param url: url of the request
         :param response: response of the api call
         :param error_flag: if True -> Gateway connection error
-        :return: std response
+        :return: std response (ApiResponse object if ApiRequest.std_response is False)
         """
+        metrics = self.get_metrics()
+        operation = (self.endpoint, self.request_type)
         # Process response
-        api_response = ApiResponse(url, response, error_flag=error_flag)
-        output = api_response.to_object()
+        if metrics is None:
+            api_response = ApiResponse(url, response, error_flag=error_flag,
+                                       error_message=getattr(response, "error_message", ""))
+        else:
+            start = time.perf_counter()
+            api_response = ApiResponse(url, response, error_flag=error_flag,
+                                       error_message=getattr(response, "error_message", ""))
+            if not isinstance(response, MockResponse):
+                # The body of a requests.Response is decoded here, the asynchronous transport measures its own
+                metrics.observe(operation, "decode", time.perf_counter() - start)
+            metrics.count_status(operation, response.status_code)
         # Generate schema
         try:
             if self.check_response(str(response.status_code)):
-                schema = self.__get_response_schema(str(response.status_code), "application/json")
-                if schema is None:
-                    print("Response code {} undefined!".format(response.status_code))
-                    schema = {}
-                schema["components"] = {"schemas": {}}
-                if self.components is not None and "schemas" in self.components:
-                    schema["components"]["schemas"] = self.components["schemas"]
-                # Validate against schema
-                if not JsonHandler.validate(output["response"]["Payload"], schema, "response")[0]:
-                    output["response"]["Message"] = "WARNING: {}".format(
-                        "Response doesn't correspond to predefined schema!"
-                    )
+                policy = self.get_validation_policy()
+                if policy is None or policy.should_validate(operation):
+                    # Validate against schema
+                    try:
+                        validator = self.get_response_validator(str(response.status_code), "application/json")
+                        start = time.perf_counter()
+                        is_valid = JsonHandler.validate_compiled(
+                            api_response.payload, validator, "response")[0]
+                        if metrics is not None:
+                            metrics.observe(operation, "validation", time.perf_counter() - start)
+                    except jsonschema.exceptions.SchemaError:
+                        is_valid = False
+                    if policy is not None:
+                        policy.record(operation, is_valid)
+                    if metrics is not None:
+                        metrics.count_validation(operation, is_valid)
+                    if not is_valid:
+                        api_response.message = "WARNING: {}".format(
+                            "Response doesn't correspond to predefined schema!"
+                        )
             else:
-                output["response"]["Payload"] = response.json()
+                api_response.payload = response.json()
         except OpenApiDefinitionException.StatusCodeException:
-            print("No schema found for validation of status_code {}!".format(response.status_code))
-        return output
+            logging.debug("No schema found for validation of status_code {}!".format(response.status_code))
+        if not self.std_response:
+            return api_response
+        return api_response.to_object()
+
+    def get_metrics(self):
+        """
+        Metrics of the ApiConnector
+        :return: ApiMetrics object, None if deactivated
+        """
+        if self.connector is None:
+            return None
+        return self.connector.metrics
+
+    def get_validation_policy(self):
+        """
+        Validation policy of the endpoint (None for requests built directly: all responses are validated)
+        :return: ValidationPolicy object
+        """
+        if self.connector is None:
+            return None
+        return self.connector.get_validation_policy(self.endpoint, self.request_type)
+
+    def get_response_validator(self, status_code, result_type):
+        """
+        Get the compiled validator for the given status_code and result_type
+        The validator is cached in the ApiConnector registry, requests built directly compile it each time
+        :param status_code: status_code to search for (ex.: "200")
+        :param result_type: result_type to search for (ex.: "application/json")
+        :return: jsonschema validator object
+        """
+        def build_schema():
+            return self.build_response_schema(status_code, result_type)
+
+        return self.get_validator((status_code, result_type), build_schema)
+
+    def get_items_validator(self, status_code, result_type, pointer=None):
+        """
+        Get the compiled validator for one item of the array returned for the given status_code and result_type
+        :param status_code: status_code to search for (ex.: "200")
+        :param result_type: result_type to search for (ex.: "application/json")
+        :param pointer: json pointer of the array in the payload (None for a top-level array)
+        :return: jsonschema validator object
+        """
+        def build_schema():
+            schema = self.build_response_schema(status_code, result_type)
+            items_schema = schema
+            for token in (pointer or "").strip("/").split("/"):
+                if token != "":
+                    properties = ApiRequest.resolve_local_ref(items_schema, schema).get("properties", {})
+                    items_schema = properties.get(token, {})
+            items_schema = dict(ApiRequest.resolve_local_ref(items_schema, schema).get("items", {}))
+            items_schema["components"] = schema["components"]
+            return items_schema
+
+        return self.get_validator((status_code, result_type, "items", pointer), build_schema)
+
+    def get_body_validator(self, result_type):
+        """
+        Get the compiled validator of the requestBody for the given result_type
+        :param result_type: result_type to search for (ex.: "application/json")
+        :return: jsonschema validator object, None if no schema is defined
+        """
+        request_body = self.endpoint_definition.get("requestBody")
+        if request_body is None or result_type not in request_body.get("content", {}) \
+                or "schema" not in request_body["content"][result_type]:
+            return None
+
+        def build_schema():
+            schema = Openapi2JsonConverter.convert_open_api_specs_to_json_schema(
+                request_body["content"][result_type]["schema"])
+            return self.add_components(schema)
+
+        return self.get_validator(("requestBody", result_type), build_schema)
+
+    def get_validator(self, key, build_schema):
+        """
+        Get a compiled validator, cached in the ApiConnector registry (requests built directly compile it each time)
+        :param key: key of the schema in the endpoint definition (ex.: (status_code, result_type))
+        :param build_schema: function without argument returning the json schema
+        :return: jsonschema validator object
+        """
+        if self.schemas is not None and key in self.schemas:
+            schema = self.schemas[key]
+
+            def build_schema():
+                return schema
+        if self.connector is None:
+            return JsonHandler.compile_validator(build_schema())
+        metrics = self.get_metrics()
+        if metrics is not None:
+            def build_schema_timed():
+                start = time.perf_counter()
+                schema = build_schema()
+                metrics.observe((self.endpoint, self.request_type), "schema_conversion", time.perf_counter() - start)
+                return schema
+            return self.connector.validators.get_validator(
+                (self.endpoint, self.request_type) + key, build_schema_timed)
+        return self.connector.validators.get_validator((self.endpoint, self.request_type) + key, build_schema)
+
+    def validate_body(self, body):
+        """
+        Validate the body against the requestBody schema before sending it
+        Skipped if ApiRequest.body_validation is False (trusted callers)
+        :param body: body to send
+        :return: Raise BodyValidationException if the body is not valid
+        """
+        if not self.body_validation:
+            return
+        request_body = self.endpoint_definition.get("requestBody")
+        if request_body is None:
+            return
+        if body is None:
+            if request_body.get("required", False):
+                raise BodyValidationException("ValidationError - body: required body is missing")
+            return
+        validator = self.get_body_validator("application/json")
+        if validator is not None:
+            (is_valid, message) = JsonHandler.validate_compiled(body, validator, "body")
+            if not is_valid:
+                raise BodyValidationException(message)
+
+    @staticmethod
+    def resolve_local_ref(schema, root):
+        """
+        Follow the local references (ex.: {"$ref": "#/components/schemas/getItems"}) of a schema
+        :param schema: schema to resolve
+        :param root: schema containing the referenced definitions
+        :return: referenced schema ({} if not found)
+        """
+        while isinstance(schema, dict) and "$ref" in schema and schema["$ref"].startswith("#/"):
+            target = root
+            for token in schema["$ref"][2:].split("/"):
+                target = target.get(token.replace("~1", "/").replace("~0", "~"), {}) \
+                    if isinstance(target, dict) else {}
+            schema = target
+        return schema
+
+    def build_response_schema(self, status_code, result_type):
+        """
+        Json schema of the response for the given status_code and result_type, with the components it needs
+        :param status_code: status_code to search for (ex.: "200")
+        :param result_type: result_type to search for (ex.: "application/json")
+        :return: schema as json object
+        """
+        schema = self.__get_response_schema(status_code, result_type)
+        if schema is None:
+            logging.debug("Response code {} undefined!".format(status_code))
+            schema = {}
+        return self.add_components(schema)
+
+    def add_components(self, schema):
+        """
+        Resolve the references of a schema and attach the component schemas it still needs (SchemaBundler)
+        :param schema: json schema
+        :return: json schema with the reachable components
+        """
+        return self.get_schema_bundler().bundle(schema)
+
+    def get_schema_bundler(self):
+        """
+        Schema bundler of the ApiConnector (components converted once), a new one for requests built directly
+        :return: SchemaBundler object
+        """
+        if self.connector is not None:
+            return self.connector.get_schema_bundler()
+        return SchemaBundler(self.components)
 
     def __get_response_schema(self, status_code, result_type):
         """
@@ -192,11 +449,352 @@ class ApiRequest:
                     self.endpoint_definition["responses"][status_code]["content"][result_type]["schema"]
                 )
             else:
-                print("Response type {} undefined!".format(result_type))
+                logging.debug("Response type {} undefined!".format(result_type))
         else:
-            print("Status code {} undefined!".format(status_code))
+            logging.debug("Status code {} undefined!".format(status_code))
         return output
 
+    def get_transport(self):
+        """
+        Transport of the ApiConnector, or the shared default transport for requests built directly
+        :return: ApiTransport object
+        """
+        if self.connector is not None:
+            return self.connector.transport
+        return ApiTransport.default()
+
+    def prepare(self, headers=None, body=None):
+        """
+        Merge the headers of the request and encode the body (JsonCodec)
+        :param headers: headers added to the header parameters of the request
+        :param body: body to send (json object)
+        :return: (headers, encoded body or None)
+        """
+        if body is not None:
+            headers = dict(headers or {}, **{"Content-Type": "application/json"})
+        if headers:
+            headers = dict(self.headers, **headers)
+        else:
+            headers = self.headers
+        return headers, None if body is None else JsonCodec.dumps(body)
+
+    def send(self, url, headers=None, body=None, **kwargs):
+        """
+        Send the request through the transport
+        Failed attempts are retried following the RetryPolicy of the ApiConnector (on another server of the
+        ServerPool if available), the call fails fast while the circuit breakers of the servers are open
+        and waits for the rate limiters of the ApiConnector
+        :param url: url to call (not None)
+        :param headers: headers added to the header parameters of the request
+        :param body: body to send (json object)
+        :param kwargs: arguments passed to the transport (stream, ...)
+        :return: (response, error_flag)
+        """
+        (headers, data) = self.prepare(headers, body)
+        if data is not None:
+            kwargs["data"] = data
+        metrics = self.get_metrics()
+        retry_policy = self.get_retry_policy()
+        deadline = None
+        if retry_policy is not None:
+            retry_policy.record_call()
+            deadline = retry_policy.get_deadline()
+        tried = []
+        attempt = 0
+        while True:
+            target = self.select_target(url, tried)
+            if target is None:
+                return self.get_circuit_open_response(), True
+            (server, target_url, breaker) = target
+            wait = self.reserve_rate_limit(server)
+            if wait > 0:
+                time.sleep(wait)
+            start = time.perf_counter()
+            try:
+                response = self.get_transport().request(
+                    self.request_method, target_url, auth=self.authentication.authentication_func,
+                    headers=headers, **kwargs)
+                error = None
+            except (requests.exceptions.InvalidURL, requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as e:
+                response = None
+                error = e
+            except BaseException:
+                # Other errors (ex.: ChunkedEncodingError) are raised, the attempt is still released
+                self.__abort_attempt(server, breaker, time.perf_counter() - start)
+                raise
+            delay = self.__record_attempt(
+                server, breaker, retry_policy, attempt, response, deadline, error, time.perf_counter() - start)
+            if delay is None:
+                break
+            if response is not None:
+                response.close()
+            tried.append(server["url"])
+            time.sleep(delay)
+            attempt += 1
+        if response is None:
+            # TODO: Adjust response for Exception handling
+            return MockResponse({}, 500), True
+        if metrics is not None:
+            self.__record_transfer(metrics, response, time.perf_counter() - start, kwargs.get("stream", False))
+        return response, False
+
+    def get_retry_policy(self):
+        """
+        Retry policy of the ApiConnector
+        :return: RetryPolicy object, None if deactivated
+        """
+        if self.connector is None:
+            return None
+        return self.connector.retry_policy
+
+    def get_server_pool(self):
+        """
+        Server pool of the ApiConnector
+        :return: ServerPool object, None if deactivated (all the calls go to self.server)
+        """
+        if self.connector is None:
+            return None
+        return self.connector.server_pool
+
+    def get_circuit_breaker(self, server):
+        """
+        Circuit breaker of a server
+        :param server: server of the call
+        :return: CircuitBreaker object, None if deactivated
+        """
+        if self.connector is None or server is None:
+            return None
+        return self.connector.get_circuit_breaker(server.get("url"))
+
+    def reserve_rate_limit(self, server):
+        """
+        Take a token in the rate limiters of the operation and of the server
+        :param server: server of the call
+        :return: seconds to wait before the call
+        """
+        if self.connector is None or server is None:
+            return 0.0
+        return self.connector.reserve_rate_limit(self.endpoint, self.request_type, server.get("url"))
+
+    def select_target(self, url, tried=()):
+        """
+        Select the server of an attempt, the servers with an open circuit breaker are skipped
+        The url built with self.server is moved to the selected server
+        :param url: url built by ApiRequest.build_url
+        :param tried: urls of the servers of the previous attempts (modified)
+        :return: (server, url of the attempt, CircuitBreaker object or None), None if all the circuits are open
+        """
+        pool = self.get_server_pool()
+        while True:
+            server = self.server if pool is None else pool.select(exclude=tried)
+            breaker = self.get_circuit_breaker(server)
+            if breaker is None or breaker.allow_request():
+                if pool is not None:
+                    pool.acquire(server)
+                    if url.startswith(self.server["url"]):
+                        url = "{}{}".format(server["url"], url[len(self.server["url"]):])
+                return server, url, breaker
+            if pool is None or server["url"] in tried:
+                return None
+            tried.append(server["url"])
+
+    def get_circuit_open_response(self):
+        """
+        Response of a call refused by the open circuit breakers
+        :return: MockResponse object
+        """
+        if self.get_server_pool() is not None:
+            return MockResponse({}, 503, error_message="circuit breaker open for all the servers")
+        return MockResponse({}, 503, error_message="circuit breaker open for {}".format(self.server.get("url")))
+
+    def __record_attempt(self, server, breaker, retry_policy, attempt, response, deadline, error, latency):
+        """
+        Record the result of an attempt in the server pool and the circuit breaker and decide if the call is retried
+        :param server: server of the attempt
+        :param breaker: CircuitBreaker object (None if deactivated)
+        :param retry_policy: RetryPolicy object (None if deactivated)
+        :param attempt: number of the attempt (0 for the first one)
+        :param response: response of the attempt (None for a connection error)
+        :param deadline: end of the retry budget
+        :param error: exception raised by the attempt
+        :param latency: duration of the attempt in seconds
+        :return: delay before the next attempt, None if the call is finished
+        """
+        pool = self.get_server_pool()
+        if pool is not None:
+            pool.release(server, latency, response is not None and response.status_code < 500)
+        if breaker is not None:
+            breaker.record(response)
+        if retry_policy is None or isinstance(error, requests.exceptions.InvalidURL):
+            return None
+        delay = retry_policy.get_delay(self.request_method, attempt, response, deadline)
+        if delay is not None:
+            logging.debug("Retry {} of {} {} in {:.3f}s".format(
+                attempt + 1, self.request_method, self.endpoint, delay))
+        return delay
+
+    def __abort_attempt(self, server, breaker, latency):
+        """
+        Release an attempt ended by an unexpected exception, recorded as a failure
+        (frees the trial call of a half-open circuit breaker and the slot of the server in the pool)
+        :param server: server of the attempt
+        :param breaker: CircuitBreaker object (None if deactivated)
+        :param latency: duration of the attempt in seconds
+        """
+        pool = self.get_server_pool()
+        if pool is not None:
+            pool.release(server, latency, False)
+        if breaker is not None:
+            breaker.record_failure()
+
+    def __record_transfer(self, metrics, response, duration, stream):
+        """
+        Record the connect and transfer times and the transferred bytes of a response
+        :param metrics: ApiMetrics object
+        :param response: requests.Response object
+        :param duration: total duration of the request
+        :param stream: True if the body of the response has not been read yet
+        """
+        operation = (self.endpoint, self.request_type)
+        # requests.Response.elapsed: time until the headers of the response are parsed
+        connect = min(response.elapsed.total_seconds(), duration)
+        metrics.observe(operation, "connect", connect)
+        if not stream:
+            metrics.observe(operation, "transfer", duration - connect)
+        body = response.request.body if response.request is not None else None
+        metrics.add_bytes(operation, 0 if stream else len(response.content), len(body) if body is not None else 0)
+
+    def execute(self, url, **kwargs):
+        """
+        Send the request through the transport and create the std response
+        :param url: url to call
+        :param kwargs: arguments passed to ApiRequest.send (body, ...)
+        :return: std response
+        """
+        if url is not None:
+            (response, error_flag) = self.send(url, **kwargs)
+        else:
+            response = None
+            error_flag = True
+        return self.process_response(url, response, error_flag)
+
+    def get_async_transport(self):
+        """
+        Asynchronous transport of the ApiConnector
+        :return: AsyncApiTransport object
+        """
+        if self.connector is None:
+            raise RuntimeError("Asynchronous calls need a request created from an ApiConnector.")
+        return self.connector.async_transport
+
+    async def aexecute(self, url, body=None):
+        """
+        Asynchronous version of ApiRequest.execute
+        :param url: url to call
+        :param body: body to send (json object)
+        :return: std response
+        """
+        if url is None:
+            return self.process_response(url, None, True)
+        metrics = self.get_metrics()
+        retry_policy = self.get_retry_policy()
+        deadline = None
+        if retry_policy is not None:
+            retry_policy.record_call()
+            deadline = retry_policy.get_deadline()
+        (headers, data) = self.prepare(body=body)
+        tried = []
+        attempt = 0
+        while True:
+            target = self.select_target(url, tried)
+            if target is None:
+                return self.process_response(url, self.get_circuit_open_response(), True)
+            (server, target_url, breaker) = target
+            wait = self.reserve_rate_limit(server)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            start = time.perf_counter()
+            try:
+                response = await self.get_async_transport().request(
+                    self.request_method, target_url, auth=self.authentication.authentication_func,
+                    headers=headers, data=data)
+                error = None
+            except (requests.exceptions.InvalidURL, requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as e:
+                response = None
+                error = e
+            except BaseException:
+                # Other errors (ex.: aiohttp.ClientPayloadError, cancellation) are raised, the attempt is released
+                self.__abort_attempt(server, breaker, time.perf_counter() - start)
+                raise
+            delay = self.__record_attempt(
+                server, breaker, retry_policy, attempt, response, deadline, error, time.perf_counter() - start)
+            if delay is None:
+                break
+            tried.append(server["url"])
+            await asyncio.sleep(delay)
+            attempt += 1
+        if response is None:
+            # TODO: Adjust response for Exception handling
+            return self.process_response(url, MockResponse({}, 500), True)
+        if metrics is not None:
+            operation = (self.endpoint, self.request_type)
+            for (phase, duration) in (getattr(response, "timings", None) or {}).items():
+                metrics.observe(operation, phase, duration)
+            metrics.add_bytes(operation, getattr(response, "bytes_in", 0), len(data) if data is not None else 0)
+        return self.process_response(url, response, False)
+
+    def stream(self, url, body=None, pointer=None, chunk_size=65536):
+        """
+        Process the API call and stream the items of the json array of the response
+        Each item is validated against the "items" schema of the response while iterating
+        :param url: url to call
+        :param body: body to send
+        :param pointer: json pointer of the array in the payload (None for a top-level array)
+        :param chunk_size: size of the chunks read from the connection
+        :return: ApiStreamResponse object (iterable of the items)
+        """
+        self.validate_body(body)
+        if url is not None:
+            (response, error_flag) = self.send(url, body=body, stream=True)
+        else:
+            (response, error_flag) = (MockResponse({}, 500), True)
+        validator = None
+        policy = self.get_validation_policy()
+        metrics = self.get_metrics()
+        operation = (self.endpoint, self.request_type)
+
+        def record(is_valid, duration=None):
+            """
+            Record the result of the validation of the streamed items, as ApiRequest.process_response does
+            :param is_valid: True if all the items are valid
+            :param duration: time spent validating the items (None if not validated)
+            """
+            if policy is not None:
+                policy.record(operation, is_valid)
+            if metrics is not None:
+                if duration is not None:
+                    metrics.observe(operation, "validation", duration)
+                metrics.count_validation(operation, is_valid)
+
+        if not error_flag:
+            if metrics is not None:
+                metrics.count_status(operation, response.status_code)
+            try:
+                if self.check_response(str(response.status_code)) \
+                        and (policy is None or policy.should_validate(operation)):
+                    try:
+                        validator = self.get_items_validator(str(response.status_code), "application/json", pointer)
+                    except jsonschema.exceptions.SchemaError:
+                        logging.debug("Invalid schema for validation of status_code {}!".format(
+                            response.status_code))
+                        record(False)
+            except OpenApiDefinitionException.StatusCodeException:
+                logging.debug("No schema found for validation of status_code {}!".format(response.status_code))
+        return ApiStreamResponse(url, response, validator=validator, pointer=pointer, error_flag=error_flag,
+                                 chunk_size=chunk_size, record=record)
+
     def call(self, url, body=None):
         """
         Process the API call
@@ -206,82 +804,117 @@ class ApiRequest:
         """
         raise NotImplementedError
 
+    async def acall(self, url, body=None):
+        """
+        Process the API call asynchronously (the ApiConnector must be opened with 'async with')
+        :param url: url to call
+        :param body: body to send
+        :return: std response
+        """
+        raise NotImplementedError
+
 
 class ApiPostRequest(ApiRequest):
     """
     Post handler
     """
+    request_method = "post"
 
     def call(self, url, body=None):
-        if url is not None:
-            try:
-                response = requests.post(url=url, json=body, auth=self.authentication.authentication_func)
-                error_flag = False
-            except (requests.exceptions.InvalidURL, requests.exceptions.ConnectionError):
-                # TODO: Adjust response for Exception handling
-                response = MockResponse({}, 500)
-                error_flag = True
-        else:
-            response = None
-            error_flag = True
-        return self.process_response(url, response, error_flag)
+        self.validate_body(body)
+        return self.execute(url, body=body)
+
+    async def acall(self, url, body=None):
+        self.validate_body(body)
+        return await self.aexecute(url, body=body)
 
 
 class ApiGetRequest(ApiRequest):
     """
     Get handler
     """
+    request_method = "get"
 
     def call(self, url, body=None):
-        if url is not None:
-            try:
-                response = requests.get(url=url, auth=self.authentication.authentication_func)
-                error_flag = False
-            except (requests.exceptions.InvalidURL, requests.exceptions.ConnectionError):
-                # TODO: Adjust response for Exception handling
-                response = MockResponse({}, 500)
-                error_flag = True
-        else:
-            response = None
-            error_flag = True
-        return self.process_response(url, response, error_flag)
+        single_flight = self.get_single_flight()
+        if single_flight is None or url is None:
+            return self.__call(url)
+        return single_flight.do(self.get_flight_key(url), lambda: self.__call(url))
+
+    async def acall(self, url, body=None):
+        """
+        Process the API call asynchronously, the ResponseCache of the ApiConnector is not used
+        (its conditional requests go through the synchronous transport)
+        :param url: url to call
+        :param body: body to send
+        :return: std response
+        """
+        single_flight = self.get_single_flight()
+        if single_flight is None or url is None:
+            return await self.aexecute(url)
+        return await single_flight.ado(self.get_flight_key(url), lambda: self.aexecute(url))
+
+    def get_single_flight(self):
+        """
+        Single-flight layer of the ApiConnector
+        :return: SingleFlight object, None if deactivated
+        """
+        if self.connector is None:
+            return None
+        return self.connector.single_flight
+
+    def get_flight_key(self, url):
+        """
+        Key of the identical calls: method, url, headers, identity of the caller and type of the result
+        :param url: url to call
+        :return: hashable key
+        """
+        return (self.request_method, url, tuple(sorted(self.headers.items())), self.authentication.get_identity(),
+                self.std_response)
+
+    def __call(self, url):
+        cache = None if self.connector is None else self.connector.response_cache
+        if cache is None or url is None:
+            return self.execute(url)
+        # The identity of the caller: a cache may be shared by connectors with different credentials
+        key = (url, tuple(sorted(self.headers.items())), self.authentication.get_identity(), self.std_response)
+        entry = cache.lookup(key)
+        if entry is not None and cache.is_fresh(entry):
+            return entry["output"]
+        (response, error_flag) = self.send(
+            url, headers=None if entry is None else cache.get_conditional_headers(entry))
+        if not error_flag and response.status_code == 304 and entry is not None:
+            cache.refresh(key, response.headers)
+            return entry["output"]
+        output = self.process_response(url, response, error_flag)
+        if not error_flag:
+            cache.store(key, output, response.status_code, response.headers, len(response.content))
+        return output
 
 
 class ApiPutRequest(ApiRequest):
     """
     Put handler
     """
+    request_method = "put"
 
     def call(self, url, body=None):
-        if url is not None:
-            try:
-                response = requests.put(url=url, auth=self.authentication.authentication_func, json=body)
-                error_flag = False
-            except (requests.exceptions.InvalidURL, requests.exceptions.ConnectionError):
-                # TODO: Adjust response for Exception handling
-                response = MockResponse({}, 500)
-                error_flag = True
-        else:
-            response = None
-            error_flag = True
-        return self.process_response(url, response, error_flag)
+        self.validate_body(body)
+        return self.execute(url, body=body)
+
+    async def acall(self, url, body=None):
+        self.validate_body(body)
+        return await self.aexecute(url, body=body)
 
 
 class ApiDeleteRequest(ApiRequest):
     """
     Delete handler
     """
+    request_method = "delete"
 
     def call(self, url, body=None):
-        if url is not None:
-            try:
-                response = requests.delete(url=url, auth=self.authentication.authentication_func)
-                error_flag = False
-            except (requests.exceptions.InvalidURL, requests.exceptions.ConnectionError):
-                # TODO: Adjust response for Exception handling
-                response = MockResponse({}, 500)
-                error_flag = True
-        else:
-            response = None
-            error_flag = True
-        return self.process_response(url, response, error_flag)
+        return self.execute(url)
+
+    async def acall(self, url, body=None):
+        return await self.aexecute(url)
@@ -1,6 +1,8 @@
 import os
 import sys
+import threading
 
+from .JsonCodec import JsonCodec
 from .JsonHandler import JsonHandler
 
 
@@ -8,7 +10,14 @@ from .JsonHandler import JsonHandler
 class ApiResponse:
     """
     Class to handle the response of the API calls
+    The payload, status and message of the std response are attributes, the std response (envelope)
+    is only built by ApiResponse.to_object
     """
+    __slots__ = ("url", "status_code", "payload", "status", "message")
+    # Set to True to validate each std response against schemas/output.json
+    DEBUG = False
+    __schema_validator = None
+    __schema_lock = threading.Lock()
 
     def __init__(self, url, response, error_flag=False, error_message=""):
         """
@@ -20,36 +29,83 @@ class ApiResponse:
         """
         self.url = url
         self.status_code = response.status_code
-        self.content = response.json()
-        self.is_empty = (response.json() == "")
-        self.is_error = error_flag
-        self.error_message = error_message
-        schema_dir = os.path.abspath(
-            os.path.join(os.path.dirname(sys.modules[ApiResponse.__module__].__file__), ".."))
-        self.schema = JsonHandler.read_json("{}/schemas/output.json".format(schema_dir))
+        self.payload = ApiResponse.decode(response)
+        if error_flag:
+            self.status = 504
+            self.message = "Gateway timeout: {}".format(error_message)
+        elif self.payload == "":
+            self.status = 204
+            self.message = "No content: empty response"
+        else:
+            self.status = 200
+            if isinstance(self.payload, list):
+                self.message = "OK: list"
+            elif isinstance(self.payload, dict):
+                self.message = "OK: dict"
+            else:
+                self.message = "OK"
+
+    @property
+    def content(self):
+        """
+        Decoded body of the response (alias of payload)
+        :return: Python object
+        """
+        return self.payload
+
+    @property
+    def is_empty(self):
+        """
+        :return: True if the body of the response is empty
+        """
+        return self.status == 204
+
+    @property
+    def is_error(self):
+        """
+        :return: True for a gateway connection error
+        """
+        return self.status == 504
+
+    @staticmethod
+    def decode(response):
+        """
+        Decode the body of the response with JsonCodec (response.json() for responses without raw content)
+        :param response: requests.Response or MockResponse object
+        :return: Python object
+        """
+        content = getattr(response, "content", None)
+        if not isinstance(content, bytes) or len(content) == 0:
+            return response.json()
+        try:
+            return JsonCodec.loads(content)
+        except (ValueError, UnicodeDecodeError):
+            # Body not in utf-8: let requests detect the encoding
+            return response.json()
+
+    @staticmethod
+    def get_schema_validator():
+        """
+        Compiled validator of the std response schema (schemas/output.json), loaded once per process
+        :return: jsonschema validator object
+        """
+        with ApiResponse.__schema_lock:
+            if ApiResponse.__schema_validator is None:
+                schema_dir = os.path.abspath(
+                    os.path.join(os.path.dirname(sys.modules[ApiResponse.__module__].__file__), ".."))
+                ApiResponse.__schema_validator = JsonHandler.compile_validator(
+                    JsonHandler.read_json("{}/schemas/output.json".format(schema_dir)))
+            return ApiResponse.__schema_validator
 
     def to_object(self):
         """
-        Generate the std response
+        Generate the std response from the payload, status and message
         :return: std response
         """
         content = {"url": self.url, "status_code": self.status_code,
-                   "response": {"StatusCode": 200, "Message": "", "Payload": self.content}
+                   "response": {"StatusCode": self.status, "Message": self.message, "Payload": self.payload}
                    }
-        if self.is_error:
-            content["response"]["StatusCode"] = 504
-            content["response"]["Message"] = "Gateway timeout: {}".format(self.error_message)
-        elif self.is_empty:
-            content["response"]["StatusCode"] = 204
-            content["response"]["Message"] = "No content: empty response"
-        else:
-            if isinstance(self.content, list):
-                content["response"]["Message"] = "OK: list"
-            elif isinstance(self.content, dict):
-                content["response"]["Message"] = "OK: dict"
-            else:
-                content["response"]["Message"] = "OK"
-        if not JsonHandler.validate(content, self.schema):
+        if ApiResponse.DEBUG and not JsonHandler.validate_compiled(content, ApiResponse.get_schema_validator())[0]:
             print("Request std output is not valid against defined schema!")
         return content
 
@@ -58,14 +114,22 @@ class MockResponse:
     """
     Class to make a mocked response
     """
-    def __init__(self, json_data, status_code):
+    def __init__(self, json_data, status_code, headers=None, error_message="", timings=None, bytes_in=0):
         """
         Create the mock
         :param json_data: response body
         :param status_code: status_code
+        :param headers: headers of the response
+        :param error_message: information on the error (std response of failed calls)
+        :param timings: {phase: seconds} measured by the transport (connect, transfer, decode), None if not measured
+        :param bytes_in: size of the response body
         """
         self.json_data = json_data
         self.status_code = status_code
+        self.headers = headers if headers is not None else {}
+        self.error_message = error_message
+        self.timings = timings
+        self.bytes_in = bytes_in
 
     def json(self):
         """
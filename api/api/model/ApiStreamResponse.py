@@ -0,0 +1,64 @@
+import time
+
+from .JsonHandler import JsonHandler
+from .JsonStream import JsonStream
+
+
+class ApiStreamResponse:
+    """
+    Class to handle a streamed response: the items of the json array are validated one by one while iterating
+    """
+
+    def __init__(self, url, response, validator=None, pointer=None, error_flag=False, chunk_size=65536,
+                 record=None):
+        """
+        Constructor
+        :param url: url of the request
+        :param response: requests.Response object opened with stream=True
+        :param validator: compiled validator of one item (None: no validation)
+        :param pointer: json pointer of the array in the payload (None for a top-level array)
+        :param error_flag: if True -> Gateway connection error
+        :param chunk_size: size of the chunks read from the connection
+        :param record: function called with (is_valid, validation time) once the items are validated
+        """
+        self.url = url
+        self.response = response
+        self.status_code = response.status_code
+        self.validator = validator
+        self.pointer = pointer
+        self.is_error = error_flag
+        self.chunk_size = chunk_size
+        self.record = record
+        self.items_count = 0
+        self.invalid_items = 0
+        self.message = "Gateway timeout: " if error_flag else "OK: stream"
+
+    def __iter__(self):
+        """
+        Yield the items of the payload, invalid items are counted and flagged in ApiStreamResponse.message
+        """
+        if self.is_error:
+            return
+        duration = 0.0
+        try:
+            for item in JsonStream.iter_items(self.response.iter_content(chunk_size=self.chunk_size), self.pointer):
+                self.items_count += 1
+                if self.validator is not None:
+                    start = time.perf_counter()
+                    is_valid = JsonHandler.validate_compiled(item, self.validator, "response")[0]
+                    duration += time.perf_counter() - start
+                    if not is_valid:
+                        self.invalid_items += 1
+                        self.message = "WARNING: {}".format("Response doesn't correspond to predefined schema!")
+                yield item
+        finally:
+            self.close()
+            if self.validator is not None and self.record is not None:
+                self.record(self.invalid_items == 0, duration)
+
+    def close(self):
+        """
+        Release the connection
+        """
+        if hasattr(self.response, "close"):
+            self.response.close()
@@ -0,0 +1,66 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ApiTransport:
+    """
+    Class for the HTTP transport, keeps a pool of connections open between the calls
+    """
+    DEFAULT_POOL_CONNECTIONS = 10
+    DEFAULT_POOL_MAXSIZE = 10
+    # (connect timeout, read timeout) in seconds: a server which stops answering must not block a call forever
+    DEFAULT_TIMEOUT = (10, 60)
+    __default = None
+    __default_lock = threading.Lock()
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=False, keep_alive=True, timeout=DEFAULT_TIMEOUT):
+        """
+        ApiTransport constructor
+        :param pool_connections: number of hosts to keep a connection pool for
+        :param pool_maxsize: maximum number of connections kept per host
+        :param pool_block: if True, wait for a free connection instead of opening a new one above pool_maxsize
+        :param keep_alive: set to False to close the connection after each call
+        :param timeout: default timeout of the requests in seconds, (connect timeout, read timeout) or one value
+            for both (None: wait forever)
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+
+    @staticmethod
+    def default():
+        """
+        Transport shared by the requests which are not created from an ApiConnector
+        :return: ApiTransport object
+        """
+        with ApiTransport.__default_lock:
+            if ApiTransport.__default is None:
+                ApiTransport.__default = ApiTransport()
+            return ApiTransport.__default
+
+    def request(self, method, url, **kwargs):
+        """
+        Send the request through the pooled session
+        :param method: HTTP method (get, post, put, delete)
+        :param url: url to call
+        :param kwargs: arguments passed to requests.Session.request (json, auth, headers, timeout, ...)
+        :return: requests.Response object (requests.exceptions.Timeout raised if the server does not answer in time)
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method=method, url=url, **kwargs)
+
+    def close(self):
+        """
+        Close all the pooled connections
+        """
+        self.session.close()
@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import requests
+
+from .ApiResponse import MockResponse
+from .ApiTransport import ApiTransport
+from .JsonCodec import JsonCodec
+from .OAuth2TokenCache import OAuth2ClientCredentialsAuth
+
+
+class AsyncApiTransport:
+    """
+    Class for the asynchronous HTTP transport (aiohttp), with a bounded pool of connections
+    """
+
+    def __init__(self, limit=100, limit_per_host=10, keep_alive=True, timeout=ApiTransport.DEFAULT_TIMEOUT):
+        """
+        AsyncApiTransport constructor, the session is created by AsyncApiTransport.open
+        :param limit: maximum number of simultaneous connections
+        :param limit_per_host: maximum number of simultaneous connections per host
+        :param keep_alive: set to False to close the connection after each call
+        :param timeout: timeout of the requests in seconds, (connect timeout, read timeout) or one value for both
+            (None: wait forever)
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.session = None
+
+    async def open(self):
+        """
+        Create the aiohttp session, must be called inside the running event loop
+        """
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("aiohttp is needed for the asynchronous calls (pip install aiohttp)")
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             force_close=not self.keep_alive)
+            (connect_timeout, read_timeout) = self.timeout if isinstance(self.timeout, tuple) \
+                else (self.timeout, self.timeout)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(
+                total=None, sock_connect=connect_timeout, sock_read=read_timeout))
+
+    async def close(self):
+        """
+        Close the aiohttp session and its connections
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def request(self, method, url, auth=None, **kwargs):
+        """
+        Send the request through the pooled session
+        Connection errors are raised as requests exceptions to be handled like the synchronous calls
+        :param method: HTTP method (get, post, put, delete)
+        :param url: url to call
+        :param auth: authentication_func of ApiAuthentication
+        :param kwargs: arguments passed to aiohttp.ClientSession.request (data, headers, ...)
+        :return: MockResponse object with the decoded body, the timings of the phases (connect, transfer, decode)
+            and the size of the body
+        """
+        import aiohttp
+        if self.session is None:
+            raise RuntimeError("AsyncApiTransport is not opened (use 'async with ApiConnector(...)').")
+        if isinstance(auth, requests.auth.HTTPBasicAuth):
+            kwargs["auth"] = aiohttp.BasicAuth(auth.username, auth.password)
+        if isinstance(auth, OAuth2ClientCredentialsAuth):
+            token = await auth.token_cache.aget_token()
+            kwargs["headers"] = dict(kwargs.get("headers") or {})
+            kwargs["headers"]["Authorization"] = "Bearer {}".format(token)
+            (status_code, headers, content, timings) = await self.__send(method, url, **kwargs)
+            if status_code == 401:
+                # Rejected token: refreshed once for all the tasks, then sent again
+                token = await asyncio.get_running_loop().run_in_executor(None, auth.token_cache.invalidate, token)
+                kwargs["headers"]["Authorization"] = "Bearer {}".format(token)
+                (status_code, headers, content, timings) = await self.__send(method, url, **kwargs)
+        else:
+            (status_code, headers, content, timings) = await self.__send(method, url, **kwargs)
+        start = time.perf_counter()
+        payload = JsonCodec.loads(content) if content else ""
+        timings["decode"] = time.perf_counter() - start
+        return MockResponse(payload, status_code, headers=headers, timings=timings, bytes_in=len(content))
+
+    async def __send(self, method, url, **kwargs):
+        """
+        Send one request
+        :param method: HTTP method
+        :param url: url to call
+        :param kwargs: arguments passed to aiohttp.ClientSession.request
+        :return: (status code, headers, body as bytes, {"connect": time until the headers, "transfer": body time})
+        """
+        import aiohttp
+        start = time.perf_counter()
+        try:
+            async with self.session.request(method, url, **kwargs) as response:
+                connected = time.perf_counter()
+                content = await response.read()
+                timings = {"connect": connected - start, "transfer": time.perf_counter() - connected}
+                return response.status, response.headers.copy(), content, timings
+        except aiohttp.InvalidURL as e:
+            raise requests.exceptions.InvalidURL(str(e))
+        except asyncio.TimeoutError as e:
+            # Before aiohttp.ClientConnectionError: aiohttp.ServerTimeoutError is both
+            raise requests.exceptions.Timeout(str(e))
+        except aiohttp.ClientConnectionError as e:
+            raise requests.exceptions.ConnectionError(str(e))
@@ -0,0 +1,72 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one server: after failure_threshold consecutive failures the calls fail fast
+    during recovery_timeout seconds, then one trial call decides if the circuit is closed again
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0):
+        """
+        CircuitBreaker constructor
+        :param failure_threshold: number of consecutive failures opening the circuit
+        :param recovery_timeout: seconds before a trial call is allowed in the open circuit
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_progress = False
+        self.lock = threading.Lock()
+
+    def allow_request(self):
+        """
+        Decide if a call can be sent (each allowed call must be followed by record_success or record_failure)
+        :return: False if the call must fail fast
+        """
+        with self.lock:
+            if self.state == CircuitBreaker.CLOSED:
+                return True
+            if self.state == CircuitBreaker.OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+                self.state = CircuitBreaker.HALF_OPEN
+                self.trial_in_progress = False
+            if self.state == CircuitBreaker.HALF_OPEN and not self.trial_in_progress:
+                self.trial_in_progress = True
+                return True
+            return False
+
+    def record_success(self):
+        """
+        Record a successful call (closes the circuit)
+        """
+        with self.lock:
+            self.state = CircuitBreaker.CLOSED
+            self.failures = 0
+            self.trial_in_progress = False
+
+    def record_failure(self):
+        """
+        Record a failed call (connection error or server error)
+        """
+        with self.lock:
+            self.failures += 1
+            if self.state == CircuitBreaker.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = CircuitBreaker.OPEN
+                self.opened_at = time.monotonic()
+                self.trial_in_progress = False
+
+    def record(self, response):
+        """
+        Record the result of a call
+        :param response: response of the call (None for a connection error)
+        """
+        if response is None or response.status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
@@ -0,0 +1,199 @@
+import keyword
+import pprint
+import re
+import textwrap
+
+from .ApiRequest import ApiRequest
+from .GeneratedClient import GeneratedClient
+from .OpenApi2JsonConverter import Openapi2JsonConverter
+from .PathRouter import PARAMETER_PATTERN
+
+HEADER = '''"""
+Client of {title} generated from {source}, do not edit (regenerate with "api_ctl generate")
+"""
+from api.model.GeneratedClient import GeneratedClient
+
+SPEC = {spec}
+
+
+class {class_name}(GeneratedClient):
+    """
+    Client of {title}, one method per operation of the OpenApi Specs
+    """
+    SPEC = SPEC
+    OPERATIONS = {{
+'''
+OPERATION = '''        {name!r}: {{
+            "endpoint": {endpoint!r}, "method": {method!r}, "path_parameters": {path_parameters!r},
+            "definition": SPEC["paths"][{endpoint!r}][{method!r}],
+            "schemas": {schemas}}},
+'''
+METHOD = '''
+    def {name}(self, parameters=None, body=None):
+        """
+        {summary}
+        :param parameters: dict of parameters (parameter_name, parameter_value)
+        :param body: body to send
+        :return: std response
+        """
+        if parameters is None:
+            parameters = {{}}
+        server = self.get_server()
+        path = {template!r}.format(server["url"]{path_values})
+        return self.execute({name!r}, server, path, parameters, body)
+'''
+
+
+class ClientGenerator:
+    """
+    Generate the source code of a client module from an ApiConnector (see GeneratedClient)
+    The url templates are inlined and the json schemas of the operations are converted and bundled ahead of time
+    """
+
+    def __init__(self, connector, class_name="ApiClient"):
+        """
+        ClientGenerator constructor
+        :param connector: ApiConnector object of the OpenApi Specs
+        :param class_name: name of the generated class
+        """
+        if not class_name.isidentifier() or keyword.iskeyword(class_name):
+            raise ValueError("Invalid class name '{}'.".format(class_name))
+        self.connector = connector
+        self.class_name = class_name
+
+    def get_operations(self):
+        """
+        List the operations of the specs with a unique function name
+        (operationId, or method and path if missing, ex.: get_users_id for get /users/{id})
+        :return: list of (function name, endpoint, request_type)
+        """
+        operations = []
+        names = set(dir(GeneratedClient))
+        for endpoint in self.connector.paths:
+            for request_type in ApiRequest.REQUEST_TYPES:
+                definition = self.get_definition(endpoint, request_type)
+                if definition is None:
+                    continue
+                name = ClientGenerator.get_function_name(
+                    definition.get("operationId", "{}_{}".format(request_type, endpoint)))
+                unique_name = name
+                counter = 1
+                while unique_name in names:
+                    counter += 1
+                    unique_name = "{}_{}".format(name, counter)
+                names.add(unique_name)
+                operations.append((unique_name, endpoint, request_type))
+        return operations
+
+    def get_definition(self, endpoint, request_type):
+        """
+        Full definition of an operation in the specs (with operationId and summary,
+        left out of the endpoint definitions of ApiOperations)
+        :param endpoint: endpoint key (string) from paths (OpenApi Specs)
+        :param request_type: type of the request (get, post, ...)
+        :return: operation of the OpenApi Specs, None if not defined
+        """
+        return self.connector.resources["paths"][endpoint].get(request_type)
+
+    @staticmethod
+    def get_function_name(text):
+        """
+        Convert an operationId or a path into a python identifier
+        :param text: text to convert (ex.: get_/users/{id})
+        :return: function name (ex.: get_users_id)
+        """
+        name = re.sub(r"[\W_]+", "_", text).strip("_")
+        if name == "" or name[0].isdigit() or keyword.iskeyword(name):
+            name = "operation_{}".format(name)
+        return name
+
+    @staticmethod
+    def get_template(endpoint):
+        """
+        Split the endpoint into a format string and the names of its path parameters
+        :param endpoint: endpoint key (string) from paths (OpenApi Specs), ex.: /users/{id}
+        :return: (format string with the server url first, ex.: {}/users/{}, list of parameter names)
+        """
+        parts = PARAMETER_PATTERN.split(endpoint)
+        # parts alternate between literal text and parameter names
+        template = "{}" + "{}".join(part.replace("{", "{{").replace("}", "}}") for part in parts[::2])
+        return template, parts[1::2]
+
+    @staticmethod
+    def escape(text):
+        """
+        Make a text safe for a docstring of the generated code
+        :param text: text (ex.: summary of an operation)
+        :return: escaped text
+        """
+        return " ".join(text.replace("\\", "/").replace('"', "'").split())
+
+    def get_schemas(self, endpoint, request_type):
+        """
+        Convert and bundle the json schemas of an operation (responses and requestBody)
+        :param endpoint: endpoint key (string) from paths (OpenApi Specs)
+        :param request_type: type of the request (get, post, ...)
+        :return: {validator key (ex.: (status_code, result_type)): json schema}
+        """
+        request = ApiRequest.create_request(self.connector, endpoint, request_type)
+        schemas = {}
+        for (status_code, response) in request.endpoint_definition.get("responses", {}).items():
+            for (result_type, content) in (response.get("content") or {}).items():
+                if "schema" in content:
+                    schemas[(status_code, result_type)] = request.build_response_schema(status_code, result_type)
+        request_body = request.endpoint_definition.get("requestBody") or {}
+        for (result_type, content) in request_body.get("content", {}).items():
+            if "schema" in content:
+                schemas[("requestBody", result_type)] = request.add_components(
+                    Openapi2JsonConverter.convert_open_api_specs_to_json_schema(content["schema"]))
+        return schemas
+
+    @staticmethod
+    def format_schemas(schemas):
+        """
+        Format the schemas of an operation for the OPERATION template, wrapped at 120 characters
+        :param schemas: {validator key: json schema}
+        :return: python source of the schemas
+        """
+        indent = len('            "schemas": ')
+        return textwrap.indent(pprint.pformat(schemas, width=120 - indent), " " * indent).lstrip()
+
+    def generate(self, source=""):
+        """
+        Generate the source code of the client module
+        :param source: name of the specs file, written in the module docstring
+        :return: source code as string
+        """
+        resources = self.connector.resources
+        info = resources.get("info", {})
+        title = " ".join(str(info[key]) for key in ("title", "version") if key in info) or "the API"
+        spec = {key: value for (key, value) in resources.items() if key in ("openapi", "info", "servers",
+                                                                              "paths", "components")}
+        operations = self.get_operations()
+        code = [HEADER.format(title=ClientGenerator.escape(title),
+                              source=ClientGenerator.escape(source or "the OpenApi Specs"),
+                              spec=pprint.pformat(spec, width=120), class_name=self.class_name)]
+        for (name, endpoint, request_type) in operations:
+            schemas = self.get_schemas(endpoint, request_type)
+            code.append(OPERATION.format(name=name, endpoint=endpoint, method=request_type,
+                                         path_parameters=ClientGenerator.get_template(endpoint)[1],
+                                         schemas=ClientGenerator.format_schemas(schemas)))
+        code.append("    }\n")
+        for (name, endpoint, request_type) in operations:
+            (template, path_parameters) = ClientGenerator.get_template(endpoint)
+            summary = str(self.get_definition(endpoint, request_type).get("summary", ""))
+            code.append(METHOD.format(
+                name=name, template=template,
+                summary=ClientGenerator.escape(
+                    "{} {}{}".format(request_type.upper(), endpoint, " - " + summary if summary else "")),
+                path_values=", *self.fill_path({!r}, parameters)".format(name) if path_parameters else ""))
+        return "".join(code)
+
+    def write(self, output_file, source=""):
+        """
+        Generate the client module and write it
+        :param output_file: path of the python file to write
+        :param source: name of the specs file, written in the module docstring
+        """
+        with open(output_file, "w") as f:
+            f.write(self.generate(source))
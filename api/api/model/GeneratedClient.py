@@ -0,0 +1,119 @@
+from .ApiConnector import ApiConnector
+from .ApiRequest import ApiDeleteRequest
+from .ApiRequest import ApiGetRequest
+from .ApiRequest import ApiPostRequest
+from .ApiRequest import ApiPutRequest
+from ..exceptions import RequestException
+
+
+class GeneratedClient:
+    """
+    Base class of the clients generated from the OpenApi Specs (ClientGenerator, "api_ctl generate")
+    The generated subclass defines SPEC (specs loaded without validation), OPERATIONS ({function name: operation})
+    and one method per operation filling its url template directly
+    """
+    SPEC = {"openapi": "3.0.1", "info": {}, "servers": [], "paths": {}}
+    # {function name: {"endpoint", "method", "definition", "path_parameters", "schemas"}}
+    OPERATIONS = {}
+    REQUEST_CLASSES = {"get": ApiGetRequest, "post": ApiPostRequest, "put": ApiPutRequest,
+                       "delete": ApiDeleteRequest}
+
+    def __init__(self, server_description=None, **kwargs):
+        """
+        GeneratedClient constructor
+        :param server_description: description of the server to call (default: first server of the specs)
+        :param kwargs: other arguments of the ApiConnector (authentication, parameters, retry_policy, ...)
+        """
+        self.connector = ApiConnector(self.SPEC, is_openapi=False, **kwargs)
+        if server_description is not None:
+            self.connector.select_server_by_description(server_description)
+        elif len(self.SPEC.get("servers", [])) > 0:
+            self.connector.server = self.SPEC["servers"][0]
+        # Parameter serialization plans {function name: ParameterPlan}
+        self.plans = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Release the pooled connections of the ApiConnector
+        """
+        self.connector.close()
+
+    def get_server(self):
+        """
+        Server the urls are built with (moved to the server selected per call if a server pool is used)
+        :return: server bloc {"url":<something>, "description":<something>}
+        """
+        if self.connector.server_pool is not None:
+            return self.connector.server_pool.servers[0]
+        return self.connector.server
+
+    def get_plan(self, name):
+        """
+        Get the parameter serialization plan of an operation (shared through the ApiConnector)
+        :param name: function name of the operation
+        :return: ParameterPlan object
+        """
+        plan = self.plans.get(name)
+        if plan is None:
+            operation = self.OPERATIONS[name]
+            plan = self.plans[name] = self.connector.get_parameter_plan(operation["endpoint"], operation["method"])
+        return plan
+
+    def fill_path(self, name, parameters):
+        """
+        Serialize the path parameters of an operation
+        :param name: function name of the operation
+        :param parameters: dict of parameters (parameter_name, parameter_value)
+        :return: list of the serialized values, in the order of the url template
+        """
+        plan = self.get_plan(name)
+        values = []
+        for parameter_name in self.OPERATIONS[name]["path_parameters"]:
+            if parameter_name not in parameters:
+                raise RequestException.RequestAbortedException(
+                    "Required parameter '{}' is missing!".format(parameter_name))
+            values.append(plan.serialize_path_parameter(parameter_name, parameters[parameter_name]))
+        return values
+
+    def create_request(self, name, server):
+        """
+        Create the request of an operation without looking up the specs
+        :param name: function name of the operation
+        :param server: server of the request
+        :return: ApiRequest object
+        """
+        operation = self.OPERATIONS[name]
+        request = self.REQUEST_CLASSES[operation["method"]](
+            server, self.connector.authentication, operation["definition"], operation["endpoint"])
+        request.request_type = operation["method"]
+        request.connector = self.connector
+        request.body_validation = self.connector.body_validation
+        request.components = self.SPEC.get("components")
+        request.parameter_plan = self.get_plan(name)
+        request.schemas = operation["schemas"]
+        return request
+
+    def execute(self, name, server, path, parameters, body=None):
+        """
+        Process the call of an operation
+        :param name: function name of the operation
+        :param server: server the path has been appended to
+        :param path: url with the filled path
+        :param parameters: dict of parameters (parameter_name, parameter_value)
+        :param body: body to send
+        :return: std response
+        """
+        request = self.create_request(name, server)
+        plan = request.parameter_plan
+        plan.check_required(parameters)
+        query = plan.build_query(parameters)
+        request.headers = plan.build_headers(parameters)
+        if query is None:
+            return request.call(path, body)
+        return request.call("{}?{}".format(path, query), body)
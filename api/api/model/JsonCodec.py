@@ -0,0 +1,91 @@
+import json
+import math
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JsonCodec:
+    """
+    Json encoding/decoding with the fastest available backend (orjson, ujson, then json of the standard library)
+    Data the fast backends refuse (ex.: non-string keys) is handled by the standard library
+    Non-finite floats (NaN, Infinity) are refused by every backend with ValueError, like requests(json=...)
+    """
+    BACKENDS = ["orjson", "ujson", "json"]
+    backend = "orjson" if orjson is not None else "ujson" if ujson is not None else "json"
+
+    @staticmethod
+    def set_backend(backend):
+        """
+        Select the backend
+        :param backend: one of JsonCodec.BACKENDS (must be installed)
+        """
+        if backend not in JsonCodec.BACKENDS:
+            raise ValueError("Only {} are available.".format(JsonCodec.BACKENDS))
+        if (backend == "orjson" and orjson is None) or (backend == "ujson" and ujson is None):
+            raise ImportError("{} is not installed.".format(backend))
+        JsonCodec.backend = backend
+
+    @staticmethod
+    def loads(data):
+        """
+        Decode json
+        :param data: bytes or string
+        :return: Python object
+        """
+        try:
+            if JsonCodec.backend == "orjson":
+                return orjson.loads(data)
+            if JsonCodec.backend == "ujson":
+                return ujson.loads(data)
+        except ValueError:
+            # Let the standard library decide (and raise json.JSONDecodeError on invalid data)
+            pass
+        return json.loads(data)
+
+    @staticmethod
+    def dumps(json_object):
+        """
+        Encode json
+        :param json_object: Python object
+        :return: bytes (utf-8)
+        """
+        try:
+            if JsonCodec.backend == "orjson":
+                data = orjson.dumps(json_object)
+                # orjson encodes the non-finite floats as null
+                if b"null" not in data or not JsonCodec.has_non_finite(json_object):
+                    return data
+            elif JsonCodec.backend == "ujson":
+                data = ujson.dumps(json_object, ensure_ascii=False).encode("utf-8")
+                if (b"NaN" not in data and b"Infinity" not in data) or not JsonCodec.has_non_finite(json_object):
+                    return data
+        except (TypeError, ValueError, OverflowError):
+            pass
+        # Raise ValueError for the non-finite floats
+        return json.dumps(json_object, allow_nan=False).encode("utf-8")
+
+    @staticmethod
+    def has_non_finite(json_object):
+        """
+        Check if a Python object contains non-finite floats
+        :param json_object: Python object
+        :return: True if NaN, Infinity or -Infinity is found
+        """
+        stack = [json_object]
+        while len(stack) > 0:
+            node = stack.pop()
+            if isinstance(node, float):
+                if not math.isfinite(node):
+                    return True
+            elif isinstance(node, dict):
+                stack.extend(node.values())
+            elif isinstance(node, (list, tuple)):
+                stack.extend(node)
+        return False
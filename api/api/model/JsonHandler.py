@@ -1,10 +1,10 @@
 import json
-
 import jsonschema
 import logging
 import os
 import traceback
 
+from .JsonCodec import JsonCodec
 from ..exceptions.ValidationException import ApiDefinitionValidationException
 from ..exceptions.ValidationException import BodyValidationException
 from ..exceptions.ValidationException import ResponseValidationException
@@ -24,8 +24,8 @@ class JsonHandler:
         :return: Python object
         """
         try:
-            with open(filename, 'r') as json_file:
-                resources = json.load(json_file)
+            with open(filename, 'rb') as json_file:
+                resources = JsonCodec.loads(json_file.read())
             return resources
         except FileNotFoundError:
             logging.error("File {} not found!".format(filename))
@@ -46,8 +46,9 @@ class JsonHandler:
         try:
             saved_content = JsonHandler.read_json(filename)
             if overwrite or (saved_content == {}):
+                # Standard library output, the files keep the same format whatever the backend
                 with open(filename, 'w') as fp:
-                    fp.write(str(json.dumps(json_object)))
+                    json.dump(json_object, fp)
                 return True
             else:
                 return False
@@ -84,3 +85,28 @@ class JsonHandler:
                 return False, "SchemaError: {}".format(e)
         except ValidationException as e:
             return False, str(e)
+
+    @staticmethod
+    def compile_validator(json_schema):
+        """
+        Check jsonSchema once and build a reusable validator for it
+        :param json_schema: json schema to compile
+        :return: jsonschema validator object (jsonschema.exceptions.SchemaError raised if the schema is invalid)
+        """
+        validator_class = jsonschema.validators.validator_for(json_schema)
+        validator_class.check_schema(json_schema)
+        return validator_class(json_schema)
+
+    @staticmethod
+    def validate_compiled(json_object, validator, validation_type=None):
+        """
+        Validate jsonObject with a validator built by JsonHandler.compile_validator
+        :param json_object: json object to check
+        :param validator: compiled validator
+        :param validation_type: [None, "api_definition", "body", "response"]
+        :return: (True/False, error_message)
+        """
+        error = jsonschema.exceptions.best_match(validator.iter_errors(json_object))
+        if error is None:
+            return True, ""
+        return False, "ValidationError - {}: {}".format(validation_type, error.message)
@@ -0,0 +1,169 @@
+import codecs
+import json
+import re
+
+from ..exceptions.ValidationException import ResponseValidationException
+
+NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+# End of a number or a literal (true, false, null)
+SCALAR_END = re.compile(r"[ \t\n\r,\]]")
+# Characters changing the nesting of a container, and the special characters of a string
+STRUCTURE = re.compile(r'[\[\]{}"]')
+STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class JsonStream:
+    """
+    Incremental decoding of the items of a json array, the memory used depends on the size of one item only
+    """
+
+    @staticmethod
+    def iter_items(chunks, pointer=None):
+        """
+        Yield the items of the array as soon as they are complete
+        :param chunks: iterable of bytes (ex.: requests.Response.iter_content())
+        :param pointer: json pointer of the array (ex.: "/data"), None for a top-level array (needs ijson otherwise)
+        :return: generator of decoded items
+        """
+        if pointer:
+            return JsonStream.__iter_items_ijson(chunks, pointer)
+        return JsonStream.__iter_top_level_items(chunks)
+
+    @staticmethod
+    def __iter_items_ijson(chunks, pointer):
+        try:
+            import ijson
+        except ImportError:
+            raise ImportError("ijson is needed to stream arrays below a json pointer (pip install ijson)")
+        prefix = ".".join(pointer.strip("/").split("/") + ["item"])
+        return ijson.items(JsonStream.ChunkReader(chunks), prefix)
+
+    @staticmethod
+    def __iter_top_level_items(chunks):
+        """
+        Split the array into the texts of its items with a linear scan (each character is scanned once),
+        each item is decoded once when complete
+        :param chunks: iterable of bytes
+        :return: generator of decoded items
+        """
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder("utf-8")()
+        # "start": before "[", "first": first item or "]", "item": item after ",", "delimiter": "," or "]"
+        state = "start"
+        # Scan of the current item: None between items, "container", "string" or "scalar"
+        kind = None
+        depth = 0
+        in_string = False
+        escape_pending = False
+        # Text of the current item read in the previous chunks
+        pieces = []
+        chunks = iter(chunks)
+        while True:
+            chunk = next(chunks, None)
+            is_last = chunk is None
+            text = text_decoder.decode(b"" if is_last else chunk, final=is_last)
+            position = 0
+            item_start = 0
+            while True:
+                if kind is None:
+                    match = NON_WHITESPACE.search(text, position)
+                    if match is None:
+                        break
+                    position = match.start()
+                    char = text[position]
+                    if state == "start":
+                        if char != "[":
+                            raise ResponseValidationException("ValidationError - response: payload is not an array")
+                        state = "first"
+                        position += 1
+                        continue
+                    if char == "]" and state in ("first", "delimiter"):
+                        return
+                    if state == "delimiter":
+                        if char != ",":
+                            raise json.JSONDecodeError("Expecting ',' delimiter", text, position)
+                        state = "item"
+                        position += 1
+                        continue
+                    if char in ",]":
+                        raise json.JSONDecodeError("Expecting value", text, position)
+                    item_start = position
+                    if char in "[{":
+                        (kind, depth, in_string) = ("container", 1, False)
+                        position += 1
+                    elif char == '"':
+                        (kind, depth, in_string) = ("string", 0, True)
+                        position += 1
+                    else:
+                        kind = "scalar"
+                end = None
+                if kind == "scalar":
+                    match = SCALAR_END.search(text, position)
+                    if match is not None:
+                        end = match.start()
+                else:
+                    while True:
+                        if escape_pending:
+                            if position >= len(text):
+                                break
+                            escape_pending = False
+                            position += 1
+                        match = (STRING_SPECIAL if in_string else STRUCTURE).search(text, position)
+                        if match is None:
+                            break
+                        char = match.group()
+                        position = match.end()
+                        if char == "\\":
+                            escape_pending = True
+                        elif char == '"':
+                            in_string = not in_string
+                            if not in_string and depth == 0:
+                                end = position
+                                break
+                        elif char in "[{":
+                            depth += 1
+                        else:
+                            depth -= 1
+                            if depth == 0:
+                                end = position
+                                break
+                if end is None:
+                    # Incomplete item: wait for the next chunk
+                    pieces.append(text[item_start:])
+                    break
+                pieces.append(text[item_start:end])
+                item_text = "".join(pieces)
+                pieces = []
+                (item, item_end) = decoder.raw_decode(item_text)
+                if item_end != len(item_text):
+                    raise json.JSONDecodeError("Expecting ',' delimiter", item_text, item_end)
+                kind = None
+                state = "delimiter"
+                position = end
+                yield item
+            if is_last:
+                raise json.JSONDecodeError("Unterminated array", "".join(pieces), 0)
+
+    class ChunkReader:
+        """
+        File-like object over an iterable of bytes (for ijson)
+        """
+
+        def __init__(self, chunks):
+            self.chunks = iter(chunks)
+            # Part of the last chunk not read yet
+            self.pending = b""
+
+        def read(self, size=-1):
+            # ijson probes the type of the stream with read(0): it must not consume a chunk
+            if size == 0:
+                return b""
+            # An empty read means end of stream for ijson: skip the empty chunks
+            data = self.pending
+            if not data:
+                data = next((chunk for chunk in self.chunks if chunk), b"")
+            if 0 < size < len(data):
+                (data, self.pending) = (data[:size], data[size:])
+            else:
+                self.pending = b""
+            return data
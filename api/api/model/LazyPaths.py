@@ -0,0 +1,47 @@
+import collections.abc
+import logging
+
+from .ApiOperations import ApiOperations
+from .JsonHandler import JsonHandler
+
+
+class LazyPaths(collections.abc.Mapping):
+    """
+    Mapping {endpoint: ApiOperations} over the paths of the OpenApi Specs, the ApiOperations of an endpoint
+    is built (and its path item validated against the OpenApi Specs schema) on its first access
+    """
+
+    def __init__(self, resource_paths, validator=None):
+        """
+        LazyPaths constructor
+        :param resource_paths: paths of the OpenApi Specs
+        :param validator: compiled validator of a path item (None to deactivate the validation)
+        """
+        self.resource_paths = resource_paths
+        self.validator = validator
+        self.views = {}
+
+    def __getitem__(self, path):
+        view = self.views.get(path)
+        if view is None:
+            resource = self.resource_paths[path]
+            if self.validator is not None:
+                (is_valid, message) = JsonHandler.validate_compiled(resource, self.validator, "api_definition")
+                if not is_valid:
+                    logging.warning("Path {}: {}".format(path, message))
+            view = self.views.setdefault(path, ApiOperations(resource))
+        return view
+
+    def __contains__(self, path):
+        return path in self.resource_paths
+
+    def __iter__(self):
+        return iter(self.resource_paths)
+
+    def __len__(self):
+        return len(self.resource_paths)
+
+    def __getstate__(self):
+        # The validator is not pickled (SpecCache): the ApiConnector attaches it again on load,
+        # the path items are validated on their first use after each (cold or warm) start
+        return {"resource_paths": self.resource_paths, "validator": None, "views": {}}
@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import threading
+import time
+
+import requests
+
+from ..exceptions.AuthenticationException import AuthenticationException
+
+
+class OAuth2TokenCache:
+    """
+    Access token of the OAuth2.0 client credentials flow, shared by all threads and asyncio tasks
+    The token is refreshed in the background before it expires, concurrent refreshes are coalesced
+    The background refresh stops when the token has not been used since the last refresh
+    """
+    # Minimal delay between two background refreshes (tokens expiring within the refresh margin)
+    MIN_REFRESH_DELAY = 0.1
+    __caches = {}
+    __caches_lock = threading.Lock()
+
+    def __init__(self, token_url, client_id, client_secret, scope=None, refresh_margin=60, retry_delay=5,
+                 background_refresh=True, fetcher=None):
+        """
+        OAuth2TokenCache constructor
+        :param token_url: url of the token endpoint
+        :param client_id: client id
+        :param client_secret: client secret
+        :param scope: requested scope (None for the default scope of the client)
+        :param refresh_margin: seconds before the expiration when the token is refreshed in the background
+        :param retry_delay: seconds between two background refreshes after a failure
+        :param background_refresh: set to False to refresh only when the token is expired or rejected
+        :param fetcher: function (token_url, data, auth) -> token response as json object (default: requests.post)
+        """
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scope = scope
+        self.refresh_margin = refresh_margin
+        self.retry_delay = retry_delay
+        self.background_refresh = background_refresh
+        self.fetcher = fetcher if fetcher is not None else OAuth2TokenCache.fetch_token
+        self.token = None
+        self.expires_at = 0
+        self.fetch_count = 0
+        # Set by each use of the token, cleared by each refresh
+        self.used = False
+        self.lock = threading.Lock()
+        self.timer = None
+
+    @staticmethod
+    def get_shared(token_url, client_id, client_secret, scope=None, **kwargs):
+        """
+        Get the token cache shared by all the connectors of the same client
+        :param token_url: url of the token endpoint
+        :param client_id: client id
+        :param client_secret: client secret
+        :param scope: requested scope
+        :param kwargs: other arguments of the OAuth2TokenCache constructor (used on creation only)
+        :return: OAuth2TokenCache object
+        """
+        key = (token_url, client_id, scope)
+        with OAuth2TokenCache.__caches_lock:
+            cache = OAuth2TokenCache.__caches.get(key)
+            if cache is None or cache.client_secret != client_secret:
+                if cache is not None:
+                    cache.close()
+                cache = OAuth2TokenCache(token_url, client_id, client_secret, scope=scope, **kwargs)
+                OAuth2TokenCache.__caches[key] = cache
+            return cache
+
+    @staticmethod
+    def fetch_token(token_url, data, auth):
+        """
+        Request a token from the token endpoint
+        :param token_url: url of the token endpoint
+        :param data: form parameters
+        :param auth: (client_id, client_secret)
+        :return: token response as json object
+        """
+        response = requests.post(token_url, data=data, auth=auth, timeout=30)
+        if response.status_code != 200:
+            raise AuthenticationException("Token request failed with status code {}.".format(response.status_code))
+        return response.json()
+
+    def get_token(self):
+        """
+        Get a valid access token, fetched only if there is no valid token
+        :return: access token
+        """
+        token = self.token
+        if token is not None and time.time() < self.expires_at:
+            self.used = True
+            return token
+        with self.lock:
+            # Another thread may have refreshed the token while waiting for the lock
+            if self.token is None or time.time() >= self.expires_at:
+                self.__refresh()
+            self.used = True
+            return self.token
+
+    async def aget_token(self):
+        """
+        Asynchronous version of OAuth2TokenCache.get_token (the token request runs in a thread)
+        :return: access token
+        """
+        token = self.token
+        if token is not None and time.time() < self.expires_at:
+            self.used = True
+            return token
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_token)
+
+    def invalidate(self, token):
+        """
+        Refresh the token after it has been rejected (401), only once for all the requests using the same token
+        :param token: rejected token
+        :return: new access token
+        """
+        with self.lock:
+            if self.token == token:
+                self.__refresh()
+            self.used = True
+            return self.token
+
+    def close(self):
+        """
+        Stop the background refresh (the token is still refreshed on demand, and the next refresh schedules
+        the background refresh again)
+        """
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+
+    def __refresh(self):
+        """
+        Fetch a new token (self.lock must be held)
+        """
+        data = {"grant_type": "client_credentials"}
+        if self.scope is not None:
+            data["scope"] = self.scope
+        token_response = self.fetcher(self.token_url, data, (self.client_id, self.client_secret))
+        if "access_token" not in token_response:
+            raise AuthenticationException("Token response without access_token.")
+        self.fetch_count += 1
+        self.used = False
+        self.token = token_response["access_token"]
+        expires_in = float(token_response.get("expires_in", 3600))
+        self.expires_at = time.time() + expires_in
+        # Tokens expiring within the refresh margin are refreshed at half of their lifetime
+        delay = expires_in - self.refresh_margin if expires_in > self.refresh_margin else expires_in / 2
+        self.__schedule(max(delay, OAuth2TokenCache.MIN_REFRESH_DELAY))
+
+    def __schedule(self, delay):
+        """
+        Schedule the next background refresh (self.lock must be held)
+        :param delay: seconds before the refresh
+        """
+        if not self.background_refresh:
+            return
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = threading.Timer(delay, self.__background_refresh)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def __background_refresh(self):
+        with self.lock:
+            if not self.used:
+                # Nobody used the token since the last refresh: the next use fetches a new token if needed
+                self.timer = None
+                return
+            try:
+                self.__refresh()
+            except (requests.exceptions.RequestException, AuthenticationException, ValueError) as e:
+                logging.warning("Background refresh of the OAuth2.0 token failed: {}".format(e))
+                if time.time() < self.expires_at:
+                    self.__schedule(self.retry_delay)
+
+
+class OAuth2ClientCredentialsAuth(requests.auth.AuthBase):
+    """
+    requests authentication adding the bearer token, a rejected token (401) is refreshed and the request sent again
+    """
+
+    def __init__(self, token_cache):
+        """
+        OAuth2ClientCredentialsAuth constructor
+        :param token_cache: OAuth2TokenCache object
+        """
+        self.token_cache = token_cache
+
+    def __call__(self, request):
+        request.headers["Authorization"] = "Bearer {}".format(self.token_cache.get_token())
+        request.register_hook("response", self.handle_401)
+        return request
+
+    def handle_401(self, response, **kwargs):
+        """
+        Send the request again with a refreshed token if the token has been rejected
+        :param response: requests.Response object
+        :param kwargs: arguments of the transport adapter
+        :return: requests.Response object
+        """
+        if response.status_code != 401:
+            return response
+        rejected = response.request.headers.get("Authorization", "")[len("Bearer "):]
+        token = self.token_cache.invalidate(rejected)
+        # Release the connection before sending again
+        response.content
+        response.close()
+        prepared = response.request.copy()
+        prepared.deregister_hook("response", self.handle_401)
+        prepared.headers["Authorization"] = "Bearer {}".format(token)
+        retry = response.connection.send(prepared, **kwargs)
+        retry.history.append(response)
+        retry.request = prepared
+        return retry
@@ -0,0 +1,193 @@
+import concurrent.futures
+from urllib.parse import urljoin
+
+from requests.utils import parse_header_links
+
+from .ApiRequest import ApiRequest
+from ..exceptions import RequestException
+
+
+class Paginator:
+    """
+    Iterate over the items of a paginated list endpoint, the next page is fetched in the background
+    while the items of the current page are processed (at most two pages are kept in memory)
+    Pagination styles:
+        "offset": {"style": "offset", "offset_param": "offset", "limit_param": "limit", "limit": 100, "items": None}
+        "cursor": {"style": "cursor", "cursor_param": "cursor", "next_cursor": "/next", "items": None}
+        "link": {"style": "link", "items": None} (url of the next page in the Link header, rel="next")
+    "items" is the json pointer of the items in the payload (None: the payload, or its "items", "data" or
+    "results" array)
+    """
+    STYLES = ["offset", "cursor", "link"]
+    DEFAULTS = {
+        "offset": {"offset_param": "offset", "limit_param": "limit", "limit": 100, "items": None},
+        "cursor": {"cursor_param": "cursor", "next_cursor": "/next", "items": None},
+        "link": {"items": None}
+    }
+    ITEMS_KEYS = ["items", "data", "results"]
+
+    def __init__(self, connector, endpoint, request_type="get", parameters=None, pagination=None, prefetch=True):
+        """
+        Paginator constructor
+        :param connector: ApiConnector object
+        :param endpoint: endpoint key (string) from paths (OpenApi Specs)
+        :param request_type: type of request
+        :param parameters: dict of parameters of the first page
+        :param pagination: pagination settings (None: x-pagination of the operation, or detected from the
+            parameters of the operation)
+        :param prefetch: set to False to fetch the next page only when the current one is consumed
+        """
+        self.connector = connector
+        self.endpoint = endpoint
+        self.request_type = request_type
+        self.parameters = dict(parameters) if parameters is not None else {}
+        self.pagination = self.get_pagination(pagination)
+        if self.pagination["style"] == "offset":
+            # The size of the pages must be known to detect the last page
+            self.parameters.setdefault(self.pagination["limit_param"], self.pagination["limit"])
+        self.prefetch = prefetch
+
+    def get_pagination(self, pagination):
+        """
+        Complete the pagination settings with the defaults of the style
+        :param pagination: pagination settings (None to detect them)
+        :return: pagination settings
+        """
+        if pagination is None:
+            pagination = self.__detect_pagination()
+        style = pagination.get("style")
+        if style not in Paginator.STYLES:
+            raise ValueError("Only {} are available.".format(Paginator.STYLES))
+        return dict(Paginator.DEFAULTS[style], **pagination)
+
+    def __detect_pagination(self):
+        """
+        Pagination of the vendor extension x-pagination of the operation, or detected from its parameters
+        :return: pagination settings
+        """
+        resolved = self.connector.resolve_endpoint(self.endpoint)
+        endpoint = resolved[0] if resolved is not None else self.endpoint
+        operation = self.connector.resources.get("paths", {}).get(endpoint, {}).get(self.request_type, {})
+        if "x-pagination" in operation:
+            return operation["x-pagination"]
+        names = [parameter.get("name") for parameter in operation.get("parameters", [])]
+        if "cursor" in names:
+            return {"style": "cursor"}
+        if "offset" in names and "limit" in names:
+            return {"style": "offset"}
+        return {"style": "link"}
+
+    def __iter__(self):
+        return self.items()
+
+    def items(self):
+        """
+        Generator of the items of all the pages
+        :return: generator of items
+        """
+        for page in self.pages():
+            for item in page:
+                yield item
+
+    def pages(self):
+        """
+        Generator of the items of each page
+        :return: generator of lists of items
+        """
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1) if self.prefetch else None
+        page = (dict(self.parameters), None)
+        future = None
+        try:
+            while page is not None:
+                (items, page) = future.result() if future is not None else self.fetch(*page)
+                future = None
+                if executor is not None and page is not None:
+                    future = executor.submit(self.fetch, *page)
+                yield items
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def fetch(self, parameters, url=None):
+        """
+        Fetch one page
+        :param parameters: dict of parameters of the page
+        :param url: url of the page (given by the Link header of the previous page)
+        :return: (items of the page, (parameters, url) of the next page or None)
+        """
+        request = ApiRequest.create_request(self.connector, self.endpoint, self.request_type)
+        if request is None:
+            raise RequestException.PaginationException("Endpoint {} is not defined.".format(self.endpoint))
+        built_url = request.build_url(parameters)
+        if url is None:
+            url = built_url
+        (response, error_flag) = request.send(url)
+        output = request.process_response(url, response, error_flag)
+        if error_flag or response.status_code >= 400:
+            raise RequestException.PaginationException(
+                "Page {} failed with status code {}.".format(url, response.status_code))
+        payload = output["response"]["Payload"]
+        items = self.get_items(payload)
+        return items, self.get_next_page(parameters, url, payload, items, getattr(response, "headers", {}))
+
+    def get_items(self, payload):
+        """
+        Extract the items of a page
+        :param payload: payload of the response
+        :return: list of items
+        """
+        if self.pagination["items"] is not None:
+            items = Paginator.resolve_pointer(payload, self.pagination["items"])
+        elif isinstance(payload, dict):
+            items = next((payload[key] for key in Paginator.ITEMS_KEYS if isinstance(payload.get(key), list)), None)
+        else:
+            items = payload
+        if not isinstance(items, list):
+            raise RequestException.PaginationException("No list of items found in the page.")
+        return items
+
+    def get_next_page(self, parameters, url, payload, items, headers):
+        """
+        Parameters or url of the next page
+        :param parameters: dict of parameters of the current page
+        :param url: url of the current page
+        :param payload: payload of the current page
+        :param items: items of the current page
+        :param headers: headers of the response
+        :return: (parameters, url) of the next page, None for the last page
+        """
+        style = self.pagination["style"]
+        if style == "offset":
+            limit = int(parameters.get(self.pagination["limit_param"], self.pagination["limit"]))
+            if len(items) < limit or len(items) == 0:
+                return None
+            offset = int(parameters.get(self.pagination["offset_param"], 0))
+            return dict(parameters, **{self.pagination["offset_param"]: offset + len(items),
+                                       self.pagination["limit_param"]: limit}), None
+        if style == "cursor":
+            cursor = Paginator.resolve_pointer(payload, self.pagination["next_cursor"])
+            if cursor in (None, ""):
+                return None
+            return dict(parameters, **{self.pagination["cursor_param"]: cursor}), None
+        for link in parse_header_links(headers.get("Link", "")):
+            if "next" in link.get("rel", "").split():
+                return parameters, urljoin(url, link["url"])
+        return None
+
+    @staticmethod
+    def resolve_pointer(document, pointer):
+        """
+        Resolve a json pointer (ex.: /data/items)
+        :param document: json object
+        :param pointer: json pointer
+        :return: value, None if not found
+        """
+        for token in pointer.lstrip("/").split("/") if pointer not in ("", "/") else []:
+            token = token.replace("~1", "/").replace("~0", "~")
+            if isinstance(document, dict):
+                document = document.get(token)
+            elif isinstance(document, list) and token.isdigit() and int(token) < len(document):
+                document = document[int(token)]
+            else:
+                return None
+        return document
@@ -0,0 +1,178 @@
+from urllib.parse import quote
+
+from ..exceptions import RequestException
+
+# Characters kept unencoded for parameters with allowReserved (RFC3986 reserved characters)
+RESERVED_CHARACTERS = ":/?#[]@!$&'()*+,;="
+DEFAULT_STYLES = {"query": "form", "cookie": "form", "path": "simple", "header": "simple"}
+
+
+class ParameterPlan:
+    """
+    Serialization plan of the parameters of one operation, built once from the OpenApi Specs
+    Each parameter gets its location, required flag and serializer (style/explode, see OpenApi Specs "Parameter")
+    """
+
+    def __init__(self, parameters_definition):
+        """
+        ParameterPlan constructor
+        :param parameters_definition: "parameters" bloc of the endpoint definition (list or None)
+        """
+        self.required = set()
+        self.optional = set()
+        # {location: [(parameter_name, serializer)]}
+        self.locations = {"path": [], "query": [], "header": [], "cookie": []}
+        self.path_serializers = {}
+        self.default_path_serializer = ParameterPlan.create_serializer("path", "simple", False, False)
+        for parameter in parameters_definition or []:
+            location = parameter.get("in")
+            if location not in self.locations:
+                continue
+            name = parameter["name"]
+            if parameter.get("required", False) or location == "path":
+                self.required.add(name)
+            else:
+                self.optional.add(name)
+            serializer = ParameterPlan.create_serializer(
+                location,
+                parameter.get("style", DEFAULT_STYLES[location]),
+                parameter.get("explode", parameter.get("style", DEFAULT_STYLES[location]) == "form"),
+                parameter.get("allowReserved", False)
+            )
+            self.locations[location].append((name, serializer))
+            if location == "path":
+                self.path_serializers[name] = serializer
+
+    def check_required(self, parameters):
+        """
+        Check the presence of the required parameters (path parameters are checked by the path builder)
+        :param parameters: dict of parameters (parameter_name, parameter_value)
+        :return: Raise RequestException.RequestAbortedException if a required parameter is missing
+        """
+        for (name, _) in self.locations["query"] + self.locations["header"] + self.locations["cookie"]:
+            if name in self.required and name not in parameters:
+                raise RequestException.RequestAbortedException("Required parameter '{}' is missing!".format(name))
+
+    def build_query(self, parameters):
+        """
+        Build the query string
+        :param parameters: dict of parameters (parameter_name, parameter_value)
+        :return: query string, None if empty
+        """
+        args = [serializer(name, parameters[name]) for (name, serializer) in self.locations["query"]
+                if name in parameters]
+        if len(args) == 0:
+            return None
+        return "&".join(args)
+
+    def build_headers(self, parameters):
+        """
+        Build the headers (header parameters and cookie parameters)
+        :param parameters: dict of parameters (parameter_name, parameter_value)
+        :return: dict of headers
+        """
+        headers = {}
+        for (name, serializer) in self.locations["header"]:
+            if name in parameters:
+                headers[name] = serializer(name, parameters[name])
+        cookies = [serializer(name, parameters[name]) for (name, serializer) in self.locations["cookie"]
+                   if name in parameters]
+        if len(cookies) > 0:
+            headers["Cookie"] = "; ".join(cookies)
+        return headers
+
+    def serialize_path_parameter(self, name, value):
+        """
+        Serialize one path parameter (style simple if the parameter is not defined)
+        :param name: parameter name
+        :param value: parameter value
+        :return: serialized value
+        """
+        return self.path_serializers.get(name, self.default_path_serializer)(name, value)
+
+    @staticmethod
+    def create_serializer(location, style, explode, allow_reserved):
+        """
+        Create the serializer of one parameter
+        :param location: "path", "query", "header" or "cookie"
+        :param style: OpenApi Specs style (form, simple, label, matrix, spaceDelimited, pipeDelimited, deepObject)
+        :param explode: OpenApi Specs explode flag
+        :param allow_reserved: if True, reserved characters are not encoded (query only)
+        :return: function (parameter_name, parameter_value) -> serialized string
+        """
+        safe = RESERVED_CHARACTERS if allow_reserved and location == "query" else ""
+        if location == "header":
+            def encode(value):
+                return ParameterPlan.to_string(value)
+        else:
+            def encode(value):
+                return quote(ParameterPlan.to_string(value), safe=safe)
+
+        def pairs(value):
+            return [(encode(key), encode(item)) for (key, item) in value.items()]
+
+        if style == "form":
+            def serialize(name, value):
+                if isinstance(value, (list, tuple)):
+                    if explode:
+                        return "&".join("{}={}".format(name, encode(item)) for item in value)
+                    return "{}={}".format(name, ",".join(encode(item) for item in value))
+                if isinstance(value, dict):
+                    if explode:
+                        return "&".join("{}={}".format(key, item) for (key, item) in pairs(value))
+                    return "{}={}".format(name, ",".join("{},{}".format(key, item) for (key, item) in pairs(value)))
+                return "{}={}".format(name, encode(value))
+        elif style in ("spaceDelimited", "pipeDelimited"):
+            delimiter = "%20" if style == "spaceDelimited" else "|"
+
+            def serialize(name, value):
+                if isinstance(value, (list, tuple)):
+                    return "{}={}".format(name, delimiter.join(encode(item) for item in value))
+                return "{}={}".format(name, encode(value))
+        elif style == "deepObject":
+            def serialize(name, value):
+                return "&".join("{}[{}]={}".format(name, key, item) for (key, item) in pairs(value))
+        elif style == "matrix":
+            def serialize(name, value):
+                return ParameterPlan.serialize_matrix(name, value, explode, encode)
+        else:
+            # simple, label
+            prefix = "." if style == "label" else ""
+            separator = "." if style == "label" and explode else ","
+
+            def serialize(name, value):
+                if isinstance(value, (list, tuple)):
+                    return prefix + separator.join(encode(item) for item in value)
+                if isinstance(value, dict):
+                    if explode:
+                        return prefix + separator.join("{}={}".format(key, item) for (key, item) in pairs(value))
+                    return prefix + ",".join("{},{}".format(key, item) for (key, item) in pairs(value))
+                return prefix + encode(value)
+        return serialize
+
+    @staticmethod
+    def serialize_matrix(name, value, explode, encode):
+        """
+        Serialize a path parameter with style matrix (ex.: ;id=3,4,5 or ;id=3;id=4;id=5)
+        """
+        if isinstance(value, (list, tuple)):
+            if explode:
+                return "".join(";{}={}".format(name, encode(item)) for item in value)
+            return ";{}={}".format(name, ",".join(encode(item) for item in value))
+        if isinstance(value, dict):
+            if explode:
+                return "".join(";{}={}".format(encode(key), encode(item)) for (key, item) in value.items())
+            return ";{}={}".format(name, ",".join(
+                "{},{}".format(encode(key), encode(item)) for (key, item) in value.items()))
+        return ";{}={}".format(name, encode(value))
+
+    @staticmethod
+    def to_string(value):
+        """
+        String representation of a primitive value (booleans as in json)
+        """
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if value is None:
+            return ""
+        return str(value)
@@ -0,0 +1,83 @@
+import re
+from urllib.parse import unquote
+
+PARAMETER_PATTERN = re.compile(r"{([^{}/]+)}")
+
+
+class PathRouter:
+    """
+    Segment trie resolving concrete paths (ex.: /users/42) to the path templates of the OpenApi Specs
+    (ex.: /users/{id})
+    Literal segments take precedence over templated segments
+    """
+
+    def __init__(self, templates=None):
+        """
+        PathRouter constructor
+        :param templates: iterable of path templates (keys of paths in the OpenApi Specs)
+        """
+        self.root = PathRouter.__create_node()
+        for template in templates or []:
+            self.add(template)
+
+    @staticmethod
+    def __create_node():
+        # literals: {segment: node}, parameters: {segment pattern: (compiled segment pattern, node)}
+        # Templates sharing a segment pattern may name its parameters differently (ex.: {id} and {user_id}):
+        # the names are kept on the terminal node of each template
+        return {"literals": {}, "parameters": {}, "template": None, "names": []}
+
+    def add(self, template):
+        """
+        Add a path template to the trie
+        :param template: path template (ex.: /users/{id})
+        """
+        node = self.root
+        for segment in template.strip("/").split("/"):
+            if PARAMETER_PATTERN.search(segment) is None:
+                if segment not in node["literals"]:
+                    node["literals"][segment] = PathRouter.__create_node()
+                node = node["literals"][segment]
+            else:
+                pattern = PathRouter.compile_segment(segment)
+                if pattern.pattern not in node["parameters"]:
+                    node["parameters"][pattern.pattern] = (pattern, PathRouter.__create_node())
+                node = node["parameters"][pattern.pattern][1]
+        node["template"] = template
+        node["names"] = PARAMETER_PATTERN.findall(template)
+
+    @staticmethod
+    def compile_segment(segment):
+        """
+        Compile one templated segment (ex.: {name}.json) into a regular expression
+        :param segment: segment of the path template
+        :return: compiled regular expression
+        """
+        parts = PARAMETER_PATTERN.split(segment)
+        # split() alternates literal parts and parameter names
+        pattern = "".join(re.escape(part) if index % 2 == 0 else "([^/]+?)" for (index, part) in enumerate(parts))
+        return re.compile("^{}$".format(pattern))
+
+    def resolve(self, path):
+        """
+        Find the template matching the concrete path
+        :param path: concrete path (ex.: /users/42), without query string
+        :return: (template, {parameter_name: parameter_value}), None if no template matches
+        """
+        segments = path.strip("/").split("/")
+        # Depth-first search, literal children first; the values are collected by position
+        stack = [(self.root, 0, ())]
+        while len(stack) > 0:
+            (node, depth, values) = stack.pop()
+            if depth == len(segments):
+                if node["template"] is not None:
+                    return node["template"], {name: unquote(value) for (name, value) in zip(node["names"], values)}
+                continue
+            segment = segments[depth]
+            for (pattern, child) in reversed(list(node["parameters"].values())):
+                match = pattern.match(segment)
+                if match is not None:
+                    stack.append((child, depth + 1, values + match.groups()))
+            if segment in node["literals"]:
+                stack.append((node["literals"][segment], depth + 1, values))
+        return None
@@ -0,0 +1,193 @@
+import email.utils
+import threading
+import time
+from collections import OrderedDict
+
+# Status codes cacheable by default (https://tools.ietf.org/html/rfc7231#section-6.1)
+CACHEABLE_STATUS_CODES = {200, 203, 204, 300, 301, 404, 410}
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of std responses of GET requests, following the HTTP caching headers
+    (Cache-Control, Expires, Age, ETag, Last-Modified), bounded by number of entries and bytes
+    The cached std responses are shared between the callers and must not be modified
+    Only the synchronous calls (ApiGetRequest.call) use the cache,
+    the entries are keyed by the identity of the caller
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        """
+        ResponseCache constructor
+        :param max_entries: maximum number of cached responses
+        :param max_bytes: maximum size of the cached response bodies
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.lock = threading.Lock()
+
+    def lookup(self, key):
+        """
+        Get the cached entry (fresh or stale)
+        :param key: cache key
+        :return: entry {"output", "expires", "etag", "last_modified", "size"}, None if missing
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            if entry["expires"] > time.time():
+                self.hits += 1
+            return entry
+
+    @staticmethod
+    def is_fresh(entry):
+        """
+        Check if the entry can be used without revalidation
+        :param entry: entry returned by ResponseCache.lookup
+        :return: True if fresh
+        """
+        return entry["expires"] > time.time()
+
+    @staticmethod
+    def get_conditional_headers(entry):
+        """
+        Headers to revalidate a stale entry
+        :param entry: entry returned by ResponseCache.lookup
+        :return: dict of headers (If-None-Match, If-Modified-Since)
+        """
+        headers = {}
+        if entry["etag"] is not None:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"] is not None:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key, output, status_code, headers, size):
+        """
+        Store the std response if the response is cacheable
+        :param key: cache key
+        :param output: std response
+        :param status_code: HTTP status code of the response
+        :param headers: HTTP headers of the response
+        :param size: size of the response body in bytes
+        :return: True if stored
+        """
+        headers = ResponseCache.normalize_headers(headers)
+        expires = ResponseCache.get_expiration(headers)
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if status_code not in CACHEABLE_STATUS_CODES or expires is None or size > self.max_bytes:
+            return False
+        if expires <= time.time() and etag is None and last_modified is None:
+            # Neither fresh nor revalidable
+            return False
+        with self.lock:
+            self.__remove(key)
+            self.entries[key] = {"output": output, "expires": expires, "etag": etag,
+                                 "last_modified": last_modified, "size": size}
+            self.size += size
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                self.__remove(next(iter(self.entries)))
+        return True
+
+    def refresh(self, key, headers):
+        """
+        Update the expiration of an entry revalidated by a 304 response
+        :param key: cache key
+        :param headers: HTTP headers of the 304 response
+        :return: entry, None if missing or not cacheable anymore
+        """
+        headers = ResponseCache.normalize_headers(headers)
+        expires = ResponseCache.get_expiration(headers)
+        with self.lock:
+            self.revalidations += 1
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if expires is None:
+                self.__remove(key)
+            else:
+                entry["expires"] = expires
+                entry["etag"] = headers.get("etag", entry["etag"])
+                entry["last_modified"] = headers.get("last-modified", entry["last_modified"])
+            return entry
+
+    def stats(self):
+        """
+        Usage counters of the cache
+        :return: {"hits", "misses", "revalidations", "entries", "bytes"}
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "revalidations": self.revalidations,
+                    "entries": len(self.entries), "bytes": self.size}
+
+    def clear(self):
+        """
+        Remove all entries
+        """
+        with self.lock:
+            self.entries = OrderedDict()
+            self.size = 0
+
+    def __remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry["size"]
+
+    @staticmethod
+    def normalize_headers(headers):
+        return {key.lower(): value for (key, value) in (headers or {}).items()}
+
+    @staticmethod
+    def get_expiration(headers, now=None):
+        """
+        Compute the expiration time of a response
+        :param headers: normalized HTTP headers (lower case keys)
+        :param now: current time (default: time.time())
+        :return: timestamp, None if the response must not be stored
+        """
+        if now is None:
+            now = time.time()
+        directives = {}
+        for directive in headers.get("cache-control", "").split(","):
+            (name, _, value) = directive.strip().partition("=")
+            if name != "":
+                directives[name.lower()] = value.strip('"')
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return now
+        age = ResponseCache.__to_int(headers.get("age"), 0)
+        for name in ("s-maxage", "max-age"):
+            if name in directives:
+                return now + ResponseCache.__to_int(directives[name], 0) - age
+        if "expires" in headers:
+            try:
+                expires = email.utils.parsedate_to_datetime(headers["expires"]).timestamp()
+            except (TypeError, ValueError):
+                # Invalid date means already expired
+                return now
+            date = now
+            if "date" in headers:
+                try:
+                    date = email.utils.parsedate_to_datetime(headers["date"]).timestamp()
+                except (TypeError, ValueError):
+                    pass
+            return now + expires - date - age
+        # No explicit freshness: revalidate each time
+        return now
+
+    @staticmethod
+    def __to_int(value, default):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
@@ -0,0 +1,124 @@
+import email.utils
+import logging
+import random
+import threading
+import time
+
+
+class RetryPolicy:
+    """
+    Policy deciding if a failed call is sent again, with exponential backoff and full jitter
+    Only the idempotent methods are retried by default
+    The budget limits the time spent in one call, the retry ratio limits the retries of all the calls sharing
+    the policy (ex.: all the calls of an ApiConnector), so that retries do not multiply the load of a failing server
+    """
+    IDEMPOTENT_METHODS = ("get", "put", "delete", "head", "options")
+    RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+    def __init__(self, max_retries=3, backoff_factor=0.1, max_backoff=10.0, budget=30.0, jitter=True,
+                 methods=IDEMPOTENT_METHODS, status_codes=RETRY_STATUS_CODES, respect_retry_after=True,
+                 retry_ratio=None, retry_burst=10):
+        """
+        RetryPolicy constructor
+        :param max_retries: maximal number of retries of one call
+        :param backoff_factor: delay before the first retry (doubled for each retry)
+        :param max_backoff: maximal delay computed by the backoff
+        :param budget: maximal time in seconds spent in one call (retries and delays), None for no limit
+        :param jitter: if True, the delay is drawn uniformly between 0 and the backoff (full jitter)
+        :param methods: HTTP methods to retry
+        :param status_codes: status codes of the responses to retry (connection errors are always retried)
+        :param respect_retry_after: if True, the Retry-After header of the response replaces the backoff
+        :param retry_ratio: maximal number of retries per call, over all the calls sharing the policy
+            (ex.: 0.2 for at most one retry every 5 calls, None for no limit)
+        :param retry_burst: number of retries allowed at once (balance of the shared retry budget at the start)
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.jitter = jitter
+        self.methods = [method.lower() for method in methods]
+        self.status_codes = status_codes
+        self.respect_retry_after = respect_retry_after
+        self.retry_ratio = retry_ratio
+        self.retry_burst = float(retry_burst)
+        # Shared retry budget: each call deposits retry_ratio, each retry withdraws 1
+        self.retry_tokens = self.retry_burst
+        self.lock = threading.Lock()
+
+    def get_deadline(self):
+        """
+        End of the budget of a call starting now
+        :return: time.monotonic() value, None for no limit
+        """
+        return None if self.budget is None else time.monotonic() + self.budget
+
+    def record_call(self):
+        """
+        Record a new call in the shared retry budget
+        """
+        if self.retry_ratio is None:
+            return
+        with self.lock:
+            self.retry_tokens = min(self.retry_burst, self.retry_tokens + self.retry_ratio)
+
+    def withdraw_retry(self):
+        """
+        Take a retry from the shared retry budget
+        :return: False if the budget is exhausted
+        """
+        if self.retry_ratio is None:
+            return True
+        with self.lock:
+            if self.retry_tokens < 1:
+                return False
+            self.retry_tokens -= 1
+            return True
+
+    def get_delay(self, method, attempt, response=None, deadline=None):
+        """
+        Delay before the next retry of a failed attempt
+        :param method: HTTP method of the call
+        :param attempt: number of the failed attempt (0 for the first one)
+        :param response: response of the attempt (None for a connection error)
+        :param deadline: end of the budget of the call (RetryPolicy.get_deadline)
+        :return: delay in seconds, None if the call must not be retried
+        """
+        if method.lower() not in self.methods or attempt >= self.max_retries:
+            return None
+        if response is not None and response.status_code not in self.status_codes:
+            return None
+        delay = None
+        if response is not None and self.respect_retry_after:
+            delay = RetryPolicy.parse_retry_after(getattr(response, "headers", {}).get("Retry-After"))
+        if delay is None:
+            delay = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+            if self.jitter:
+                delay = random.uniform(0, delay)
+        if deadline is not None and time.monotonic() + delay > deadline:
+            return None
+        if not self.withdraw_retry():
+            logging.debug("Retry budget exhausted, no retry")
+            return None
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Parse the Retry-After header (delay in seconds or HTTP-date)
+        :param value: value of the header
+        :return: delay in seconds, None if missing or invalid
+        """
+        if value is None:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date is None:
+            return None
+        return max(date.timestamp() - time.time(), 0.0)
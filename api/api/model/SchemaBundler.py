@@ -0,0 +1,131 @@
+import threading
+
+from .OpenApi2JsonConverter import Openapi2JsonConverter
+
+
+class SchemaBundler:
+    """
+    Build minimal json schemas from the component schemas of the OpenApi Specs
+    The components are converted to json schema once; the references to non-recursive components are replaced
+    by the (shared) converted component, only the recursive components reachable from the schema are attached
+    """
+    PREFIX = "#/components/schemas/"
+
+    def __init__(self, components=None):
+        """
+        SchemaBundler constructor
+        :param components: components of the OpenApi Specs
+        """
+        self.component_schemas = (components or {}).get("schemas", {})
+        # {name: (converted component with the safe references resolved, names of the kept references)}
+        self.resolved = {}
+        # {name: True if the component references itself (directly or not)}
+        self.recursive = {}
+        self.lock = threading.RLock()
+
+    def bundle(self, schema):
+        """
+        Resolve the references of a (converted) schema and attach the components it still needs
+        :param schema: json schema (the schema is not modified)
+        :return: json schema with the reachable components only
+        """
+        with self.lock:
+            needed = set()
+            bundle = self.__resolve(schema, needed)
+            bundle = dict(bundle) if isinstance(bundle, dict) else {}
+            if isinstance(schema, dict) and "$schema" in schema:
+                # Kept when the root schema is a resolved reference
+                bundle["$schema"] = schema["$schema"]
+            components = {}
+            while len(needed) > 0:
+                name = needed.pop()
+                if name in components or name not in self.component_schemas:
+                    continue
+                (components[name], references) = self.get_resolved_component(name)
+                needed.update(references - components.keys())
+        bundle["components"] = {"schemas": components}
+        return bundle
+
+    def get_resolved_component(self, name):
+        """
+        Converted component with its safe references resolved
+        :param name: name of the component
+        :return: (json schema, names of the references kept in the schema)
+        """
+        with self.lock:
+            if name not in self.resolved:
+                references = set()
+                schema = Openapi2JsonConverter.convert_open_api_specs_to_json_schema(self.component_schemas[name])
+                schema.pop("$schema", None)
+                self.resolved[name] = (self.__resolve(schema, references), references)
+            return self.resolved[name]
+
+    def is_recursive(self, name):
+        """
+        Check if a component references itself, its references are kept (a recursive schema can not be inlined)
+        :param name: name of the component
+        :return: True if recursive
+        """
+        with self.lock:
+            if name not in self.recursive:
+                stack = list(SchemaBundler.get_references(self.component_schemas.get(name)))
+                visited = set()
+                while len(stack) > 0 and name not in visited:
+                    current = stack.pop()
+                    if current not in visited:
+                        visited.add(current)
+                        stack.extend(SchemaBundler.get_references(self.component_schemas.get(current)))
+                self.recursive[name] = name in visited
+            return self.recursive[name]
+
+    @staticmethod
+    def get_references(schema):
+        """
+        Names of the components referenced by a schema (not transitively)
+        :param schema: schema of the OpenApi Specs
+        :return: set of names
+        """
+        references = set()
+        stack = [schema]
+        while len(stack) > 0:
+            node = stack.pop()
+            if isinstance(node, dict):
+                ref = node.get("$ref")
+                if isinstance(ref, str) and ref.startswith(SchemaBundler.PREFIX):
+                    references.add(SchemaBundler.get_name(ref))
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
+        return references
+
+    @staticmethod
+    def get_name(ref):
+        """
+        Name of the component of a reference
+        :param ref: reference (ex.: #/components/schemas/getItem/properties/Name)
+        :return: name (ex.: getItem)
+        """
+        return ref[len(SchemaBundler.PREFIX):].split("/")[0].replace("~1", "/").replace("~0", "~")
+
+    def __resolve(self, node, references):
+        """
+        Copy a schema, replacing the references to whole non-recursive components by the resolved components
+        :param node: part of a schema
+        :param references: names of the references kept in the copy (modified)
+        :return: copy of the schema
+        """
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and ref.startswith(SchemaBundler.PREFIX):
+                name = SchemaBundler.get_name(ref)
+                is_whole_component = "/" not in ref[len(SchemaBundler.PREFIX):]
+                if is_whole_component and name in self.component_schemas and not self.is_recursive(name):
+                    (schema, component_references) = self.get_resolved_component(name)
+                    references.update(component_references)
+                    return schema
+                references.add(name)
+                return node
+            return {key: self.__resolve(value, references) for (key, value) in node.items()}
+        if isinstance(node, list):
+            return [self.__resolve(value, references) for value in node]
+        return node
@@ -0,0 +1,167 @@
+import logging
+import threading
+import time
+
+
+class ServerPool:
+    """
+    Pool of the servers of the OpenApi Specs, selecting the server of each call
+    Servers failing failure_threshold consecutive calls, or their health check, are ejected
+    and admitted again after ejection_time seconds, or as soon as their health check succeeds
+    """
+    ROUND_ROBIN = "round_robin"
+    LEAST_OUTSTANDING = "least_outstanding"
+    EWMA = "ewma"
+    MODES = [ROUND_ROBIN, LEAST_OUTSTANDING, EWMA]
+
+    def __init__(self, servers, mode=ROUND_ROBIN, decay=0.3, failure_threshold=3, ejection_time=30.0,
+                 health_check=None, health_interval=10.0):
+        """
+        ServerPool constructor
+        :param servers: list of servers ({"url": ..., "description": ...}) of the OpenApi Specs
+        :param mode: one of ServerPool.MODES
+            "round_robin": servers in turn, "least_outstanding": server with the fewest calls in progress,
+            "ewma": server with the lowest latency (exponentially weighted moving average) per call in progress
+        :param decay: weight of the last latency in the moving average (mode "ewma")
+        :param failure_threshold: number of consecutive failed calls ejecting a server
+        :param ejection_time: seconds before an ejected server is admitted again
+        :param health_check: function (server) -> True if healthy, called in the background (None to deactivate)
+        :param health_interval: seconds between two health checks of the servers
+        """
+        if mode not in ServerPool.MODES:
+            raise ValueError("Only {} are available.".format(ServerPool.MODES))
+        if len(servers) == 0:
+            raise ValueError("The server pool needs at least one server.")
+        self.servers = list(servers)
+        self.mode = mode
+        self.decay = decay
+        self.failure_threshold = failure_threshold
+        self.ejection_time = ejection_time
+        self.health_check = health_check
+        self.health_interval = health_interval
+        # {server url: {"outstanding", "ewma", "failures", "ejected_until", "healthy"}}
+        self.states = {server["url"]: {"outstanding": 0, "ewma": None, "failures": 0, "ejected_until": 0.0,
+                                       "healthy": True} for server in self.servers}
+        self.counter = 0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.health_thread = None
+        if health_check is not None:
+            self.health_thread = threading.Thread(target=self.__run_health_checks, daemon=True)
+            self.health_thread.start()
+
+    def is_available(self, server):
+        """
+        Check if a server can receive calls
+        :param server: server of the pool
+        :return: False if the server is ejected
+        """
+        state = self.states[server["url"]]
+        return state["healthy"] and time.monotonic() >= state["ejected_until"]
+
+    def select(self, exclude=()):
+        """
+        Select the server of the next call (all the servers are candidates if none is available)
+        :param exclude: urls of the servers to avoid (ex.: servers which failed for this call)
+        :return: server
+        """
+        with self.lock:
+            candidates = [server for server in self.servers
+                          if server["url"] not in exclude and self.is_available(server)]
+            if len(candidates) == 0:
+                candidates = [server for server in self.servers if server["url"] not in exclude] or self.servers
+                logging.debug("No available server, selection among {} servers".format(len(candidates)))
+            start = self.counter % len(candidates)
+            self.counter += 1
+            # Rotate the candidates: round robin, and ties of the other modes are spread over the servers
+            candidates = candidates[start:] + candidates[:start]
+            if self.mode == ServerPool.ROUND_ROBIN:
+                return candidates[0]
+            if self.mode == ServerPool.LEAST_OUTSTANDING:
+                return min(candidates, key=lambda server: self.states[server["url"]]["outstanding"])
+            return min(candidates, key=self.__get_ewma_score)
+
+    def acquire(self, server):
+        """
+        Record the start of a call to the server
+        :param server: selected server
+        """
+        with self.lock:
+            self.states[server["url"]]["outstanding"] += 1
+
+    def release(self, server, latency, success):
+        """
+        Record the end of a call to the server
+        :param server: selected server
+        :param latency: duration of the call in seconds
+        :param success: False for a connection error or a server error
+        """
+        with self.lock:
+            state = self.states[server["url"]]
+            state["outstanding"] -= 1
+            if state["ewma"] is None:
+                state["ewma"] = latency
+            else:
+                state["ewma"] = self.decay * latency + (1 - self.decay) * state["ewma"]
+            if success:
+                state["failures"] = 0
+            else:
+                state["failures"] += 1
+                if state["failures"] >= self.failure_threshold:
+                    logging.warning("Server {} ejected for {}s".format(server["url"], self.ejection_time))
+                    state["failures"] = 0
+                    state["ejected_until"] = time.monotonic() + self.ejection_time
+
+    def stats(self):
+        """
+        State of the servers
+        :return: {server url: {"available", "outstanding", "ewma"}}
+        """
+        with self.lock:
+            return {server["url"]: {"available": self.is_available(server),
+                                    "outstanding": self.states[server["url"]]["outstanding"],
+                                    "ewma": self.states[server["url"]]["ewma"]} for server in self.servers}
+
+    def close(self):
+        """
+        Stop the health checks
+        """
+        self.stopped.set()
+        if self.health_thread is not None:
+            self.health_thread.join()
+            self.health_thread = None
+
+    def check_health(self):
+        """
+        Run the health check of each server once
+        """
+        for server in self.servers:
+            try:
+                healthy = bool(self.health_check(server))
+            except Exception as e:
+                logging.debug("Health check of {} failed: {}".format(server["url"], e))
+                healthy = False
+            with self.lock:
+                state = self.states[server["url"]]
+                if healthy and not state["healthy"]:
+                    logging.info("Server {} admitted again".format(server["url"]))
+                if healthy:
+                    state["failures"] = 0
+                    state["ejected_until"] = 0.0
+                state["healthy"] = healthy
+
+    def __get_ewma_score(self, server):
+        """
+        Expected latency of a new call (servers without measure are tried first)
+        :param server: server of the pool
+        :return: score
+        """
+        state = self.states[server["url"]]
+        if state["ewma"] is None:
+            return 0.0
+        return state["ewma"] * (state["outstanding"] + 1)
+
+    def __run_health_checks(self):
+        while not self.stopped.is_set():
+            self.check_health()
+            self.stopped.wait(self.health_interval)
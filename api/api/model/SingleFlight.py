@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+# Result shared with the followers when the leader task is cancelled: one of them runs the call instead
+LEADER_CANCELLED = object()
+
+
+class SingleFlight:
+    """
+    Coalesce identical calls in flight: the first caller (leader) runs the call,
+    the concurrent callers with the same key wait for its result (or its exception) instead of calling again
+    Threads and asyncio tasks are coalesced separately (a task never blocks its event loop)
+    """
+
+    def __init__(self):
+        """
+        SingleFlight constructor
+        """
+        # {key: [threading.Event, result, exception]}
+        self.calls = {}
+        # {(event loop, key): asyncio.Future}
+        self.async_calls = {}
+        self.lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def do(self, key, function):
+        """
+        Run the function, or wait for the result of the call in flight with the same key
+        :param key: hashable key of the call
+        :param function: function without argument
+        :return: result of the function (shared by all the coalesced callers)
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            if call is None:
+                call = self.calls[key] = [threading.Event(), None, None]
+                self.leaders += 1
+                is_leader = True
+            else:
+                self.followers += 1
+                is_leader = False
+        if is_leader:
+            try:
+                call[1] = function()
+            except BaseException as e:
+                # Also KeyboardInterrupt or SystemExit: the followers must not get a result of None
+                call[2] = e
+            finally:
+                with self.lock:
+                    del self.calls[key]
+                call[0].set()
+        else:
+            call[0].wait()
+        if call[2] is not None:
+            raise call[2]
+        return call[1]
+
+    async def ado(self, key, coroutine_function):
+        """
+        Asynchronous version of SingleFlight.do
+        :param key: hashable key of the call
+        :param coroutine_function: coroutine function without argument
+        :return: result of the coroutine (shared by all the coalesced tasks)
+        """
+        async_key = (asyncio.get_running_loop(), key)
+        while True:
+            with self.lock:
+                future = self.async_calls.get(async_key)
+                if future is None:
+                    future = self.async_calls[async_key] = asyncio.get_running_loop().create_future()
+                    self.leaders += 1
+                    break
+                self.followers += 1
+            # Shielded: a cancelled follower must not cancel the call of the leader
+            result = await asyncio.shield(future)
+            if result is not LEADER_CANCELLED:
+                return result
+        try:
+            result = await coroutine_function()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # The followers are not cancelled: the first one becomes the leader
+            future.set_result(LEADER_CANCELLED)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved, the followers (if any) raise it too
+            future.exception()
+            raise
+        finally:
+            with self.lock:
+                del self.async_calls[async_key]
+
+    def stats(self):
+        """
+        Counters of the coalesced calls
+        :return: {"leaders": calls run, "followers": calls coalesced}
+        """
+        with self.lock:
+            return {"leaders": self.leaders, "followers": self.followers}
@@ -0,0 +1,88 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+from .. import __version__
+
+
+class SpecCache:
+    """
+    On-disk cache of validated and preprocessed OpenApi Specs
+    Entries are keyed by the content hash of the spec file and the version of the library,
+    the cache directory must only be writable by trusted users (entries are pickled)
+    """
+
+    def __init__(self, cache_dir):
+        """
+        SpecCache constructor
+        :param cache_dir: directory of the cache entries (created if missing)
+        """
+        self.cache_dir = cache_dir
+
+    def get_key(self, configuration_file, is_openapi):
+        """
+        Compute the cache key of a spec file
+        :param configuration_file: OpenApiSpecs file
+        :param is_openapi: True if the spec is validated against the OpenApi Specs standard
+        :return: key (string), None if the file can not be read
+        """
+        try:
+            with open(configuration_file, 'rb') as spec_file:
+                digest = hashlib.sha256(spec_file.read())
+        except OSError:
+            return None
+        digest.update("{}:{}".format(__version__, is_openapi).encode())
+        return digest.hexdigest()
+
+    def load(self, key):
+        """
+        Read the cached state
+        :param key: key computed by SpecCache.get_key
+        :return: cached state, None if missing or unreadable
+        """
+        if key is None:
+            return None
+        try:
+            with open(self.__get_filename(key), 'rb') as cache_file:
+                return pickle.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError, TypeError,
+                IndexError) as e:
+            # Truncated or corrupted entry: cache miss
+            logging.warning("Spec cache entry {} ignored: {}".format(key, e))
+            return None
+
+    def store(self, key, state):
+        """
+        Write the state atomically in the cache
+        :param key: key computed by SpecCache.get_key
+        :param state: picklable object
+        :return: True if the state has been written
+        """
+        if key is None:
+            return False
+        temp_filename = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            (file_descriptor, temp_filename) = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(file_descriptor, 'wb') as cache_file:
+                pickle.dump(state, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_filename, self.__get_filename(key))
+            temp_filename = None
+            return True
+        except (OSError, pickle.PicklingError, TypeError, AttributeError, ValueError, RecursionError) as e:
+            # The cache is optional: a state which can not be written is not cached
+            logging.warning("Spec cache entry {} not written: {}".format(key, e))
+            return False
+        finally:
+            if temp_filename is not None:
+                try:
+                    os.remove(temp_filename)
+                except OSError:
+                    pass
+
+    def __get_filename(self, key):
+        return os.path.join(self.cache_dir, "{}.pickle".format(key))
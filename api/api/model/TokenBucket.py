@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket limiting the rate of the calls, the callers wait for their token instead of failing
+    Tokens are reserved in arrival order: concurrent callers are spaced by 1/rate seconds
+    """
+
+    def __init__(self, rate, burst=1):
+        """
+        TokenBucket constructor
+        :param rate: number of calls per second
+        :param burst: number of calls allowed at once after an idle period
+            (default 1: the calls are evenly spaced, keeping the rate under the limit in any window)
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("The rate must be positive and the burst at least 1.")
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take a token, possibly in advance
+        :return: seconds to wait before the call
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate) - 1
+            self.updated = now
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """
+        Wait for a token (blocking)
+        :return: waited seconds
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self):
+        """
+        Wait for a token (asynchronous)
+        :return: waited seconds
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
@@ -0,0 +1,79 @@
+import random
+import threading
+
+
+class ValidationPolicy:
+    """
+    Policy deciding which responses are validated against the schema of the OpenApi Specs
+    """
+    OFF = "off"
+    SAMPLED = "sampled"
+    FIRST_N = "first_n"
+    FULL = "full"
+    MODES = [OFF, SAMPLED, FIRST_N, FULL]
+
+    def __init__(self, mode=FULL, rate=1.0, first_n=0):
+        """
+        ValidationPolicy constructor
+        :param mode: one of ValidationPolicy.MODES
+            "off": no validation, "sampled": validate a random fraction (rate) of the responses,
+            "first_n": validate the first_n responses of each operation, "full": validate all the responses
+        :param rate: fraction of the responses to validate (mode "sampled")
+        :param first_n: number of responses to validate per operation (mode "first_n")
+        """
+        if mode not in ValidationPolicy.MODES:
+            raise ValueError("Only {} are available.".format(ValidationPolicy.MODES))
+        self.mode = mode
+        self.rate = rate
+        self.first_n = first_n
+        # {operation key: [validated, failures, skipped]}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def should_validate(self, key):
+        """
+        Decide if the next response of the operation must be validated
+        :param key: operation key (endpoint, request_type)
+        :return: True to validate
+        """
+        if self.mode == ValidationPolicy.FULL or self.mode == ValidationPolicy.OFF:
+            # Hot path without lock: the decision is constant, the counters may miss concurrent updates
+            decision = self.mode == ValidationPolicy.FULL
+            counters = self.counters.get(key)
+            if counters is None:
+                counters = self.counters.setdefault(key, [0, 0, 0])
+            counters[0 if decision else 2] += 1
+            return decision
+        with self.lock:
+            if self.mode == ValidationPolicy.SAMPLED:
+                decision = random.random() < self.rate
+            else:
+                decision = self.__get_counters(key)[0] < self.first_n
+            # first_n: the slot is reserved now, concurrent responses must not exceed first_n
+            self.__get_counters(key)[0 if decision else 2] += 1
+        return decision
+
+    def record(self, key, is_valid):
+        """
+        Count the result of a validation
+        :param key: operation key (endpoint, request_type)
+        :param is_valid: result of the validation
+        """
+        if not is_valid:
+            with self.lock:
+                self.__get_counters(key)[1] += 1
+
+    def stats(self):
+        """
+        Validation counters per operation
+        :return: {operation key: {"validated": <int>, "failures": <int>, "skipped": <int>}}
+        """
+        with self.lock:
+            return {key: {"validated": counters[0], "failures": counters[1], "skipped": counters[2]}
+                    for (key, counters) in list(self.counters.items())}
+
+    def __get_counters(self, key):
+        counters = self.counters.get(key)
+        if counters is None:
+            counters = self.counters[key] = [0, 0, 0]
+        return counters
@@ -0,0 +1,85 @@
+import threading
+
+import jsonschema
+
+from .JsonHandler import JsonHandler
+
+
+class InvalidSchema:
+    """
+    Negative entry of the registry: the schema of the key is invalid and is not compiled again
+    """
+
+    def __init__(self, error):
+        """
+        InvalidSchema constructor
+        :param error: jsonschema.exceptions.SchemaError raised by the compilation
+        """
+        self.error = error
+
+    def raise_error(self):
+        """
+        Report the schema error as the first compilation did
+        :return: Raise jsonschema.exceptions.SchemaError
+        """
+        # The traceback is reset, it would otherwise grow with each raise of the same exception
+        raise self.error.with_traceback(None)
+
+
+class ValidatorRegistry:
+    """
+    Cache of compiled validators, one registry per ApiConnector
+    Keys are tuples (path, method, status_code, media_type)
+    Invalid schemas are cached too (InvalidSchema): their SchemaError is raised again without compiling
+    """
+
+    def __init__(self):
+        """
+        ValidatorRegistry constructor
+        """
+        self.validators = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_validator(self, key, schema_factory):
+        """
+        Return the compiled validator for the key, compile it on the first call
+        :param key: (path, method, status_code, media_type)
+        :param schema_factory: function without argument returning the json schema to compile
+        :return: jsonschema validator object (jsonschema.exceptions.SchemaError raised if the schema is invalid)
+        """
+        with self.lock:
+            validator = self.validators.get(key)
+            if validator is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if validator is None:
+            # Compile outside of the lock: a concurrent miss compiles twice but keeps the first result
+            try:
+                validator = JsonHandler.compile_validator(schema_factory())
+            except jsonschema.exceptions.SchemaError as e:
+                validator = InvalidSchema(e)
+            with self.lock:
+                validator = self.validators.setdefault(key, validator)
+        if isinstance(validator, InvalidSchema):
+            validator.raise_error()
+        return validator
+
+    def stats(self):
+        """
+        Usage counters of the registry
+        :return: {"hits": <int>, "misses": <int>, "size": <int>}
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.validators)}
+
+    def clear(self):
+        """
+        Remove all compiled validators and reset the counters
+        """
+        with self.lock:
+            self.validators = {}
+            self.hits = 0
+            self.misses = 0
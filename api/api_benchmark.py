@@ -0,0 +1,192 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from api import __version__
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiRequest import ApiRequest
+from api.model.ApiResponse import ApiResponse
+
+# Number of items returned by the local server for each payload size
+PAYLOAD_SIZES = {"small": 10, "medium": 1000, "huge": 100000}
+DEFAULT_ITERATIONS = {"small": 200, "medium": 50, "huge": 5}
+PHASES = ["connector", "create_request", "build_url", "round_trip", "api_response", "validation"]
+
+
+def create_payload(count):
+    return [{"id": index, "name": "Company {}".format(index), "tags": ["a", "b"], "active": index % 2 == 0}
+            for index in range(count)]
+
+
+def create_spec(url):
+    """
+    OpenApi Specs of the local server
+    :param url: base url of the local server
+    :return: OpenApi Specs (json object)
+    """
+    paths = {}
+    for size in PAYLOAD_SIZES:
+        paths["/{}".format(size)] = {"get": {
+            "parameters": [{"name": "page", "in": "query", "schema": {"type": "integer"}}],
+            "responses": {"200": {"description": "Companies", "content": {"application/json": {
+                "schema": {"type": "array", "items": {"$ref": "#/components/schemas/company"}}}}}}
+        }}
+    return {
+        "openapi": "3.0.1",
+        "servers": [{"url": url, "description": "Benchmark"}],
+        "info": {"version": "1.0.0", "title": "Benchmark API"},
+        "paths": paths,
+        "components": {"schemas": {"company": {"type": "object", "required": ["id", "name"], "properties": {
+            "id": {"type": "integer"}, "name": {"type": "string"},
+            "tags": {"type": "array", "items": {"type": "string"}}, "active": {"type": "boolean"}}}}}
+    }
+
+
+class LocalServer:
+    """
+    In-process stand-in of api_mock_falcon.py, serving pre-encoded payloads
+    """
+
+    def __init__(self):
+        bodies = {"/{}".format(size): json.dumps(create_payload(count)).encode()
+                  for (size, count) in PAYLOAD_SIZES.items()}
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are sent in separate writes: without TCP_NODELAY, Nagle's algorithm and
+            # the delayed ACK of the client add ~40ms to the small responses
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                body = bodies.get(self.path.split("?")[0], b"{}")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:{}".format(self.httpd.server_address[1])
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def measure(function, iterations):
+    """
+    Run the function and measure each run
+    :param function: function without argument
+    :param iterations: number of runs
+    :return: (list of durations in ms, last result)
+    """
+    durations = []
+    result = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations, result
+
+
+def summarize(durations):
+    ordered = sorted(durations)
+    return {
+        "iterations": len(ordered),
+        "mean_ms": statistics.mean(ordered),
+        "p50_ms": ordered[len(ordered) // 2],
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "min_ms": ordered[0],
+    }
+
+
+def run_size(spec_file, size, iterations):
+    """
+    Measure all phases of the hot path for one payload size
+    :param spec_file: OpenApi Specs file of the local server
+    :param size: key of PAYLOAD_SIZES
+    :param iterations: number of runs per phase
+    :return: {phase: summary}
+    """
+    endpoint = "/{}".format(size)
+    results = {}
+    connectors = []
+    (durations, api) = measure(lambda: connectors.append(ApiConnector(spec_file)) or connectors[-1], iterations)
+    results["connector"] = summarize(durations)
+    # Only the last connector is used by the other phases
+    for connector in connectors[:-1]:
+        connector.close()
+    api.select_server_by_description("Benchmark")
+    (durations, request) = measure(lambda: ApiRequest.create_request(api, endpoint, "get"), iterations)
+    results["create_request"] = summarize(durations)
+    (durations, url) = measure(lambda: request.build_url({"page": 1}), iterations)
+    results["build_url"] = summarize(durations)
+    # Warm up the connection pool before measuring the round trip
+    request.send(url)
+    (durations, sent) = measure(lambda: request.send(url), iterations)
+    results["round_trip"] = summarize(durations)
+    response = sent[0]
+    (durations, _) = measure(lambda: ApiResponse(url, response), iterations)
+    results["api_response"] = summarize(durations)
+    # Response processing of a call: decoding, schema validation and std response
+    (durations, _) = measure(lambda: request.process_response(url, response, False), iterations)
+    results["validation"] = summarize(durations)
+    api.close()
+    return results
+
+
+def run(sizes, iterations=None):
+    """
+    Run the benchmark against the local server
+    :param sizes: list of keys of PAYLOAD_SIZES
+    :param iterations: number of runs per phase (default: DEFAULT_ITERATIONS of each size)
+    :return: benchmark report (json object)
+    """
+    server = LocalServer()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            spec_file = os.path.join(temp_dir, "Api.json")
+            with open(spec_file, "w") as f:
+                json.dump(create_spec(server.url), f)
+            results = {size: run_size(spec_file, size, iterations or DEFAULT_ITERATIONS[size]) for size in sizes}
+    finally:
+        server.close()
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "payload_items": {size: PAYLOAD_SIZES[size] for size in sizes},
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the request/response hot path on localhost")
+    parser.add_argument("--output", default="benchmark_results.json", help="json file of the results")
+    parser.add_argument("--sizes", nargs="+", choices=list(PAYLOAD_SIZES), default=list(PAYLOAD_SIZES))
+    parser.add_argument("--iterations", type=int, default=None, help="number of runs per phase")
+    args = parser.parse_args()
+    report = run(args.sizes, args.iterations)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+    for (size, results) in report["results"].items():
+        print(size)
+        for phase in PHASES:
+            print("  {:<15} mean {:>10.3f} ms  p95 {:>10.3f} ms".format(
+                phase, results[phase]["mean_ms"], results[phase]["p95_ms"]))
+
+
+if __name__ == '__main__':
+    main()
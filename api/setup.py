@@ -79,5 +79,8 @@ setup(
     ],
     extras_require={
         'testing': ['pytest'],
+        'async': ['aiohttp'],
+        'streaming': ['ijson'],
+        'fast-json': ['orjson'],
     }
 )
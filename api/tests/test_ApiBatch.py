@@ -0,0 +1,69 @@
+import time
+
+from api.model.ApiConnector import ApiConnector
+from local_server import LocalServer
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+
+
+def item_route(handler):
+    # Slow down the first items so that they complete last
+    item_id = handler.path.split("id=")[1].split("&")[0]
+    if int(item_id) < 3:
+        time.sleep(0.05 * (3 - int(item_id)))
+    return 200, {"Name": item_id, "UniqueName": item_id}, {}
+
+
+def create_calls(count):
+    return [("/GetItem", "get", {"id": str(index), "name": "item"}, None) for index in range(count)]
+
+
+def test_run_batch_keeps_order():
+    """
+    Test that the results of the batch are in the order of the calls
+    """
+    with LocalServer({("get", "/api/v1/GetItem"): item_route}) as server:
+        with ApiConnector(RESOURCES["existing_api"]) as api:
+            api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+            responses = api.run_batch(create_calls(6), max_workers=4)
+    assert [response["response"]["Payload"]["Name"] for response in responses] == [str(i) for i in range(6)]
+
+
+def test_run_batch_undefined_endpoint():
+    """
+    Test batch with an undefined endpoint
+    """
+    with ApiConnector(RESOURCES["existing_api"]) as api:
+        api.select_server_by_description("Sample API")
+        assert api.run_batch([("/GetItem_bad", "get", None, None)]) == [None]
+
+
+def test_as_completed():
+    """
+    Test that as_completed yields all the calls with their index
+    """
+    with LocalServer({("get", "/api/v1/GetItem"): item_route}) as server:
+        with ApiConnector(RESOURCES["existing_api"]) as api:
+            api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+            results = list(api.as_completed(create_calls(4), max_workers=4))
+    assert sorted(index for (index, _) in results) == [0, 1, 2, 3]
+    assert results[-1][0] == 0
+    for (index, response) in results:
+        assert response["response"]["Payload"]["Name"] == str(index)
+
+
+def test_run_batch_compact_responses():
+    """
+    Test the batch returning the ApiResponse objects instead of the std responses
+    """
+    with LocalServer({("get", "/api/v1/GetItem"): item_route}) as server:
+        with ApiConnector(RESOURCES["existing_api"]) as api:
+            api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+            responses = api.run_batch(create_calls(4), max_workers=4, std_response=False)
+            results = dict(api.as_completed(create_calls(2), max_workers=2, std_response=False))
+    assert [response.payload["Name"] for response in responses] == [str(i) for i in range(4)]
+    assert all(response.status == 200 and response.message == "OK: dict" for response in responses)
+    assert results[1].payload["Name"] == "1"
+    assert responses[0].to_object()["response"]["Payload"] == {"Name": "0", "UniqueName": "0"}
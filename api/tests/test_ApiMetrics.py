@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiMetrics import ApiMetrics
+from api.model.ApiRequest import ApiRequest
+from local_server import LocalServer
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+ITEMS = [{"Name": "30", "UniqueName": "30"}]
+
+
+def test_observe_buckets():
+    """
+    Test the histogram of one phase
+    """
+    metrics = ApiMetrics(buckets=(0.1, 1.0))
+    operation = ("/GetItems", "get")
+    for seconds in (0.05, 0.1, 0.5, 2.0):
+        metrics.observe(operation, "transfer", seconds)
+    phase = metrics.snapshot()["phases"][("/GetItems", "get", "transfer")]
+    assert phase["count"] == 4
+    assert phase["sum"] == 2.65
+    assert phase["buckets"] == {0.1: 2, 1.0: 1, "+Inf": 1}
+
+
+def test_to_prometheus():
+    """
+    Test the export in the Prometheus text format
+    """
+    metrics = ApiMetrics(buckets=(0.1, 1.0))
+    operation = ("/GetItems", "get")
+    metrics.observe(operation, "transfer", 0.5)
+    metrics.count_status(operation, 200)
+    metrics.count_validation(operation, False)
+    metrics.add_bytes(operation, 10, 2)
+    lines = metrics.to_prometheus().splitlines()
+    labels = 'endpoint="/GetItems",method="get"'
+    assert 'api_handler_phase_seconds_bucket{{{},phase="transfer",le="0.1"}} 0'.format(labels) in lines
+    assert 'api_handler_phase_seconds_bucket{{{},phase="transfer",le="1.0"}} 1'.format(labels) in lines
+    assert 'api_handler_phase_seconds_bucket{{{},phase="transfer",le="+Inf"}} 1'.format(labels) in lines
+    assert 'api_handler_phase_seconds_count{{{},phase="transfer"}} 1'.format(labels) in lines
+    assert 'api_handler_responses_total{{{},status_code="200"}} 1'.format(labels) in lines
+    assert 'api_handler_validations_total{{{},result="invalid"}} 1'.format(labels) in lines
+    assert 'api_handler_bytes_received_total{{{}}} 10'.format(labels) in lines
+    assert 'api_handler_bytes_sent_total{{{}}} 2'.format(labels) in lines
+
+
+def test_connector_records_phases():
+    """
+    Test the instrumentation of the calls
+    """
+    with LocalServer({("get", "/api/v1/GetItems"): lambda handler: (200, ITEMS, {})}) as server:
+        api = ApiConnector(RESOURCES["existing_api"], metrics=ApiMetrics())
+        api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+        for _ in range(2):
+            api.run_call("/GetItems", "get")
+    snapshot = api.metrics.snapshot()
+    for phase in ApiMetrics.PHASES:
+        assert ("/GetItems", "get", phase) in snapshot["phases"]
+    assert snapshot["phases"][("/GetItems", "get", "schema_conversion")]["count"] == 1
+    assert snapshot["phases"][("/GetItems", "get", "validation")]["count"] == 2
+    assert snapshot["status_codes"] == {("/GetItems", "get", "200"): 2}
+    assert snapshot["bytes"][("/GetItems", "get")]["in"] > 0
+    assert snapshot["validations"] == {("/GetItems", "get", "valid"): 2}
+
+
+def test_connector_records_async_phases():
+    """
+    Test that the asynchronous calls record the same phases and counters as the synchronous calls
+    """
+    pytest.importorskip("aiohttp")
+    with LocalServer({("get", "/api/v1/GetItems"): lambda handler: (200, ITEMS, {})}) as server:
+        async def run():
+            async with ApiConnector(RESOURCES["existing_api"], metrics=ApiMetrics()) as api:
+                api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+                api_request = ApiRequest.create_request(api, "/GetItems", "get")
+                for _ in range(2):
+                    await api_request.acall(api_request.build_url())
+                return api.metrics.snapshot()
+
+        snapshot = asyncio.run(run())
+    for phase in ("connect", "transfer", "decode", "validation"):
+        assert snapshot["phases"][("/GetItems", "get", phase)]["count"] == 2
+    assert snapshot["status_codes"] == {("/GetItems", "get", "200"): 2}
+    assert snapshot["bytes"][("/GetItems", "get")]["in"] > 0
+    assert snapshot["validations"] == {("/GetItems", "get", "valid"): 2}
@@ -36,13 +36,33 @@ def test_build_request_missing_parameter():
     # TODO: add put and delete request
     for method_type in ["get", "post"]:
         api_request = create_api_request(GET_ITEM_ENDPOINT, method_type=method_type)
-        parameters = {"id": "my_id"}
+        parameters = {"name": "my_name"}
         err_message = ""
         try:
             print(api_request.build_url(parameters))
         except RequestAbortedException as e:
             err_message = str(e)
-        assert err_message == "Parameter 'name' is ignored!"
+        assert err_message == "Required parameter 'id' is missing!"
+
+
+def test_build_request_missing_optional_parameter():
+    """
+    Test Building of URL
+    """
+    # TODO: add put and delete request
+    for method_type in ["get", "post"]:
+        api_request = create_api_request(GET_ITEM_ENDPOINT, method_type=method_type)
+        parameters = {"id": "my_id"}
+        assert api_request.build_url(parameters) == "http://url:1234/api/v1/GetItem?id=my_id"
+
+
+def test_build_request_encoded_parameters():
+    """
+    Test Building of URL
+    """
+    api_request = create_api_request(GET_ITEM_ENDPOINT)
+    parameters = {"id": "a&b=c", "name": "my name"}
+    assert api_request.build_url(parameters) == "http://url:1234/api/v1/GetItem?id=a%26b%3Dc&name=my%20name"
 
 
 def test_build_request_all_required_parameters():
@@ -0,0 +1,57 @@
+from api.model.ApiResponse import ApiResponse
+from api.model.ApiResponse import MockResponse
+
+
+class CountingResponse(MockResponse):
+    def __init__(self, json_data, status_code):
+        super().__init__(json_data, status_code)
+        self.decoded = 0
+
+    def json(self):
+        self.decoded += 1
+        return super().json()
+
+
+def test_payload_decoded_once():
+    """
+    Test that the body of the response is decoded only once
+    """
+    response = CountingResponse("", 200)
+    api_response = ApiResponse("test_url", response)
+    assert api_response.is_empty
+    assert response.decoded == 1
+
+
+def test_schema_validator_loaded_once():
+    """
+    Test that the std response schema is compiled once per process
+    """
+    assert ApiResponse.get_schema_validator() is ApiResponse.get_schema_validator()
+
+
+def test_to_object_debug():
+    """
+    Test the std response with the validation of the envelope
+    """
+    ApiResponse.DEBUG = True
+    try:
+        output = ApiResponse("test_url", MockResponse({"key": "value"}, 200)).to_object()
+    finally:
+        ApiResponse.DEBUG = False
+    assert output == {"url": "test_url", "status_code": 200,
+                      "response": {"StatusCode": 200, "Message": "OK: dict", "Payload": {"key": "value"}}}
+    assert ApiResponse.get_schema_validator().is_valid(output)
+
+
+def test_compact_response():
+    """
+    Test the attributes of the response, without std response
+    """
+    api_response = ApiResponse("test_url", MockResponse([1, 2], 200))
+    assert not hasattr(api_response, "__dict__")
+    assert (api_response.payload, api_response.status, api_response.message) == ([1, 2], 200, "OK: list")
+    assert api_response.to_object() == {"url": "test_url", "status_code": 200,
+                                        "response": {"StatusCode": 200, "Message": "OK: list", "Payload": [1, 2]}}
+    api_response = ApiResponse("test_url", MockResponse({}, 500), error_flag=True, error_message="refused")
+    assert (api_response.status, api_response.message) == (504, "Gateway timeout: refused")
+    assert api_response.is_error and not api_response.is_empty
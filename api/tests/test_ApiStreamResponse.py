@@ -0,0 +1,73 @@
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiMetrics import ApiMetrics
+from api.model.ApiRequest import ApiRequest
+from local_server import LocalServer
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+
+
+def create_request(server, **kwargs):
+    api = ApiConnector(RESOURCES["existing_api"], **kwargs)
+    api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+    return ApiRequest.create_request(api, "/GetItems", "get")
+
+
+def test_stream_items():
+    """
+    Test streaming of a valid array
+    """
+    items = [{"Name": str(index), "UniqueName": str(index)} for index in range(1000)]
+    with LocalServer({("get", "/api/v1/GetItems"): lambda handler: (200, items, {})}) as server:
+        api_request = create_request(server)
+        stream = api_request.stream(api_request.build_url(), chunk_size=100)
+        assert list(stream) == items
+    assert stream.status_code == 200
+    assert stream.items_count == 1000
+    assert stream.invalid_items == 0
+    assert stream.message == "OK: stream"
+
+
+def test_stream_invalid_items():
+    """
+    Test that the items are validated against the items schema
+    """
+    items = [{"Name": "1"}, {"Name": 2}, {"Name": "3"}]
+    with LocalServer({("get", "/api/v1/GetItems"): lambda handler: (200, items, {})}) as server:
+        api_request = create_request(server)
+        stream = api_request.stream(api_request.build_url())
+        assert list(stream) == items
+    assert stream.invalid_items == 1
+    assert stream.message == "WARNING: Response doesn't correspond to predefined schema!"
+
+
+def test_stream_validation_recorded():
+    """
+    Test that the validation of a stream is recorded in the validation policy and the metrics
+    """
+    items = [{"Name": "1"}, {"Name": 2}]
+    with LocalServer({("get", "/api/v1/GetItems"): lambda handler: (200, items, {})}) as server:
+        api_request = create_request(server, metrics=ApiMetrics())
+        for _ in range(2):
+            assert list(api_request.stream(api_request.build_url())) == items
+    operation = ("/GetItems", "get")
+    assert api_request.connector.validation_policy.stats()[operation] == \
+        {"validated": 2, "failures": 2, "skipped": 0}
+    snapshot = api_request.connector.metrics.snapshot()
+    assert snapshot["validations"] == {operation + ("invalid",): 2}
+    assert snapshot["phases"][operation + ("validation",)]["count"] == 2
+    assert snapshot["status_codes"] == {operation + ("200",): 2}
+
+
+def test_stream_connection_error():
+    """
+    Test streaming without server
+    """
+    api = ApiConnector(RESOURCES["existing_api"])
+    api.server = {"url": "http://127.0.0.1:1/api/v1", "description": "Local"}
+    api_request = ApiRequest.create_request(api, "/GetItems", "get")
+    stream = api_request.stream(api_request.build_url())
+    assert list(stream) == []
+    assert stream.is_error
+    assert stream.status_code == 500
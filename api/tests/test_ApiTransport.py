@@ -0,0 +1,38 @@
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiRequest import ApiRequest
+from api.model.ApiTransport import ApiTransport
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+
+
+def test_pool_configuration():
+    """
+    Test the configuration of the connection pool
+    """
+    transport = ApiTransport(pool_connections=2, pool_maxsize=20, keep_alive=False)
+    adapter = transport.session.get_adapter("http://url:1234")
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 20
+    assert transport.session.headers["Connection"] == "close"
+    transport.close()
+
+
+def test_default_transport_is_shared():
+    """
+    Test that requests built without ApiConnector share one transport
+    """
+    assert ApiTransport.default() is ApiTransport.default()
+
+
+def test_requests_share_connector_transport():
+    """
+    Test that all requests of a connector use the transport of the connector
+    """
+    with ApiConnector(RESOURCES["existing_api"], pool_maxsize=4) as api:
+        api.select_server_by_description("Sample API")
+        get_request = ApiRequest.create_request(api, "/GetItems", "get")
+        post_request = ApiRequest.create_request(api, "/GetItems", "post")
+        assert get_request.get_transport() is api.transport
+        assert post_request.get_transport() is api.transport
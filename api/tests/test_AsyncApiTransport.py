@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiRequest import ApiRequest
+from local_server import LocalServer
+
+pytest.importorskip("aiohttp")
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+ITEMS = [{"Name": "30", "UniqueName": "30"}, {"Name": "31", "UniqueName": "31"}]
+
+
+def test_acall_same_std_response_as_call():
+    """
+    Test that the asynchronous call returns the same std response as the synchronous one
+    """
+    routes = {("get", "/api/v1/GetItems"): lambda handler: (200, ITEMS, {})}
+    with LocalServer(routes) as server:
+        async def run():
+            async with ApiConnector(RESOURCES["existing_api"]) as api:
+                api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+                api_request = ApiRequest.create_request(api, "/GetItems", "get")
+                url = api_request.build_url()
+                return await asyncio.gather(*[api_request.acall(url) for _ in range(5)]), api_request.call(url)
+
+        async_responses, sync_response = asyncio.run(run())
+    for response in async_responses:
+        assert response == sync_response
+    assert sync_response["response"] == {"StatusCode": 200, "Message": "OK: list", "Payload": ITEMS}
+
+
+def test_acall_connection_error():
+    """
+    Test the std response of an asynchronous call without server
+    """
+    async def run():
+        async with ApiConnector(RESOURCES["existing_api"]) as api:
+            api.select_server_by_description("Sample API")
+            api.server["url"] = "http://127.0.0.1:1/api/v1"
+            api_request = ApiRequest.create_request(api, "/GetItems", "get")
+            return await api_request.acall(api_request.build_url())
+
+    response = asyncio.run(run())
+    assert response["status_code"] == 500
+    assert response["response"]["StatusCode"] == 504
@@ -0,0 +1,59 @@
+from api.exceptions.ValidationException import BodyValidationException
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiRequest import ApiRequest
+
+RESOURCES = {
+    "request_body_api": "tests/resources/Api_request_body.json"
+}
+
+
+def create_api(body_validation=True):
+    api = ApiConnector(RESOURCES["request_body_api"], body_validation=body_validation)
+    # No server listening: a valid body ends with a connection error
+    api.server = {"url": "http://127.0.0.1:1/api/v1", "description": "Local"}
+    return api
+
+
+def call(api, request_type, body):
+    api_request = ApiRequest.create_request(api, "/Items", request_type)
+    return api_request.call(api_request.build_url(), body)
+
+
+def get_error_message(api, request_type, body):
+    err_message = ""
+    try:
+        call(api, request_type, body)
+    except BodyValidationException as e:
+        err_message = str(e)
+    return err_message
+
+
+def test_valid_body_is_sent():
+    """
+    Test that a valid body goes to the network
+    """
+    api = create_api()
+    assert call(api, "post", {"Name": "item", "Count": 2})["status_code"] == 500
+    assert call(api, "put", [{"Name": "item"}])["status_code"] == 500
+    assert call(api, "put", None)["status_code"] == 500
+
+
+def test_invalid_body_is_rejected():
+    """
+    Test that an invalid body is rejected before any network I/O
+    """
+    api = create_api()
+    assert get_error_message(api, "post", {"Count": 1}) == "ValidationError - body: 'Name' is a required property"
+    assert get_error_message(api, "post", None) == "ValidationError - body: required body is missing"
+    assert get_error_message(api, "put", [{"Name": 1}]) == "ValidationError - body: 1 is not of type 'string'"
+    assert api.validators.stats()["size"] == 2
+
+
+def test_skip_validation():
+    """
+    Test that the validation can be deactivated for trusted callers
+    """
+    assert call(create_api(body_validation=False), "post", {"Count": 1})["status_code"] == 500
+    api_request = ApiRequest.create_request(create_api(), "/Items", "post")
+    api_request.body_validation = False
+    assert api_request.call(api_request.build_url(), {"Count": 1})["status_code"] == 500
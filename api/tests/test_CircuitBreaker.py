@@ -0,0 +1,91 @@
+import time
+
+import requests
+
+from api.model.ApiConnector import ApiConnector
+from api.model.CircuitBreaker import CircuitBreaker
+from local_server import LocalServer
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+
+
+def test_states():
+    """
+    Test the transitions closed -> open -> half open -> closed
+    """
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.1)
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    time.sleep(0.15)
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only one trial call
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_trial():
+    """
+    Test that a failed trial opens the circuit again
+    """
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.1)
+    breaker.record_failure()
+    time.sleep(0.15)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_connector_fails_fast():
+    """
+    Test that the calls fail fast while the circuit of the server is open
+    """
+    with LocalServer({("get", "/api/v1/GetItems"): lambda handler: (500, {"error": "down"}, {})}) as server:
+        api = ApiConnector(RESOURCES["existing_api"],
+                           circuit_breaker={"failure_threshold": 2, "recovery_timeout": 60})
+        api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+        for _ in range(2):
+            assert api.run_call("/GetItems", "get")["status_code"] == 500
+        response = api.run_call("/GetItems", "get")
+        assert len(server.calls) == 2
+    assert response["status_code"] == 503
+    assert response["response"]["StatusCode"] == 504
+    assert response["response"]["Message"] == \
+        "Gateway timeout: circuit breaker open for {}/api/v1".format(server.url)
+    assert api.get_circuit_breaker("{}/api/v1".format(server.url)).state == CircuitBreaker.OPEN
+    assert api.get_circuit_breaker("http://other/api/v1").state == CircuitBreaker.CLOSED
+
+
+def test_unexpected_error_releases_trial():
+    """
+    Test that an attempt raising another error than a connection error frees the trial call and the server
+    """
+    api = ApiConnector(RESOURCES["existing_api"], circuit_breaker={"failure_threshold": 1, "recovery_timeout": 0.1},
+                       server_pool={})
+    server_url = api.server_pool.servers[0]["url"]
+    breaker = api.get_circuit_breaker(server_url)
+    breaker.record_failure()
+    time.sleep(0.15)
+
+    def truncated_body(*args, **kwargs):
+        raise requests.exceptions.ChunkedEncodingError("Connection broken")
+
+    api.transport.request = truncated_body
+    error = None
+    try:
+        api.run_call("/GetItems", "get")
+    except requests.exceptions.ChunkedEncodingError as e:
+        error = e
+    assert error is not None
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.trial_in_progress
+    assert api.server_pool.stats()[server_url]["outstanding"] == 0
+    time.sleep(0.15)
+    assert breaker.allow_request()
@@ -0,0 +1,93 @@
+import importlib.util
+
+from api.api_ctl import run
+from api.exceptions.RequestException import RequestAbortedException
+from api.exceptions.ValidationException import BodyValidationException
+from api.model.ApiConnector import ApiConnector
+from api.model.ClientGenerator import ClientGenerator
+from local_server import LocalServer
+
+RESOURCES = {
+    "path_parameters_api": "tests/resources/Api_path_parameters.json",
+    "request_body_api": "tests/resources/Api_request_body.json"
+}
+
+
+def user_route(handler):
+    return 200, {"id": handler.path.split("/")[-1]}, {}
+
+
+def load_client(tmp_path, configuration_file, class_name="ApiClient"):
+    output = tmp_path / "generated_client.py"
+    assert run(["generate", configuration_file, "-o", str(output), "--class-name", class_name]) == 0
+    spec = importlib.util.spec_from_file_location("generated_client", str(output))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, class_name)
+
+
+def test_function_names():
+    """
+    Test the function names and url templates of the operations
+    """
+    generator = ClientGenerator(ApiConnector(RESOURCES["path_parameters_api"]))
+    assert [name for (name, _, _) in generator.get_operations()] == \
+        ["getUser", "get_users_me", "get_users_id_items_item_id", "get_files_name_json"]
+    assert ClientGenerator.get_function_name("list-items") == "list_items"
+    assert ClientGenerator.get_function_name("2fa") == "operation_2fa"
+    assert ClientGenerator.get_function_name("close") == "close"
+    assert ClientGenerator.get_template("/files/{name}.json") == ("{}/files/{}.json", ["name"])
+    assert ClientGenerator.get_template("/users/{id}/items/{item_id}") == ("{}/users/{}/items/{}", ["id", "item_id"])
+
+
+def test_generated_client(tmp_path):
+    """
+    Test that the generated client returns the same responses as the ApiConnector
+    """
+    client_class = load_client(tmp_path, RESOURCES["path_parameters_api"])
+    assert "getUser" in client_class.OPERATIONS
+    assert client_class.getUser.__doc__.strip().startswith("GET /users/{id} - Get one user")
+    routes = {("get", "/api/v1/users/42"): user_route, ("get", "/api/v1/users/me"): user_route}
+    with LocalServer(routes) as server:
+        with client_class() as client, ApiConnector(RESOURCES["path_parameters_api"]) as api:
+            assert client.connector.server["description"] == "Sample API"
+            client.connector.server = api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+            assert client.getUser({"id": "42"}) == api.run_call("/users/{id}", "get", {"id": "42"})
+            assert client.get_users_me()["response"]["Payload"] == {"id": "me"}
+            assert client.getUser({"id": "42"})["response"]["Payload"] == {"id": "42"}
+    assert server.calls.count(("get", "/api/v1/users/42")) == 3
+
+
+def test_generated_client_missing_parameter(tmp_path):
+    """
+    Test the error of a missing path parameter
+    """
+    client = load_client(tmp_path, RESOURCES["path_parameters_api"])()
+    err_message = ""
+    try:
+        client.get_users_id_items_item_id({"id": "42"})
+    except RequestAbortedException as e:
+        err_message = str(e)
+    assert err_message == "Required parameter 'item_id' is missing!"
+
+
+def test_generated_client_body_validation(tmp_path):
+    """
+    Test that the bodies are validated against the prebuilt schemas
+    """
+    client_class = load_client(tmp_path, RESOURCES["request_body_api"], class_name="ItemsClient")
+    assert ("requestBody", "application/json") in client_class.OPERATIONS["post_Items"]["schemas"]
+    client = client_class()
+    err_message = ""
+    try:
+        client.post_Items(body={"Count": 1})
+    except BodyValidationException as e:
+        err_message = str(e)
+    assert err_message == "ValidationError - body: 'Name' is a required property"
+
+
+def test_api_ctl_without_command():
+    """
+    Test api_ctl without command
+    """
+    assert run([]) == 2
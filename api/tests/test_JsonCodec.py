@@ -0,0 +1,91 @@
+import json
+
+from api.model.ApiConnector import ApiConnector
+from api.model.JsonCodec import JsonCodec
+from local_server import LocalServer
+
+RESOURCES = {
+    "request_body_api": "tests/resources/Api_request_body.json"
+}
+
+
+def test_round_trip_all_backends():
+    """
+    Test encoding/decoding with each installed backend
+    """
+    current = JsonCodec.backend
+    payload = {"name": "é", "items": [1, 2.5, None, True], "nested": {"a": []}}
+    try:
+        for backend in JsonCodec.BACKENDS:
+            try:
+                JsonCodec.set_backend(backend)
+            except ImportError:
+                continue
+            assert JsonCodec.loads(JsonCodec.dumps(payload)) == payload
+            assert JsonCodec.loads(json.dumps(payload)) == payload
+    finally:
+        JsonCodec.set_backend(current)
+
+
+def test_fallback_to_standard_library():
+    """
+    Test data refused by the fast backends
+    """
+    assert JsonCodec.loads(JsonCodec.dumps({1: "non-string key"})) == {"1": "non-string key"}
+    assert str(JsonCodec.loads(b"[NaN]")[0]) == "nan"
+    err = None
+    try:
+        JsonCodec.loads(b"{invalid")
+    except json.JSONDecodeError as e:
+        err = e
+    assert err is not None
+
+
+def test_non_finite_floats():
+    """
+    Test that NaN and Infinity are refused by every backend (not silently encoded)
+    """
+    current = JsonCodec.backend
+    try:
+        for backend in JsonCodec.BACKENDS:
+            try:
+                JsonCodec.set_backend(backend)
+            except ImportError:
+                continue
+            for body in [{"value": float("nan")}, [1, [float("inf")]], {"null": None, "values": [-float("inf")]}]:
+                err_message = ""
+                try:
+                    JsonCodec.dumps(body)
+                except ValueError as e:
+                    err_message = str(e)
+                assert err_message == "Out of range float values are not JSON compliant"
+            assert JsonCodec.dumps({"value": None, "number": 1.5}) in (b'{"value":null,"number":1.5}',
+                                                                        b'{"value": null, "number": 1.5}')
+    finally:
+        JsonCodec.set_backend(current)
+
+
+def test_unknown_backend():
+    """
+    Test selection of an unknown backend
+    """
+    err_message = ""
+    try:
+        JsonCodec.set_backend("simplejson")
+    except ValueError as e:
+        err_message = str(e)
+    assert err_message == "Only ['orjson', 'ujson', 'json'] are available."
+
+
+def test_request_body_encoding():
+    """
+    Test that the body is sent as json
+    """
+    def route(handler):
+        return 201, {"received": json.loads(handler.body), "type": handler.headers["Content-Type"]}, {}
+
+    with LocalServer({("post", "/api/v1/Items"): route}) as server:
+        api = ApiConnector(RESOURCES["request_body_api"])
+        api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+        response = api.run_call("/Items", "post", body={"Name": "é"})
+    assert response["response"]["Payload"] == {"received": {"Name": "é"}, "type": "application/json"}
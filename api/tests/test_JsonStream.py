@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from api.exceptions.ValidationException import ResponseValidationException
+from api.model.JsonStream import JsonStream
+
+
+def split(content, size):
+    data = content.encode()
+    return [data[index:index + size] for index in range(0, len(data), size)]
+
+
+def test_iter_items_all_chunk_sizes():
+    """
+    Test decoding of the items whatever the position of the chunk boundaries
+    """
+    payload = [1, 23456, "é,]", {"a": [1, 2, {"b": None}]}, [], True, 1.5e3, "x"]
+    content = " [ " + ", ".join(json.dumps(item, ensure_ascii=False) for item in payload) + " ] "
+    for size in range(1, len(content.encode()) + 1):
+        assert list(JsonStream.iter_items(split(content, size))) == payload
+
+
+def test_iter_items_empty_array():
+    """
+    Test decoding of an empty array
+    """
+    assert list(JsonStream.iter_items([b"[", b"]"])) == []
+
+
+def test_iter_items_not_an_array():
+    """
+    Test decoding of a payload which is not an array
+    """
+    err_message = ""
+    try:
+        list(JsonStream.iter_items([b'{"a": 1}']))
+    except ResponseValidationException as e:
+        err_message = str(e)
+    assert err_message == "ValidationError - response: payload is not an array"
+
+
+def test_iter_items_truncated():
+    """
+    Test decoding of a truncated payload
+    """
+    err = None
+    try:
+        list(JsonStream.iter_items([b'[{"a": 1}, {"b"']))
+    except json.JSONDecodeError as e:
+        err = e
+    assert err is not None
+
+
+def test_iter_items_bad_delimiters():
+    """
+    Test that a missing, repeated or trailing comma is refused
+    """
+    for content in ("[1 2]", "[,,1]", "[1,,2]", "[1,]", '[{"a": 1} {"b": 2}]'):
+        for size in (1, len(content)):
+            err = None
+            try:
+                list(JsonStream.iter_items(split(content, size)))
+            except json.JSONDecodeError as e:
+                err = e
+            assert err is not None, content
+
+
+def test_iter_items_large_item():
+    """
+    Test decoding of an item spread over many chunks
+    """
+    payload = [{"text": "x\\\"]}" * 20000, "values": list(range(20000))}, "end"]
+    assert list(JsonStream.iter_items(split(json.dumps(payload), 7))) == payload
+
+
+def test_iter_items_pointer():
+    """
+    Test decoding of an array nested in the payload with ijson
+    """
+    pytest.importorskip("ijson")
+    content = '{"meta": {"count": 2}, "data": [1, {"a": [2, 3]}]}'
+    for size in (1, 3, len(content)):
+        assert list(JsonStream.iter_items(split(content, size), "/data")) == [1, {"a": [2, 3]}]
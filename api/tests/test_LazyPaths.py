@@ -0,0 +1,96 @@
+import logging
+import pickle
+
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiOperations import ApiOperations
+from api.model.JsonHandler import JsonHandler
+from api.model.LazyPaths import LazyPaths
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+
+
+def create_spec(tmp_path):
+    spec = JsonHandler.read_json(RESOURCES["existing_api"])
+    spec["paths"]["/Broken"] = {"get": {"parameters": "not a list", "responses": {}}}
+    filename = str(tmp_path / "Api_broken_path.json")
+    JsonHandler.write_json(filename, spec)
+    return filename
+
+
+def test_operations_built_on_access():
+    """
+    Test that the ApiOperations of a path are built on its first access
+    """
+    api = ApiConnector(RESOURCES["existing_api"])
+    assert isinstance(api.paths, LazyPaths)
+    assert len(api.paths) == 2
+    assert "/GetItem" in api.paths
+    assert list(api.paths.keys()) == ["/GetItems", "/GetItem"]
+    assert api.paths.views == {}
+    assert api.get_endpoint_definition("/GetItem", "get") is not None
+    assert list(api.paths.views.keys()) == ["/GetItem"]
+    assert list(api.paths["/GetItem"].views.keys()) == ["get"]
+    assert api.router is None
+
+
+def test_operation_views():
+    """
+    Test the views of the methods of a path
+    """
+    operations = ApiOperations({"get": {"responses": {}}, "summary": "Items"})
+    assert operations.get_operation("get") == {"parameters": None, "responses": {}, "requestBody": None}
+    assert operations.get_operation("post") is None
+    assert operations.get_operation("get") is operations.get_operation("get")
+
+
+def get_path_warnings(caplog):
+    return [record.getMessage() for record in caplog.records if record.getMessage().startswith("Path ")]
+
+
+def test_deferred_validation(tmp_path, caplog):
+    """
+    Test that a path item is validated against the OpenApi Specs schema on its first access only
+    """
+    filename = create_spec(tmp_path)
+    with caplog.at_level(logging.WARNING):
+        api = ApiConnector(filename)
+        api.get_endpoint_definition("/GetItems", "get")
+    assert get_path_warnings(caplog) == []
+    with caplog.at_level(logging.WARNING):
+        api.get_endpoint_definition("/Broken", "get")
+        api.get_endpoint_definition("/Broken", "get")
+    warnings = get_path_warnings(caplog)
+    assert len(warnings) == 1
+    assert warnings[0].startswith("Path /Broken: ValidationError - api_definition")
+    caplog.clear()
+    with caplog.at_level(logging.WARNING):
+        ApiConnector(filename, is_openapi=False).get_endpoint_definition("/Broken", "get")
+    assert get_path_warnings(caplog) == []
+
+
+def test_pickle():
+    """
+    Test that the views and the validator are not pickled
+    """
+    api = ApiConnector(RESOURCES["existing_api"])
+    api.get_endpoint_definition("/GetItem", "get")
+    paths = pickle.loads(pickle.dumps(api.paths))
+    assert paths.views == {}
+    assert paths.validator is None
+    assert paths["/GetItem"].get_operation("get") == api.paths["/GetItem"].get_operation("get")
+
+
+def test_warm_start_validation(tmp_path, caplog):
+    """
+    Test that the path items restored from the SpecCache are validated on their first access
+    """
+    filename = create_spec(tmp_path)
+    ApiConnector(filename, cache_dir=str(tmp_path / "cache"))
+    with caplog.at_level(logging.WARNING):
+        warm = ApiConnector(filename, cache_dir=str(tmp_path / "cache"))
+        warm.get_endpoint_definition("/Broken", "get")
+    assert warm.paths.validator is ApiConnector.get_path_validator()
+    warnings = get_path_warnings(caplog)
+    assert len(warnings) == 1 and warnings[0].startswith("Path /Broken: ValidationError - api_definition")
@@ -0,0 +1,190 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+import pytest
+
+from api.exceptions.AuthenticationException import AuthenticationException
+from api.model.ApiAuthentication import ApiAuthentication
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiRequest import ApiRequest
+from api.model.OAuth2TokenCache import OAuth2TokenCache
+from local_server import LocalServer
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+ITEMS = [{"Name": "30", "UniqueName": "30"}]
+
+
+class TokenEndpoint:
+    """
+    Stand-in of the token endpoint, issuing token-1, token-2, ...
+    The API accepts only the tokens issued from minimal_token
+    """
+
+    def __init__(self, expires_in=3600, delay=0.0, minimal_token=1):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.minimal_token = minimal_token
+        self.issued = 0
+        self.forms = []
+        self.lock = threading.Lock()
+
+    def token(self, handler):
+        time.sleep(self.delay)
+        with self.lock:
+            self.issued += 1
+            self.forms.append(parse_qs(handler.body.decode()))
+            token = "token-{}".format(self.issued)
+        return 200, {"access_token": token, "token_type": "Bearer", "expires_in": self.expires_in}, {}
+
+    def items(self, handler):
+        authorization = handler.headers.get("Authorization", "")
+        if authorization.startswith("Bearer token-") and int(authorization[13:]) >= self.minimal_token:
+            return 200, ITEMS, {}
+        return 401, {"error": "invalid_token"}, {}
+
+    def routes(self):
+        return {("post", "/token"): self.token, ("get", "/api/v1/GetItems"): self.items}
+
+
+def create_connector(monkeypatch, server, client_id, **kwargs):
+    monkeypatch.setenv("TEST_TOKEN_URL", "{}/token".format(server.url))
+    monkeypatch.setenv("TEST_CLIENT_ID", client_id)
+    monkeypatch.setenv("TEST_CLIENT_SECRET", "secret")
+    monkeypatch.setenv("TEST_SCOPE", "items:read")
+    parameters = {"token_url": "TEST_TOKEN_URL", "client_id": "TEST_CLIENT_ID",
+                  "client_secret": "TEST_CLIENT_SECRET", "scope": "TEST_SCOPE"}
+    api = ApiConnector(RESOURCES["existing_api"], authentication="OAuth2ClientCredentials",
+                       parameters=parameters, **kwargs)
+    api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+    return api
+
+
+def test_missing_parameters():
+    """
+    Test ApiAuthentication with OAuth2ClientCredentials authentication without parameters
+    """
+    err_message = ""
+    try:
+        ApiAuthentication(authentication_method="OAuth2ClientCredentials")
+    except AuthenticationException as e:
+        err_message = str(e)
+    assert err_message == "Parameter keys (token_url, client_id, client_secret) are missing."
+
+
+def test_token_fetched_once():
+    """
+    Test that concurrent threads share one token request
+    """
+    endpoint = TokenEndpoint(delay=0.2)
+    with LocalServer(endpoint.routes()) as server:
+        token_cache = OAuth2TokenCache("{}/token".format(server.url), "client", "secret")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            tokens = list(executor.map(lambda _: token_cache.get_token(), range(16)))
+        token_cache.close()
+    assert tokens == ["token-1"] * 16
+    assert endpoint.issued == 1
+    assert endpoint.forms == [{"grant_type": ["client_credentials"]}]
+
+
+def test_background_refresh():
+    """
+    Test that the token is refreshed before its expiration without blocking the callers
+    """
+    endpoint = TokenEndpoint(expires_in=1.5)
+    with LocalServer(endpoint.routes()) as server:
+        token_cache = OAuth2TokenCache("{}/token".format(server.url), "client", "secret", refresh_margin=1.2)
+        assert token_cache.get_token() == "token-1"
+        time.sleep(0.6)
+        assert token_cache.fetch_count == 2
+        start = time.perf_counter()
+        assert token_cache.get_token() == "token-2"
+        assert time.perf_counter() - start < 0.05
+        token_cache.close()
+
+
+def test_short_lived_token():
+    """
+    Test that a token expiring within the refresh margin is not refreshed in a loop
+    """
+    endpoint = TokenEndpoint(expires_in=0.4)
+    with LocalServer(endpoint.routes()) as server:
+        token_cache = OAuth2TokenCache("{}/token".format(server.url), "client", "secret", refresh_margin=60)
+        assert token_cache.get_token() == "token-1"
+        time.sleep(0.3)
+        # Refreshed once at half of the lifetime, then stopped: the token has not been used since
+        assert endpoint.issued == 2
+        time.sleep(0.5)
+        assert endpoint.issued == 2
+        assert token_cache.timer is None
+        token_cache.close()
+
+
+def test_close_stops_refresh(monkeypatch):
+    """
+    Test that closing the connector stops the background refresh
+    """
+    endpoint = TokenEndpoint(expires_in=0.4)
+    with LocalServer(endpoint.routes()) as server:
+        api = create_connector(monkeypatch, server, "closed_client")
+        token_cache = api.authentication.authentication_func.token_cache
+        assert api.run_call("/GetItems", "get")["response"]["Payload"] == ITEMS
+        assert token_cache.timer is not None
+        api.close()
+        assert token_cache.timer is None
+        time.sleep(0.3)
+    assert endpoint.issued == 1
+
+
+def test_shared_cache(monkeypatch):
+    """
+    Test that the connectors of the same client share the token
+    """
+    endpoint = TokenEndpoint()
+    with LocalServer(endpoint.routes()) as server:
+        api = create_connector(monkeypatch, server, "shared_client")
+        other_api = create_connector(monkeypatch, server, "shared_client")
+        assert api.authentication.authentication_func.token_cache is \
+            other_api.authentication.authentication_func.token_cache
+        assert api.run_call("/GetItems", "get")["response"]["Payload"] == ITEMS
+        assert other_api.run_call("/GetItems", "get")["response"]["Payload"] == ITEMS
+        api.authentication.authentication_func.token_cache.close()
+    assert endpoint.issued == 1
+    assert endpoint.forms[0]["scope"] == ["items:read"]
+
+
+def test_concurrent_401_single_refresh(monkeypatch):
+    """
+    Test that the requests rejected with the same token trigger one refresh
+    """
+    endpoint = TokenEndpoint(minimal_token=2)
+    with LocalServer(endpoint.routes()) as server:
+        api = create_connector(monkeypatch, server, "rejected_client", pool_maxsize=8)
+        responses = api.run_batch([("/GetItems", "get") for _ in range(8)])
+        api.authentication.authentication_func.token_cache.close()
+    assert [response["response"]["StatusCode"] for response in responses] == [200] * 8
+    assert endpoint.issued == 2
+
+
+def test_acall_concurrent_401_single_refresh(monkeypatch):
+    """
+    Test the token handling of the asynchronous calls
+    """
+    pytest.importorskip("aiohttp")
+    endpoint = TokenEndpoint(minimal_token=2)
+    with LocalServer(endpoint.routes()) as server:
+        async def run():
+            async with create_connector(monkeypatch, server, "async_client") as api:
+                api_request = ApiRequest.create_request(api, "/GetItems", "get")
+                url = api_request.build_url()
+                responses = await asyncio.gather(*[api_request.acall(url) for _ in range(8)])
+                api.authentication.authentication_func.token_cache.close()
+                return responses
+
+        responses = asyncio.run(run())
+    assert [response["response"]["StatusCode"] for response in responses] == [200] * 8
+    assert endpoint.issued == 2
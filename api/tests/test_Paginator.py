@@ -0,0 +1,122 @@
+import threading
+import time
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+from api.exceptions import RequestException
+from api.model.ApiConnector import ApiConnector
+from api.model.Paginator import Paginator
+from local_server import LocalServer
+
+RESOURCES = {
+    "pagination_api": "tests/resources/Api_pagination.json"
+}
+ITEMS = [{"Name": str(i)} for i in range(7)]
+
+
+def get_query(handler):
+    return {key: values[0] for (key, values) in parse_qs(urlparse(handler.path).query).items()}
+
+
+def offset_route(handler):
+    query = get_query(handler)
+    (offset, limit) = (int(query.get("offset", 0)), int(query.get("limit", 100)))
+    return 200, ITEMS[offset:offset + limit], {}
+
+
+def cursor_route(handler):
+    start = int(get_query(handler).get("cursor", 0))
+    next_cursor = str(start + 3) if start + 3 < len(ITEMS) else None
+    return 200, {"data": ITEMS[start:start + 3], "next": next_cursor}, {}
+
+
+def linked_route(handler):
+    page = int(get_query(handler).get("page", 0))
+    headers = {}
+    if (page + 1) * 4 < len(ITEMS):
+        headers["Link"] = '</api/v1/Linked?page={}>; rel="next", </api/v1/Linked?page=0>; rel="first"'.format(
+            page + 1)
+    return 200, ITEMS[page * 4:(page + 1) * 4], headers
+
+
+def custom_route(handler):
+    query = get_query(handler)
+    (start, size) = (int(query.get("start", 0)), int(query["size"]))
+    return 200, {"result": {"values": ITEMS[start:start + size]}}, {}
+
+
+ROUTES = {("get", "/api/v1/Offset"): offset_route, ("get", "/api/v1/Cursor"): cursor_route,
+          ("get", "/api/v1/Linked"): linked_route, ("get", "/api/v1/Custom"): custom_route}
+
+
+def create_connector(server):
+    api = ApiConnector(RESOURCES["pagination_api"])
+    api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+    return api
+
+
+def test_detect_pagination():
+    """
+    Test the pagination detected from the operation
+    """
+    api = ApiConnector(RESOURCES["pagination_api"])
+    assert Paginator(api, "/Offset").pagination["style"] == "offset"
+    assert Paginator(api, "/Cursor").pagination["style"] == "cursor"
+    assert Paginator(api, "/Linked").pagination["style"] == "link"
+    assert Paginator(api, "/Custom").pagination["limit_param"] == "size"
+    err_message = ""
+    try:
+        Paginator(api, "/Offset", pagination={"style": "page"})
+    except ValueError as e:
+        err_message = str(e)
+    assert err_message == "Only ['offset', 'cursor', 'link'] are available."
+
+
+def test_styles():
+    """
+    Test each pagination style
+    """
+    with LocalServer(ROUTES) as server:
+        api = create_connector(server)
+        assert list(api.paginate("/Offset", "get", {"limit": 3})) == ITEMS
+        assert list(api.paginate("/Cursor")) == ITEMS
+        assert list(api.paginate("/Linked")) == ITEMS
+        assert list(api.paginate("/Custom", prefetch=False)) == ITEMS
+        calls = list(server.calls)
+    assert calls[:3] == [("get", "/api/v1/Offset?limit=3"), ("get", "/api/v1/Offset?offset=3&limit=3"),
+                         ("get", "/api/v1/Offset?offset=6&limit=3")]
+    assert ("get", "/api/v1/Cursor?cursor=6") in calls
+    assert ("get", "/api/v1/Linked?page=1") in calls
+
+
+def test_prefetch():
+    """
+    Test that the next page is fetched while the current page is processed
+    """
+    fetched = threading.Event()
+
+    def route(handler):
+        if "offset=2" in handler.path:
+            fetched.set()
+        return offset_route(handler)
+
+    with LocalServer({("get", "/api/v1/Offset"): route}) as server:
+        items = create_connector(server).paginate("/Offset", parameters={"limit": 2})
+        assert next(items) == ITEMS[0]
+        assert fetched.wait(1)
+        start = time.perf_counter()
+        assert list(items) == ITEMS[1:]
+        assert time.perf_counter() - start < 1
+
+
+def test_failed_page():
+    """
+    Test a page failing with an error status code
+    """
+    with LocalServer({}) as server:
+        err_message = ""
+        try:
+            list(create_connector(server).paginate("/Offset"))
+        except RequestException.PaginationException as e:
+            err_message = str(e)
+    assert err_message == "Page {}/api/v1/Offset?limit=100 failed with status code 404.".format(server.url)
@@ -0,0 +1,71 @@
+from api.exceptions.RequestException import RequestAbortedException
+from api.model.ParameterPlan import ParameterPlan
+
+
+def create_plan():
+    return ParameterPlan([
+        {"name": "id", "in": "path", "required": True},
+        {"name": "tags", "in": "query"},
+        {"name": "csv", "in": "query", "explode": False},
+        {"name": "pipe", "in": "query", "style": "pipeDelimited"},
+        {"name": "filter", "in": "query", "style": "deepObject", "explode": True},
+        {"name": "limit", "in": "query", "required": True},
+        {"name": "X-Request-Id", "in": "header"},
+        {"name": "session", "in": "cookie"},
+        {"name": "coords", "in": "path", "style": "matrix", "explode": True},
+    ])
+
+
+def test_plan_sets():
+    """
+    Test required and optional sets of the plan
+    """
+    plan = create_plan()
+    assert plan.required == {"id", "limit", "coords"}
+    assert plan.optional == {"tags", "csv", "pipe", "filter", "X-Request-Id", "session"}
+
+
+def test_build_query():
+    """
+    Test query serialization with styles
+    """
+    plan = create_plan()
+    parameters = {"tags": ["a", "b c"], "csv": [1, 2], "pipe": ["x", "y"], "filter": {"color": "red"},
+                  "limit": True}
+    assert plan.build_query(parameters) == \
+        "tags=a&tags=b%20c&csv=1,2&pipe=x|y&filter[color]=red&limit=true"
+    assert plan.build_query({}) is None
+
+
+def test_check_required():
+    """
+    Test detection of missing required query parameter
+    """
+    plan = create_plan()
+    plan.check_required({"limit": 1})
+    err_message = ""
+    try:
+        plan.check_required({})
+    except RequestAbortedException as e:
+        err_message = str(e)
+    assert err_message == "Required parameter 'limit' is missing!"
+
+
+def test_build_headers():
+    """
+    Test header and cookie parameters
+    """
+    plan = create_plan()
+    assert plan.build_headers({"X-Request-Id": "abc", "session": "s 1", "limit": 3}) == \
+        {"X-Request-Id": "abc", "Cookie": "session=s%201"}
+
+
+def test_serialize_path_parameter():
+    """
+    Test path parameters serialization
+    """
+    plan = create_plan()
+    assert plan.serialize_path_parameter("id", "a/b") == "a%2Fb"
+    assert plan.serialize_path_parameter("id", [1, 2]) == "1,2"
+    assert plan.serialize_path_parameter("coords", {"x": 1, "y": 2}) == ";x=1;y=2"
+    assert plan.serialize_path_parameter("undefined", "v") == "v"
@@ -0,0 +1,73 @@
+from api.exceptions.RequestException import RequestAbortedException
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiRequest import ApiRequest
+from api.model.PathRouter import PathRouter
+
+RESOURCES = {
+    "path_parameters_api": "tests/resources/Api_path_parameters.json"
+}
+
+
+def create_router():
+    return PathRouter(["/users/{id}", "/users/me", "/users/{id}/items/{item_id}", "/files/{name}.json"])
+
+
+def test_resolve_templates():
+    """
+    Test resolution of concrete paths
+    """
+    router = create_router()
+    assert router.resolve("/users/42") == ("/users/{id}", {"id": "42"})
+    assert router.resolve("/users/me") == ("/users/me", {})
+    assert router.resolve("/users/me/items/7") == ("/users/{id}/items/{item_id}", {"id": "me", "item_id": "7"})
+    assert router.resolve("/files/report%20v1.json") == ("/files/{name}.json", {"name": "report v1"})
+
+
+def test_resolve_mixed_parameter_names():
+    """
+    Test templates naming the parameter of the same segment differently
+    """
+    router = PathRouter(["/users/{id}", "/users/{user_id}/items", "/users/{uid}/items/{item}.json"])
+    assert router.resolve("/users/5") == ("/users/{id}", {"id": "5"})
+    assert router.resolve("/users/5/items") == ("/users/{user_id}/items", {"user_id": "5"})
+    assert router.resolve("/users/5/items/a%20b.json") == ("/users/{uid}/items/{item}.json",
+                                                           {"uid": "5", "item": "a b"})
+
+
+def test_resolve_missing():
+    """
+    Test resolution of undefined paths
+    """
+    router = create_router()
+    assert router.resolve("/users") is None
+    assert router.resolve("/users/42/items") is None
+    assert router.resolve("/groups/42") is None
+
+
+def test_build_url_with_path_parameters():
+    """
+    Test filling of path parameters
+    """
+    api = ApiConnector(RESOURCES["path_parameters_api"])
+    api.select_server_by_description("Sample API")
+    api_request = ApiRequest.create_request(api, "/users/{id}/items/{item_id}", "get")
+    assert api_request.build_url({"id": "a/b", "item_id": 3}) == "http://url:1234/api/v1/users/a%2Fb/items/3"
+    err_message = ""
+    try:
+        api_request.build_url({"id": "42"})
+    except RequestAbortedException as e:
+        err_message = str(e)
+    assert err_message == "Required parameter 'item_id' is missing!"
+
+
+def test_create_request_from_concrete_path():
+    """
+    Test creation of the request from a concrete path
+    """
+    api = ApiConnector(RESOURCES["path_parameters_api"])
+    api.select_server_by_description("Sample API")
+    assert api.get_endpoint_definition("/users/42", "get") == api.get_endpoint_definition("/users/{id}", "get")
+    api_request = ApiRequest.create_request(api, "/users/42", "get")
+    assert api_request.endpoint == "/users/{id}"
+    assert api_request.build_url() == "http://url:1234/api/v1/users/42"
+    assert api_request.build_url({"id": "43"}) == "http://url:1234/api/v1/users/43"
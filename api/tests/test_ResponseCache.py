@@ -0,0 +1,96 @@
+from api.model.ApiConnector import ApiConnector
+from api.model.ResponseCache import ResponseCache
+from local_server import LocalServer
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+ITEMS = [{"Name": "30", "UniqueName": "30"}]
+
+
+def test_get_expiration():
+    """
+    Test the freshness computed from the headers
+    """
+    now = 1000.0
+    assert ResponseCache.get_expiration({"cache-control": "max-age=60"}, now) == 1060.0
+    assert ResponseCache.get_expiration({"cache-control": "public, max-age=60", "age": "10"}, now) == 1050.0
+    assert ResponseCache.get_expiration({"cache-control": "no-store, max-age=60"}, now) is None
+    assert ResponseCache.get_expiration({"cache-control": "no-cache"}, now) == now
+    assert ResponseCache.get_expiration({"date": "Sun, 06 Nov 1994 08:49:37 GMT",
+                                         "expires": "Sun, 06 Nov 1994 08:50:37 GMT"}, now) == 1060.0
+    assert ResponseCache.get_expiration({"expires": "0"}, now) == now
+    assert ResponseCache.get_expiration({}, now) == now
+
+
+def test_store_bounds():
+    """
+    Test eviction of the least recently used entries
+    """
+    cache = ResponseCache(max_entries=2, max_bytes=100)
+    headers = {"Cache-Control": "max-age=60"}
+    assert cache.store("a", {"a": 1}, 200, headers, 10)
+    assert cache.store("b", {"b": 1}, 200, headers, 10)
+    cache.lookup("a")
+    assert cache.store("c", {"c": 1}, 200, headers, 10)
+    assert cache.lookup("b") is None
+    assert cache.lookup("a")["output"] == {"a": 1}
+    assert cache.store("d", {"d": 1}, 200, headers, 95)
+    assert cache.stats()["entries"] == 1
+    assert not cache.store("e", {"e": 1}, 200, headers, 101)
+    assert not cache.store("f", {"f": 1}, 500, headers, 1)
+    assert not cache.store("g", {"g": 1}, 200, {}, 1)
+
+
+def test_cache_hit_skips_network():
+    """
+    Test that a fresh response is served from the cache
+    """
+    routes = {("get", "/api/v1/GetItems"): lambda handler: (200, ITEMS, {"Cache-Control": "max-age=60"})}
+    with LocalServer(routes) as server:
+        api = ApiConnector(RESOURCES["existing_api"], response_cache=ResponseCache())
+        api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+        responses = [api.run_call("/GetItems", "get") for _ in range(3)]
+    assert len(server.calls) == 1
+    assert responses[0] is responses[2]
+    assert responses[0]["response"]["Payload"] == ITEMS
+    assert api.response_cache.stats()["hits"] == 2
+
+
+def test_cache_shared_by_callers(monkeypatch):
+    """
+    Test that a cache shared by connectors with different credentials keeps their responses apart
+    """
+    routes = {("get", "/api/v1/GetItems"): lambda handler: (200, ITEMS, {"Cache-Control": "max-age=60"})}
+    cache = ResponseCache()
+    responses = []
+    with LocalServer(routes) as server:
+        for user in ["cache_user_a", "cache_user_b", "cache_user_a"]:
+            monkeypatch.setenv("cache_test_user", user)
+            monkeypatch.setenv("cache_test_password", "pass")
+            api = ApiConnector(RESOURCES["existing_api"], authentication="HTTPBasicAuth",
+                               parameters={"username": "cache_test_user", "password": "cache_test_password"},
+                               response_cache=cache)
+            api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+            responses.append(api.run_call("/GetItems", "get"))
+    assert len(server.calls) == 2
+    assert responses[0] is responses[2] and responses[0] is not responses[1]
+
+
+def test_cache_revalidation():
+    """
+    Test revalidation of a stale response with ETag
+    """
+    def route(handler):
+        if handler.headers.get("If-None-Match") == '"v1"':
+            return 304, None, {"ETag": '"v1"', "Cache-Control": "no-cache"}
+        return 200, ITEMS, {"ETag": '"v1"', "Cache-Control": "no-cache"}
+
+    with LocalServer({("get", "/api/v1/GetItems"): route}) as server:
+        api = ApiConnector(RESOURCES["existing_api"], response_cache=ResponseCache())
+        api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+        first = api.run_call("/GetItems", "get")
+        second = api.run_call("/GetItems", "get")
+    assert len(server.calls) == 2
+    assert first is second
+    assert api.response_cache.stats()["revalidations"] == 1
@@ -0,0 +1,170 @@
+import asyncio
+import email.utils
+import time
+
+import pytest
+
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiRequest import ApiRequest
+from api.model.ApiResponse import MockResponse
+from api.model.CircuitBreaker import CircuitBreaker
+from api.model.RetryPolicy import RetryPolicy
+from local_server import LocalServer
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+ITEMS = [{"Name": "30", "UniqueName": "30"}]
+
+
+class FlakyRoute:
+    """
+    Route failing with the given status codes before returning the items
+    """
+
+    def __init__(self, failures, headers=None):
+        self.failures = list(failures)
+        self.headers = headers if headers is not None else {}
+        self.calls = 0
+
+    def __call__(self, handler):
+        self.calls += 1
+        if len(self.failures) > 0:
+            return self.failures.pop(0), {"error": "unavailable"}, self.headers
+        return 200, ITEMS, {}
+
+
+def create_connector(server, **kwargs):
+    api = ApiConnector(RESOURCES["existing_api"], **kwargs)
+    api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+    return api
+
+
+def test_exponential_backoff():
+    """
+    Test the delays without jitter
+    """
+    policy = RetryPolicy(max_retries=3, backoff_factor=0.1, max_backoff=0.3, jitter=False)
+    delays = [policy.get_delay("get", attempt) for attempt in range(4)]
+    assert delays == [0.1, 0.2, 0.3, None]
+    policy = RetryPolicy(backoff_factor=0.1)
+    for attempt in range(3):
+        assert 0 <= policy.get_delay("get", attempt) <= 0.1 * 2 ** attempt
+
+
+def test_non_idempotent_and_status_codes():
+    """
+    Test the calls which are not retried
+    """
+    policy = RetryPolicy(jitter=False)
+    assert policy.get_delay("post", 0) is None
+    assert policy.get_delay("get", 0, MockResponse({}, 500)) is None
+    assert policy.get_delay("get", 0, MockResponse({}, 503)) == 0.1
+    assert RetryPolicy(methods=("get", "post"), jitter=False).get_delay("post", 0) == 0.1
+
+
+def test_retry_after():
+    """
+    Test the Retry-After header (seconds and HTTP-date)
+    """
+    policy = RetryPolicy(jitter=False)
+    assert policy.get_delay("get", 0, MockResponse({}, 429, headers={"Retry-After": "2"})) == 2.0
+    date = email.utils.formatdate(time.time() + 5, usegmt=True)
+    assert 3 < policy.get_delay("get", 0, MockResponse({}, 503, headers={"Retry-After": date})) <= 5
+    assert policy.get_delay("get", 0, MockResponse({}, 503, headers={"Retry-After": "soon"})) == 0.1
+    assert RetryPolicy(respect_retry_after=False, jitter=False).get_delay(
+        "get", 0, MockResponse({}, 429, headers={"Retry-After": "2"})) == 0.1
+
+
+def test_budget():
+    """
+    Test that no retry exceeds the budget of the call
+    """
+    policy = RetryPolicy(budget=1.0, jitter=False)
+    deadline = policy.get_deadline()
+    assert policy.get_delay("get", 0, MockResponse({}, 429, headers={"Retry-After": "0.5"}), deadline) == 0.5
+    assert policy.get_delay("get", 0, MockResponse({}, 429, headers={"Retry-After": "2"}), deadline) is None
+
+
+def test_retry_ratio():
+    """
+    Test the retry budget shared by the calls
+    """
+    policy = RetryPolicy(jitter=False, retry_ratio=0.5, retry_burst=2)
+    response = MockResponse({}, 503)
+    assert [policy.get_delay("get", 0, response) for _ in range(3)] == [0.1, 0.1, None]
+    for _ in range(2):
+        policy.record_call()
+    assert policy.get_delay("get", 0, response) == 0.1
+    assert policy.get_delay("get", 0, response) is None
+
+
+def test_connector_retries():
+    """
+    Test the retries of the calls of a connector
+    """
+    route = FlakyRoute([503, 502], headers={"Retry-After": "0"})
+    with LocalServer({("get", "/api/v1/GetItems"): route, ("post", "/api/v1/GetItems"): route}) as server:
+        api = create_connector(server, retry_policy=RetryPolicy(backoff_factor=0.01))
+        response = api.run_call("/GetItems", "get")
+        assert response["response"]["Payload"] == ITEMS
+        assert route.calls == 3
+        route.failures = [503]
+        response = api.run_call("/GetItems", "post")
+        assert response["status_code"] == 503
+        assert route.calls == 4
+
+
+def test_connector_connection_error():
+    """
+    Test that a connection error is retried then returns the std error response
+    """
+    policy = RetryPolicy(max_retries=2, backoff_factor=0.01)
+    api = ApiConnector(RESOURCES["existing_api"], retry_policy=policy)
+    api.server = {"url": "http://127.0.0.1:9/api/v1", "description": "Closed port"}
+    response = api.run_call("/GetItems", "get")
+    assert response["response"]["StatusCode"] == 504
+    assert response["response"]["Message"] == "Gateway timeout: "
+
+
+def test_connector_timeout():
+    """
+    Test that a call timing out is retried and recorded as a failure by the circuit breaker
+    """
+    delays = [0.5]
+
+    def slow_route(handler):
+        if len(delays) > 0:
+            time.sleep(delays.pop(0))
+        return 200, ITEMS, {}
+
+    with LocalServer({("get", "/api/v1/GetItems"): slow_route}) as server:
+        api = create_connector(server, timeout=(1, 0.1), retry_policy=RetryPolicy(backoff_factor=0.01))
+        assert api.transport.timeout == (1, 0.1)
+        response = api.run_call("/GetItems", "get")
+        assert response["response"]["Payload"] == ITEMS
+        assert len(server.calls) == 2
+        api = create_connector(server, timeout=(1, 0.1), circuit_breaker={"failure_threshold": 2})
+        delays.extend([0.5, 0.5])
+        for _ in range(2):
+            assert api.run_call("/GetItems", "get")["response"]["StatusCode"] == 504
+        assert api.get_circuit_breaker(api.server["url"]).state == CircuitBreaker.OPEN
+        assert api.run_call("/GetItems", "get")["status_code"] == 503
+        assert len(server.calls) == 4
+
+
+def test_acall_retries():
+    """
+    Test the retries of the asynchronous calls
+    """
+    pytest.importorskip("aiohttp")
+    route = FlakyRoute([503], headers={"Retry-After": "0"})
+    with LocalServer({("get", "/api/v1/GetItems"): route}) as server:
+        async def run():
+            async with create_connector(server, retry_policy=RetryPolicy()) as api:
+                api_request = ApiRequest.create_request(api, "/GetItems", "get")
+                return await api_request.acall(api_request.build_url())
+
+        response = asyncio.run(run())
+    assert response["response"]["Payload"] == ITEMS
+    assert route.calls == 2
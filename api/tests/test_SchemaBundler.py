@@ -0,0 +1,73 @@
+import copy
+
+from api.model.ApiConnector import ApiConnector
+from api.model.JsonHandler import JsonHandler
+from api.model.SchemaBundler import SchemaBundler
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+COMPONENTS = {
+    "schemas": {
+        "Order": {"type": "object", "properties": {"customer": {"$ref": "#/components/schemas/Customer"},
+                                                   "note": {"type": "string", "nullable": True}}},
+        "Customer": {"type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}},
+        "Node": {"type": "object", "properties": {
+            "name": {"$ref": "#/components/schemas/Customer/properties/name"},
+            "children": {"type": "array", "items": {"$ref": "#/components/schemas/Node"}}}},
+        "Unused": {"type": "string"}
+    }
+}
+
+
+def test_bundle_inlines_non_recursive_components():
+    """
+    Test that the references to non-recursive components are resolved
+    """
+    components = copy.deepcopy(COMPONENTS)
+    bundler = SchemaBundler(components)
+    schema = bundler.bundle({"$schema": "http://json-schema.org/draft-04/schema#",
+                             "type": "array", "items": {"$ref": "#/components/schemas/Order"}})
+    assert schema["components"] == {"schemas": {}}
+    assert schema["items"]["properties"]["customer"]["required"] == ["name"]
+    assert schema["items"]["properties"]["note"]["type"] == ["string", "null"]
+    # Converted once and shared by the bundles, the components of the specs are not modified
+    assert bundler.bundle({"$ref": "#/components/schemas/Order"})["properties"] is schema["items"]["properties"]
+    assert components == COMPONENTS
+
+
+def test_bundle_keeps_recursive_components():
+    """
+    Test that only the reachable recursive components are attached
+    """
+    bundler = SchemaBundler(COMPONENTS)
+    schema = bundler.bundle({"$ref": "#/components/schemas/Node"})
+    assert sorted(schema["components"]["schemas"].keys()) == ["Customer", "Node"]
+    assert schema["$ref"] == "#/components/schemas/Node"
+    node = schema["components"]["schemas"]["Node"]
+    assert node["properties"]["children"]["items"] == {"$ref": "#/components/schemas/Node"}
+    validator = JsonHandler.compile_validator(schema)
+    tree = {"name": "root", "children": [{"name": "leaf", "children": []}]}
+    assert JsonHandler.validate_compiled(tree, validator)[0]
+    assert not JsonHandler.validate_compiled({"children": [{"name": 1}]}, validator)[0]
+
+
+def test_recursion_detection():
+    """
+    Test the detection of the recursive components
+    """
+    bundler = SchemaBundler(COMPONENTS)
+    assert bundler.is_recursive("Node")
+    assert not bundler.is_recursive("Order")
+    assert SchemaBundler.get_references(COMPONENTS["schemas"]["Node"]) == {"Customer", "Node"}
+
+
+def test_connector_response_schema():
+    """
+    Test the response schema of an operation
+    """
+    api = ApiConnector(RESOURCES["existing_api"])
+    schema = api.get_schema_bundler().bundle({"$ref": "#/components/schemas/getItems"})
+    assert schema["type"] == "array"
+    assert schema["items"]["properties"]["Name"] == {"type": "string"}
+    assert schema["components"] == {"schemas": {}}
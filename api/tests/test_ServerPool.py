@@ -0,0 +1,154 @@
+import threading
+import time
+
+from api.model.ApiConnector import ApiConnector
+from api.model.JsonHandler import JsonHandler
+from api.model.RetryPolicy import RetryPolicy
+from api.model.ServerPool import ServerPool
+from local_server import LocalServer
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+ITEMS = [{"Name": "30", "UniqueName": "30"}]
+SERVERS = [{"url": "http://a/api/v1", "description": "A"}, {"url": "http://b/api/v1", "description": "B"},
+           {"url": "http://c/api/v1", "description": "C"}]
+
+
+def create_spec(tmp_path, urls):
+    spec = JsonHandler.read_json(RESOURCES["existing_api"])
+    spec["servers"] = [{"url": "{}/api/v1".format(url), "description": "Replica {}".format(i)}
+                       for (i, url) in enumerate(urls)]
+    filename = str(tmp_path / "Api_servers.json")
+    JsonHandler.write_json(filename, spec)
+    return filename
+
+
+def test_unknown_mode():
+    """
+    Test ServerPool with an unknown mode
+    """
+    err_message = ""
+    try:
+        ServerPool(SERVERS, mode="random")
+    except ValueError as e:
+        err_message = str(e)
+    assert err_message == "Only ['round_robin', 'least_outstanding', 'ewma'] are available."
+
+
+def test_round_robin():
+    """
+    Test that the servers are selected in turn
+    """
+    pool = ServerPool(SERVERS)
+    assert [pool.select()["description"] for _ in range(6)] == ["A", "B", "C", "A", "B", "C"]
+    assert pool.select(exclude=("http://b/api/v1", "http://c/api/v1"))["description"] == "A"
+
+
+def test_least_outstanding():
+    """
+    Test the selection of the server with the fewest calls in progress
+    """
+    pool = ServerPool(SERVERS, mode=ServerPool.LEAST_OUTSTANDING)
+    for server in (SERVERS[0], SERVERS[0], SERVERS[1]):
+        pool.acquire(server)
+    assert pool.select()["description"] == "C"
+    pool.acquire(SERVERS[2])
+    assert pool.select()["description"] in ("B", "C")
+    pool.release(SERVERS[0], 0.1, True)
+    pool.release(SERVERS[0], 0.1, True)
+    assert pool.select()["description"] == "A"
+
+
+def test_ewma():
+    """
+    Test the selection of the fastest server
+    """
+    pool = ServerPool(SERVERS, mode=ServerPool.EWMA, decay=0.5)
+    for (server, latency) in zip(SERVERS, (0.2, 0.05, 0.4)):
+        pool.acquire(server)
+        pool.release(server, latency, True)
+    assert pool.select()["description"] == "B"
+    pool.acquire(SERVERS[1])
+    pool.release(SERVERS[1], 0.45, True)
+    assert pool.stats()["http://b/api/v1"]["ewma"] == 0.25
+    assert pool.select()["description"] == "A"
+    # Calls in progress increase the expected latency
+    pool.acquire(SERVERS[0])
+    assert pool.select()["description"] == "B"
+
+
+def test_ejection():
+    """
+    Test the ejection after consecutive failures and the admission after ejection_time
+    """
+    pool = ServerPool(SERVERS, failure_threshold=2, ejection_time=0.1)
+    for _ in range(2):
+        pool.acquire(SERVERS[0])
+        pool.release(SERVERS[0], 0.01, False)
+    assert not pool.stats()["http://a/api/v1"]["available"]
+    assert "A" not in [pool.select()["description"] for _ in range(4)]
+    time.sleep(0.15)
+    assert pool.stats()["http://a/api/v1"]["available"]
+
+
+def test_health_checks():
+    """
+    Test the ejection and the admission by the background health checks
+    """
+    healthy = {"http://a/api/v1": True, "http://b/api/v1": False, "http://c/api/v1": True}
+    checked = threading.Event()
+
+    def health_check(server):
+        checked.set()
+        return healthy[server["url"]]
+
+    pool = ServerPool(SERVERS, health_check=health_check, health_interval=0.05)
+    checked.wait(1)
+    time.sleep(0.05)
+    assert "B" not in [pool.select()["description"] for _ in range(4)]
+    healthy["http://b/api/v1"] = True
+    time.sleep(0.15)
+    assert "B" in [pool.select()["description"] for _ in range(3)]
+    pool.close()
+
+
+def test_connector_balancing(tmp_path):
+    """
+    Test that the calls of a connector are spread over the servers
+    """
+    routes = {("get", "/api/v1/GetItems"): lambda handler: (200, ITEMS, {}),
+              ("get", "/api/v1/health"): lambda handler: (200, {}, {})}
+    with LocalServer(routes) as first, LocalServer(routes) as second:
+        api = ApiConnector(create_spec(tmp_path, [first.url, second.url]),
+                           server_pool={"mode": ServerPool.ROUND_ROBIN, "health_path": "/health"})
+        for _ in range(4):
+            assert api.run_call("/GetItems", "get")["response"]["Payload"] == ITEMS
+        api.close()
+    assert first.calls.count(("get", "/api/v1/GetItems")) == 2
+    assert second.calls.count(("get", "/api/v1/GetItems")) == 2
+    assert ("get", "/api/v1/health") in first.calls
+
+
+def test_connector_failover(tmp_path):
+    """
+    Test that a failed call is sent again to another server and that the failing server is ejected
+    """
+    with LocalServer({("get", "/api/v1/GetItems"): lambda handler: (200, ITEMS, {})}) as server:
+        api = ApiConnector(create_spec(tmp_path, ["http://127.0.0.1:9", server.url]),
+                           retry_policy=RetryPolicy(backoff_factor=0.01),
+                           server_pool={"failure_threshold": 1, "ejection_time": 60})
+        responses = [api.run_call("/GetItems", "get") for _ in range(4)]
+    assert [response["response"]["Payload"] for response in responses] == [ITEMS] * 4
+    assert len(server.calls) == 4
+    assert not api.server_pool.stats()["http://127.0.0.1:9/api/v1"]["available"]
+
+
+def test_connector_select_server_warning(tmp_path, caplog):
+    """
+    Test the warning of a server selected by description while the calls go through the server pool
+    """
+    api = ApiConnector(create_spec(tmp_path, ["http://a", "http://b"]), server_pool={})
+    assert api.select_server_by_description("Replica 1")
+    api.close()
+    assert "Server 'Replica 1' selected but not used: the calls are balanced over the server pool" in caplog.messages
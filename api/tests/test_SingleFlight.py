@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiRequest import ApiRequest
+from api.model.SingleFlight import SingleFlight
+from local_server import LocalServer
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+ITEMS = [{"Name": "30", "UniqueName": "30"}]
+
+
+def slow_route(handler):
+    time.sleep(0.2)
+    return 200, ITEMS, {}
+
+
+def create_connector(server, **kwargs):
+    api = ApiConnector(RESOURCES["existing_api"], pool_maxsize=8, **kwargs)
+    api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+    return api
+
+
+def test_do():
+    """
+    Test that concurrent calls with the same key run the function once
+    """
+    single_flight = SingleFlight()
+    calls = []
+    started = threading.Barrier(8)
+
+    def function():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"value": 42}
+
+    def run(_):
+        started.wait()
+        return single_flight.do("key", function)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(run, range(8)))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.stats() == {"leaders": 1, "followers": 7}
+    assert single_flight.do("key", function) == {"value": 42}
+    assert len(calls) == 2
+
+
+def test_do_exception():
+    """
+    Test that the exception of the leader is raised to all the coalesced callers
+    """
+    single_flight = SingleFlight()
+    started = threading.Barrier(4)
+
+    def function():
+        time.sleep(0.2)
+        raise RuntimeError("upstream failed")
+
+    def run(_):
+        started.wait()
+        try:
+            single_flight.do("key", function)
+        except RuntimeError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(run, range(4))) == ["upstream failed"] * 4
+
+
+def test_do_base_exception():
+    """
+    Test that the followers do not get a result of None when the leader is interrupted
+    """
+    single_flight = SingleFlight()
+    started = threading.Barrier(4)
+
+    def function():
+        time.sleep(0.2)
+        raise SystemExit(1)
+
+    def run(_):
+        started.wait()
+        try:
+            return single_flight.do("key", function)
+        except SystemExit as e:
+            return "exit {}".format(e.code)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(run, range(4))) == ["exit 1"] * 4
+
+
+def test_ado_leader_cancelled():
+    """
+    Test that a follower runs the call when the leader task is cancelled
+    """
+    single_flight = SingleFlight()
+    calls = []
+
+    async def function():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return len(calls)
+
+    async def run():
+        leader = asyncio.ensure_future(single_flight.ado("key", function))
+        await asyncio.sleep(0.01)
+        followers = [asyncio.ensure_future(single_flight.ado("key", function)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        return leader.cancelled(), results
+
+    assert asyncio.run(run()) == (True, [2, 2, 2])
+    assert len(calls) == 2
+
+
+def test_identical_calls():
+    """
+    Test that identical concurrent GET calls share one upstream call
+    """
+    with LocalServer({("get", "/api/v1/GetItems"): slow_route, ("get", "/api/v1/GetItem"): slow_route}) as server:
+        api = create_connector(server, single_flight=True)
+        calls = [("/GetItems", "get")] * 6 + [("/GetItem", "get", {"id": "1"}), ("/GetItem", "get", {"id": "2"})]
+        responses = api.run_batch(calls)
+        api.close()
+    assert all(response == responses[0] for response in responses[:6])
+    assert responses[0]["response"]["Payload"] == ITEMS
+    assert server.calls.count(("get", "/api/v1/GetItems")) == 1
+    assert sorted(server.calls)[:2] == [("get", "/api/v1/GetItem?id=1"), ("get", "/api/v1/GetItem?id=2")]
+
+
+def test_deactivated():
+    """
+    Test that the calls are not coalesced by default
+    """
+    with LocalServer({("get", "/api/v1/GetItems"): slow_route}) as server:
+        api = create_connector(server)
+        api.run_batch([("/GetItems", "get")] * 4)
+        api.close()
+    assert len(server.calls) == 4
+
+
+def test_acall_identical_calls():
+    """
+    Test the coalescing of the asynchronous calls
+    """
+    pytest.importorskip("aiohttp")
+    with LocalServer({("get", "/api/v1/GetItems"): slow_route}) as server:
+        async def run():
+            async with create_connector(server, single_flight=True) as api:
+                api_request = ApiRequest.create_request(api, "/GetItems", "get")
+                url = api_request.build_url()
+                return await asyncio.gather(*[api_request.acall(url) for _ in range(6)]), api.single_flight.stats()
+
+        (responses, stats) = asyncio.run(run())
+    assert [response["response"]["Payload"] for response in responses] == [ITEMS] * 6
+    assert len(server.calls) == 1
+    assert stats == {"leaders": 1, "followers": 5}
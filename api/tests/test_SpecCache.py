@@ -0,0 +1,82 @@
+import os
+import shutil
+
+from api.model.ApiConnector import ApiConnector
+from api.model.JsonHandler import JsonHandler
+from api.model.SpecCache import SpecCache
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+
+
+def fail_read_json(filename):
+    raise AssertionError("{} should not be read".format(filename))
+
+
+def test_cold_and_warm_start(tmp_path, monkeypatch):
+    """
+    Test that a warm start restores the same connector state without reading the spec
+    """
+    cold = ApiConnector(RESOURCES["existing_api"], cache_dir=str(tmp_path))
+    assert len(os.listdir(str(tmp_path))) == 1
+    monkeypatch.setattr(JsonHandler, "read_json", staticmethod(fail_read_json))
+    warm = ApiConnector(RESOURCES["existing_api"], cache_dir=str(tmp_path))
+    assert warm.resources == cold.resources
+    assert warm.paths.keys() == cold.paths.keys()
+    assert warm.get_endpoint_definition("/GetItem", "get") == cold.get_endpoint_definition("/GetItem", "get")
+
+
+def test_key_depends_on_content(tmp_path):
+    """
+    Test that a modified spec file gets another key
+    """
+    spec_file = str(tmp_path / "Api.json")
+    shutil.copy(RESOURCES["existing_api"], spec_file)
+    cache = SpecCache(str(tmp_path / "cache"))
+    key = cache.get_key(spec_file, True)
+    assert key == cache.get_key(spec_file, True)
+    assert key != cache.get_key(spec_file, False)
+    with open(spec_file, 'a') as fp:
+        fp.write(" ")
+    assert key != cache.get_key(spec_file, True)
+
+
+def test_corrupted_entry(tmp_path):
+    """
+    Test that an unreadable entry is ignored
+    """
+    cache = SpecCache(str(tmp_path))
+    key = cache.get_key(RESOURCES["existing_api"], True)
+    with open(str(tmp_path / "{}.pickle".format(key)), 'wb') as fp:
+        fp.write(b"not a pickle")
+    assert cache.load(key) is None
+    assert cache.store(key, {"state": 1})
+    assert cache.load(key) == {"state": 1}
+
+
+def test_truncated_entry(tmp_path):
+    """
+    Test that a truncated entry is a cache miss
+    """
+    cache = SpecCache(str(tmp_path))
+    key = cache.get_key(RESOURCES["existing_api"], True)
+    assert cache.store(key, {"state": list(range(100))})
+    filename = str(tmp_path / "{}.pickle".format(key))
+    with open(filename, 'rb') as fp:
+        data = fp.read()
+    for size in [1, 5, len(data) // 2, len(data) - 1]:
+        with open(filename, 'wb') as fp:
+            fp.write(data[:size])
+        assert cache.load(key) is None
+
+
+def test_unpicklable_state(tmp_path):
+    """
+    Test that a state which can not be pickled is not cached, without temporary file left
+    """
+    cache = SpecCache(str(tmp_path))
+    key = cache.get_key(RESOURCES["existing_api"], True)
+    assert not cache.store(key, {"lock": lambda: None})
+    assert os.listdir(str(tmp_path)) == []
+    assert cache.load(key) is None
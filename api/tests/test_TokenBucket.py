@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+import pytest
+
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiRequest import ApiRequest
+from api.model.JsonHandler import JsonHandler
+from api.model.TokenBucket import TokenBucket
+from local_server import LocalServer
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+ITEMS = [{"Name": "30", "UniqueName": "30"}]
+
+
+def create_connector(server):
+    api = ApiConnector(RESOURCES["existing_api"])
+    api.server = {"url": "{}/api/v1".format(server.url), "description": "Local"}
+    return api
+
+
+def test_reserve():
+    """
+    Test the spacing of the reservations
+    """
+    bucket = TokenBucket(10)
+    waits = [bucket.reserve() for _ in range(3)]
+    assert waits[0] == 0
+    assert waits[1] == pytest.approx(0.1, abs=0.01)
+    assert waits[2] == pytest.approx(0.2, abs=0.01)
+    bucket = TokenBucket(10, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() > 0
+
+
+def test_invalid_rate():
+    """
+    Test TokenBucket with an invalid rate
+    """
+    err_message = ""
+    try:
+        TokenBucket(0)
+    except ValueError as e:
+        err_message = str(e)
+    assert err_message == "The rate must be positive and the burst at least 1."
+
+
+def test_set_rate_limit():
+    """
+    Test the limiters of an operation and of a server
+    """
+    api = ApiConnector(RESOURCES["existing_api"])
+    assert api.get_rate_limiters("/GetItems", "get", "http://url:1234/api/v1") == []
+    api.set_rate_limit(5, endpoint="/GetItems", request_type="get")
+    api.set_rate_limit(50, burst=10, server_url="http://url:1234/api/v1")
+    assert [limiter.rate for limiter in api.get_rate_limiters("/GetItems", "get", "http://url:1234/api/v1")] == \
+        [5, 50]
+    assert [limiter.rate for limiter in api.get_rate_limiters("/GetItems", "post", "http://url:1234/api/v1")] == \
+        [50]
+    api.set_rate_limit(None, server_url="http://url:1234/api/v1")
+    assert api.get_rate_limiters("/GetItems", "post", "http://url:1234/api/v1") == []
+    err_message = ""
+    try:
+        api.set_rate_limit(5)
+    except ValueError as e:
+        err_message = str(e)
+    assert err_message == "An endpoint or a server_url is needed."
+
+
+def test_vendor_extension(tmp_path):
+    """
+    Test the limits defined by x-rate-limit in the specs
+    """
+    spec = JsonHandler.read_json(RESOURCES["existing_api"])
+    spec["servers"][0]["x-rate-limit"] = {"rate": 100, "burst": 20}
+    spec["paths"]["/GetItems"]["get"]["x-rate-limit"] = {"rate": 2}
+    spec["paths"]["/GetItem"]["x-rate-limit"] = {"rate": 4}
+    filename = str(tmp_path / "Api_rate_limit.json")
+    JsonHandler.write_json(filename, spec)
+    api = ApiConnector(filename)
+    limiters = api.get_rate_limiters("/GetItems", "get", "http://url:1234/api/v1")
+    assert [(limiter.rate, limiter.capacity) for limiter in limiters] == [(2, 1), (100, 20)]
+    assert [limiter.rate for limiter in api.get_rate_limiters("/GetItem", "post", "http://other")] == [4]
+
+
+def test_batch_rate():
+    """
+    Test that the batch calls wait for their token
+    """
+    with LocalServer({("get", "/api/v1/GetItems"): lambda handler: (200, ITEMS, {})}) as server:
+        api = create_connector(server)
+        api.set_rate_limit(20, endpoint="/GetItems")
+        start = time.perf_counter()
+        responses = api.run_batch([("/GetItems", "get") for _ in range(6)], max_workers=6)
+        elapsed = time.perf_counter() - start
+    assert [response["response"]["Payload"] for response in responses] == [ITEMS] * 6
+    assert elapsed >= 0.24
+
+
+def test_acall_rate():
+    """
+    Test that the asynchronous calls wait for their token
+    """
+    pytest.importorskip("aiohttp")
+    with LocalServer({("get", "/api/v1/GetItems"): lambda handler: (200, ITEMS, {})}) as server:
+        async def run():
+            async with create_connector(server) as api:
+                api.set_rate_limit(20, server_url="{}/api/v1".format(server.url))
+                api_request = ApiRequest.create_request(api, "/GetItems", "get")
+                url = api_request.build_url()
+                start = time.perf_counter()
+                responses = await asyncio.gather(*[api_request.acall(url) for _ in range(5)])
+                return responses, time.perf_counter() - start
+
+        (responses, elapsed) = asyncio.run(run())
+    assert [response["response"]["Payload"] for response in responses] == [ITEMS] * 5
+    assert elapsed >= 0.19
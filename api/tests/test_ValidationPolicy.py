@@ -0,0 +1,72 @@
+import random
+
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiRequest import ApiRequest
+from api.model.ApiResponse import MockResponse
+from api.model.ValidationPolicy import ValidationPolicy
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+WARNING = "WARNING: Response doesn't correspond to predefined schema!"
+BAD_PAYLOAD = [{"Name": 30}]
+
+
+def process(api, endpoint="/GetItems", request_type="get"):
+    api_request = ApiRequest.create_request(api, endpoint, request_type)
+    return api_request.process_response("test_url", MockResponse(BAD_PAYLOAD, 200), error_flag=False)
+
+
+def test_unknown_mode():
+    """
+    Test creation of a policy with an unknown mode
+    """
+    err_message = ""
+    try:
+        ValidationPolicy("always")
+    except ValueError as e:
+        err_message = str(e)
+    assert err_message == "Only ['off', 'sampled', 'first_n', 'full'] are available."
+
+
+def test_full_and_off():
+    """
+    Test the modes full and off
+    """
+    api = ApiConnector(RESOURCES["existing_api"])
+    assert process(api)["response"]["Message"] == WARNING
+    api.set_validation_policy(ValidationPolicy(ValidationPolicy.OFF))
+    assert process(api)["response"]["Message"] == "OK: list"
+    assert api.validation_policy.stats() == {("/GetItems", "get"): {"validated": 0, "failures": 0, "skipped": 1}}
+
+
+def test_first_n_per_operation():
+    """
+    Test that only the first responses of each operation are validated
+    """
+    api = ApiConnector(RESOURCES["existing_api"], validation_policy=ValidationPolicy(ValidationPolicy.FIRST_N,
+                                                                                      first_n=2))
+    messages = [process(api)["response"]["Message"] for _ in range(4)]
+    assert messages == [WARNING, WARNING, "OK: list", "OK: list"]
+    assert process(api, request_type="post")["response"]["Message"] == WARNING
+    assert api.validation_policy.stats()[("/GetItems", "get")] == {"validated": 2, "failures": 2, "skipped": 2}
+
+
+def test_sampled():
+    """
+    Test validation of a fraction of the responses
+    """
+    random.seed(1)
+    policy = ValidationPolicy(ValidationPolicy.SAMPLED, rate=0.25)
+    decisions = [policy.should_validate(("/GetItems", "get")) for _ in range(1000)]
+    assert 150 < sum(decisions) < 350
+
+
+def test_endpoint_override():
+    """
+    Test the policy of one endpoint overriding the policy of the API
+    """
+    api = ApiConnector(RESOURCES["existing_api"], validation_policy=ValidationPolicy(ValidationPolicy.OFF))
+    api.set_validation_policy(ValidationPolicy(), endpoint="/GetItems", request_type="post")
+    assert process(api, request_type="get")["response"]["Message"] == "OK: list"
+    assert process(api, request_type="post")["response"]["Message"] == WARNING
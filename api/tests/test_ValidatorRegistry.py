@@ -0,0 +1,81 @@
+import jsonschema
+
+from api.model.ApiConnector import ApiConnector
+from api.model.ApiRequest import ApiRequest
+from api.model.ApiResponse import MockResponse
+from api.model.ValidatorRegistry import ValidatorRegistry
+
+RESOURCES = {
+    "existing_api": "tests/resources/Api.json"
+}
+GET_ITEMS_ENDPOINT = "/GetItems"
+
+
+def test_registry_hits_and_misses():
+    """
+    Test that the schema is compiled only once for a given key
+    """
+    registry = ValidatorRegistry()
+    built = []
+
+    def schema_factory():
+        built.append(True)
+        return {"type": "object"}
+
+    key = ("/path", "get", "200", "application/json")
+    first = registry.get_validator(key, schema_factory)
+    second = registry.get_validator(key, schema_factory)
+    assert first is second
+    assert len(built) == 1
+    assert registry.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_registry_invalid_schema():
+    """
+    Test that an invalid schema is compiled only once and its error raised on each call
+    """
+    registry = ValidatorRegistry()
+    built = []
+
+    def schema_factory():
+        built.append(True)
+        return {"type": "unknown"}
+
+    key = ("/path", "get", "200", "application/json")
+    err_messages = []
+    for _ in range(3):
+        try:
+            registry.get_validator(key, schema_factory)
+        except jsonschema.exceptions.SchemaError as e:
+            err_messages.append(e.message)
+    assert len(err_messages) == 3
+    assert err_messages[0].startswith("'unknown' is not valid")
+    assert len(built) == 1
+    assert registry.stats() == {"hits": 2, "misses": 1, "size": 1}
+
+
+def test_registry_clear():
+    """
+    Test reset of the registry
+    """
+    registry = ValidatorRegistry()
+    registry.get_validator(("/path", "get", "200", "application/json"), lambda: {})
+    registry.clear()
+    assert registry.stats() == {"hits": 0, "misses": 0, "size": 0}
+
+
+def test_process_response_uses_registry():
+    """
+    Test that responses of the same operation share one compiled validator
+    """
+    api = ApiConnector(RESOURCES["existing_api"])
+    api.select_server_by_description("Sample API")
+    payload = [{"Name": "30", "UniqueName": "30"}]
+    for _ in range(3):
+        api_request = ApiRequest.create_request(api, GET_ITEMS_ENDPOINT, "get")
+        output = api_request.process_response("test_url", MockResponse(payload, 200), error_flag=False)
+        assert output["response"]["Message"] == "OK: list"
+    assert api.validators.stats() == {"hits": 2, "misses": 1, "size": 1}
+    api_request = ApiRequest.create_request(api, GET_ITEMS_ENDPOINT, "get")
+    output = api_request.process_response("test_url", MockResponse([{"Name": 30}], 200), error_flag=False)
+    assert output["response"]["Message"] == "WARNING: Response doesn't correspond to predefined schema!"
@@ -0,0 +1,3 @@
+cd ../../api
+python api_benchmark.py --output benchmark_results.json
+cd ../scripts/scripts_unix
\ No newline at end of file
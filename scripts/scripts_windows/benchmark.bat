@@ -0,0 +1,3 @@
+cd ../../api
+python api_benchmark.py --output benchmark_results.json
+cd ../scripts/scripts_windows
\ No newline at end of file